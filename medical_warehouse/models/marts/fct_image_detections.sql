@@ -1,13 +1,17 @@
 {{ config(materialized='table') }}
 
 WITH yolo_raw AS (
-    -- Get the detections you just loaded via Python
+    -- One detection per image: the latest model's (see stg_yolo_detections)
     SELECT 
         message_id,
+        channel_key,
         detected_objects AS detected_class,
         confidence_score,
-        image_category
-    FROM {{ source('raw_data', 'yolo_detections') }}
+        image_category,
+        image_sha256,
+        duplicate_of,
+        model
+    FROM {{ ref('stg_yolo_detections') }}
 ),
 
 core_messages AS (
@@ -25,6 +29,11 @@ SELECT
     m.date_key,
     y.detected_class,
     y.confidence_score,
-    y.image_category
+    y.image_category,
+    y.image_sha256,
+    y.duplicate_of,
+    y.model
 FROM core_messages m
-INNER JOIN yolo_raw y ON m.message_id = y.message_id
\ No newline at end of file
+INNER JOIN yolo_raw y
+    ON m.channel_key = y.channel_key
+   AND m.message_id = y.message_id
@@ -0,0 +1,59 @@
+{{ config(materialized='table') }}
+
+WITH yolo_boxes AS (
+    -- One row per detected object, loaded by scripts/load_yolo_postgres.py or streamed by the detector
+    SELECT
+        message_id,
+        md5(trim(lower(channel))) AS channel_key,
+        image_name,
+        model,
+        class_id,
+        class_name,
+        confidence,
+        bbox_x1,
+        bbox_y1,
+        bbox_x2,
+        bbox_y2,
+        (bbox_x2 - bbox_x1) * (bbox_y2 - bbox_y1) AS bbox_area
+    FROM {{ source('raw_data', 'yolo_detection_boxes') }}
+),
+
+selected_models AS (
+    -- The model chosen for each image (see stg_yolo_detections); boxes of other models are dropped
+    SELECT
+        channel_key,
+        image_name,
+        model
+    FROM {{ ref('stg_yolo_detections') }}
+),
+
+core_messages AS (
+    SELECT
+        message_id,
+        channel_key,
+        date_key
+    FROM {{ ref('fct_messages') }}
+)
+
+SELECT
+    m.message_id,
+    m.channel_key,
+    m.date_key,
+    b.image_name,
+    b.model,
+    b.class_id,
+    b.class_name,
+    b.confidence,
+    b.bbox_x1,
+    b.bbox_y1,
+    b.bbox_x2,
+    b.bbox_y2,
+    b.bbox_area
+FROM core_messages m
+INNER JOIN yolo_boxes b
+    ON m.channel_key = b.channel_key
+   AND m.message_id = b.message_id
+INNER JOIN selected_models s
+    ON s.channel_key = b.channel_key
+   AND s.image_name = b.image_name
+   AND s.model IS NOT DISTINCT FROM b.model
@@ -0,0 +1,31 @@
+with source as (
+    select * from {{ source('raw_data', 'yolo_detections') }}
+),
+
+ranked as (
+    select
+        *,
+        -- An image can have rows from several models (one per streamed model, plus the
+        -- CSV load whose model is NULL): keep the most recently loaded one
+        row_number() over (
+            partition by channel, image_name
+            order by loaded_at desc, model nulls last
+        ) as model_rank
+    from source
+    where message_id is not null
+)
+
+select
+    message_id,
+    channel,
+    md5(trim(lower(channel))) as channel_key,
+    image_name,
+    model,  -- set for rows streamed by the detector, NULL for CSV loads
+    detected_objects,
+    confidence_score,
+    image_category,
+    image_sha256,
+    duplicate_of,
+    loaded_at
+from ranked
+where model_rank = 1
@@ -0,0 +1,7 @@
+select
+    channel_key,
+    message_id,
+    count(*) as n_rows
+from {{ ref('fct_messages') }}
+group by channel_key, message_id
+having count(*) > 1
\ No newline at end of file
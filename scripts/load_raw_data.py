@@ -1,11 +1,35 @@
-import json
-import os
+import argparse
+import atexit
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 import psycopg2
 from psycopg2.extras import execute_values
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from psycopg2.pool import ThreadedConnectionPool
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Allow running this file directly: `python scripts/load_raw_data.py`
+# by adding the project root to PYTHONPATH so `import src.*` works.
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.catalog import list_partitions, refresh_catalog
+from src.datalake import file_sha256, iter_messages_file
+from src.pg_copy import copy_rows, db_config
+
+# Column order of raw.telegram_messages, shared by the INSERT and COPY paths.
+MESSAGE_COLUMNS: Tuple[str, ...] = (
+    "message_id", "channel_name", "channel_title", "message_date", "message_text",
+    "has_media", "image_path", "views", "forwards",
+)
+LOAD_METHODS = ("upsert", "copy", "insert")
+EXECUTORS = ("thread", "process")
+DEFAULT_LOAD_WORKERS = 1
+DEFAULT_BATCH_SIZE = 5000
 
 # -----------------------------------------------------------------------------
 # Load environment variables
@@ -20,28 +44,21 @@ def get_db_connection() -> Tuple[psycopg2.extensions.connection, psycopg2.extens
     """
     Establish a connection to the PostgreSQL database using environment variables.
 
+    Connections are only opened when a load actually runs, never at import time.
+
     Returns:
         Tuple containing the database connection and cursor.
 
     Raises:
-        Exception: If connection fails, prints error and exits the script.
+        psycopg2.OperationalError: If the connection fails.
     """
     try:
-        conn = psycopg2.connect(
-            dbname=os.getenv("DATABASE_NAME"),
-            user=os.getenv("DATABASE_USER"),
-            password=os.getenv("DATABASE_PASSWORD"),
-            host=os.getenv("DATABASE_HOST"),
-            port=os.getenv("DATABASE_PORT")
-        )
+        conn = psycopg2.connect(**db_config())
         cur = conn.cursor()
         return conn, cur
-    except Exception as e:
+    except psycopg2.OperationalError as e:
         print(f"❌ Connection failed: {e}")
-        exit()
-
-
-conn, cur = get_db_connection()
+        raise
 
 
 # -----------------------------------------------------------------------------
@@ -58,109 +75,677 @@ def ensure_schema_and_table(cursor: psycopg2.extensions.cursor) -> None:
     CREATE SCHEMA IF NOT EXISTS raw;
 
     CREATE TABLE IF NOT EXISTS raw.telegram_messages (
-        message_id BIGINT PRIMARY KEY,
-        channel_name TEXT,
+        message_id BIGINT NOT NULL,
+        channel_name TEXT NOT NULL,
         channel_title TEXT,
         message_date TIMESTAMP,
         message_text TEXT,
         has_media BOOLEAN,
         image_path TEXT,
         views INT,
-        forwards INT
+        forwards INT,
+        PRIMARY KEY (channel_name, message_id)
     );
+
+    -- Telegram message IDs are only unique within a channel: move tables
+    -- created with PRIMARY KEY (message_id) to the composite key.
+    DO $$
+    DECLARE
+        old_pkey TEXT;
+    BEGIN
+        SELECT conname INTO old_pkey FROM pg_constraint
+        WHERE conrelid = 'raw.telegram_messages'::regclass
+          AND contype = 'p' AND array_length(conkey, 1) = 1;
+        IF old_pkey IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE raw.telegram_messages DROP CONSTRAINT %I', old_pkey);
+            ALTER TABLE raw.telegram_messages ADD PRIMARY KEY (channel_name, message_id);
+        END IF;
+    END $$;
     """)
-    conn.commit()
+    cursor.connection.commit()
+
+
+def ensure_engagement_history(cursor: psycopg2.extensions.cursor) -> None:
+    """
+    Ensure the `raw.telegram_message_engagement` history table exists.
 
+    The upsert appends one row per message whose `views`/`forwards` were
+    inserted or changed, so engagement can be tracked over time.
 
-ensure_schema_and_table(cur)
+    `observed_at` defaults to `clock_timestamp()`, not `now()`: `now()` is
+    fixed for the whole transaction, so a message appearing in two files of
+    one load would collide on the primary key. Tables created with the old
+    default are migrated.
+
+    Args:
+        cursor: Database cursor.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS raw.telegram_message_engagement (
+        channel_name TEXT NOT NULL,
+        message_id BIGINT NOT NULL,
+        views INT,
+        forwards INT,
+        observed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+        PRIMARY KEY (channel_name, message_id, observed_at)
+    );
+    ALTER TABLE raw.telegram_message_engagement ALTER COLUMN observed_at SET DEFAULT clock_timestamp();
+    """)
 
 
 # -----------------------------------------------------------------------------
-# 3. Load JSON files and insert into database
+# 3. Insert partition files with multi-row INSERTs
 # -----------------------------------------------------------------------------
-def load_json_files_to_db(data_path: Path, cursor: psycopg2.extensions.cursor) -> None:
+def utc_timestamp(message_date: Optional[str]) -> Optional[str]:
     """
-    Load Telegram message JSON files from a directory and insert the messages into PostgreSQL.
+    Render a lake `message_date` as a UTC timestamp without offset, for the `TIMESTAMP` column.
+
+    PostgreSQL silently drops the offset when text with one is cast to
+    `TIMESTAMP`, so dates are converted to UTC first. Telegram dates are
+    already UTC, so the common `+00:00`/`Z` suffix is just stripped without
+    parsing; naive dates are taken to be UTC.
+
+    Args:
+        message_date: ISO 8601 date as stored in the lake, or None.
+
+    Returns:
+        ISO 8601 UTC date without offset, or None.
+    """
+    if not message_date:
+        return None
+    for suffix in ("+00:00", "Z"):
+        if message_date.endswith(suffix):
+            return message_date[: -len(suffix)]
+    parsed = datetime.fromisoformat(message_date)
+    if parsed.tzinfo is None:
+        return message_date
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def message_insert_record(msg: Any, file_name: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Turn one message dictionary into an INSERT record in `MESSAGE_COLUMNS` order.
+
+    Args:
+        msg: Message read from a partition file.
+        file_name: Name of the file, for warnings.
+
+    Returns:
+        The record, or None if the message is invalid.
+    """
+    # CRITICAL FIX: Verify msg is a dictionary
+    if not isinstance(msg, dict):
+        print(f"⚠️ Skipping item because it is {type(msg)} instead of dict: {msg}")
+        return None
+    if msg.get("message_id") is None or not msg.get("channel_name"):
+        print(f"⚠️ Skipping message without message_id/channel_name in {file_name}")
+        return None
+
+    try:
+        return (
+            msg.get("message_id"),
+            msg.get("channel_name"),
+            msg.get("channel_title"),
+            utc_timestamp(msg.get("message_date")),
+            msg.get("message_text"),
+            msg.get("has_media", False),
+            msg.get("image_path"),
+            msg.get("views", 0) if msg.get("views") is not None else 0,
+            msg.get("forwards", 0) if msg.get("forwards") is not None else 0
+        )
+    except Exception as e:
+        print(f"⚠️ Error processing a message in {file_name}: {e}")
+        return None
+
+
+def insert_file(
+    cursor: psycopg2.extensions.cursor,
+    file: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Insert the messages of one partition file with multi-row INSERTs of bounded size.
+
+    Messages are parsed incrementally (JSONL line by line, Parquet batch by
+    batch, JSON arrays with a streaming parser) and each batch is sent as soon
+    as it fills, so memory stays flat regardless of file size and inserting
+    starts before the file is fully parsed. A parse error part-way through
+    raises after earlier batches were sent; callers roll the file back.
 
     Args:
-        data_path: Path to the directory containing JSON files.
         cursor: Database cursor.
+        file: Partition file to load.
+        batch_size: Maximum number of records per INSERT.
+
+    Returns:
+        Number of messages sent to the database.
+
+    Raises:
+        ValueError: If the file can't be parsed (`json.JSONDecodeError` for invalid JSON).
     """
-    json_files: List[Path] = list(data_path.glob("*.json"))
+    total = 0
+    batch: List[Tuple[Any, ...]] = []
+    for msg in iter_messages_file(str(file)):
+        record = message_insert_record(msg, file.name)
+        if record is not None:
+            batch.append(record)
+        if len(batch) >= batch_size:
+            total += _insert_records(cursor, batch)
+            batch = []
+    if batch:
+        total += _insert_records(cursor, batch)
+    return total
 
-    if not json_files:
-        print(f"No JSON files found in {data_path}")
-        return
 
-    for file in json_files:
-        with open(file, "r", encoding="utf-8") as f:
-            try:
-                messages: Any = json.load(f)
-                # Ensure the JSON is a list
-                if not isinstance(messages, list):
-                    print(f"⚠️ {file.name} is not a list. Skipping.")
-                    continue
-            except json.JSONDecodeError as e:
-                print(f"⚠️ Failed to read {file}: {e}")
-                continue
-
-            records: List[Tuple[Any, ...]] = []
-            for msg in messages:
-                # CRITICAL FIX: Verify msg is a dictionary
-                if not isinstance(msg, dict):
-                    print(f"⚠️ Skipping item because it is {type(msg)} instead of dict: {msg}")
-                    continue
-
-                try:
-                    records.append((
-                        msg.get("message_id"),
-                        msg.get("channel_name"),
-                        msg.get("channel_title"),
-                        datetime.fromisoformat(msg.get("message_date").replace('Z', '+00:00')) if msg.get("message_date") else None,
-                        msg.get("message_text"),
-                        msg.get("has_media", False),
-                        msg.get("image_path"),
-                        msg.get("views", 0) if msg.get("views") is not None else 0,
-                        msg.get("forwards", 0) if msg.get("forwards") is not None else 0
-                    ))
-                except Exception as e:
-                    print(f"⚠️ Error processing a message in {file.name}: {e}")
-                    continue
-
-            if records:
-                execute_values(
-                    cursor,
-                    """
-                    INSERT INTO raw.telegram_messages 
-                    (message_id, channel_name, channel_title, message_date, message_text, 
-                     has_media, image_path, views, forwards)
-                    VALUES %s
-                    ON CONFLICT (message_id) DO NOTHING
-                    """,
-                    records
-                )
-                print(f"✅ Loaded {len(records)} messages from {file.name}")
+def _insert_records(cursor: psycopg2.extensions.cursor, records: List[Tuple[Any, ...]]) -> int:
+    execute_values(
+        cursor,
+        """
+        INSERT INTO raw.telegram_messages 
+        (message_id, channel_name, channel_title, message_date, message_text, 
+         has_media, image_path, views, forwards)
+        VALUES %s
+        ON CONFLICT (channel_name, message_id) DO NOTHING
+        """,
+        records,
+        page_size=len(records),
+    )
+    return len(records)
+
+
+# -----------------------------------------------------------------------------
+# 4. Bulk load with COPY
+# -----------------------------------------------------------------------------
+def message_copy_rows(messages: Iterable[Any], file_name: str) -> Iterator[Tuple[Any, ...]]:
+    """
+    Turn message dictionaries into COPY rows in `MESSAGE_COLUMNS` order.
+
+    `message_date` is sent as the ISO string stored in the lake, normalized to
+    UTC (see `utc_timestamp`), and parsed by PostgreSQL, so the COPY and
+    INSERT paths store the same values.
+
+    Args:
+        messages: Message dictionaries read from a partition file.
+        file_name: Name of the file, for warnings.
+
+    Yields:
+        One tuple per valid message.
+    """
+    for msg in messages:
+        if not isinstance(msg, dict):
+            print(f"⚠️ Skipping item in {file_name} because it is {type(msg)} instead of dict: {msg}")
+            continue
+        yield (
+            msg.get("message_id"),
+            msg.get("channel_name"),
+            msg.get("channel_title"),
+            utc_timestamp(msg.get("message_date")),
+            msg.get("message_text"),
+            msg.get("has_media") or False,
+            msg.get("image_path"),
+            msg.get("views") or 0,
+            msg.get("forwards") or 0,
+        )
 
 
-data_path: Path = Path(__file__).resolve().parent.parent / "data" / "raw" / "telegram_messages" / "2026-01-18"
-load_json_files_to_db(data_path, cur)
+def _merge_sql(upsert: bool, history: bool) -> str:
+    """
+    Build the statement that merges `_stg_telegram_messages` into `raw.telegram_messages`.
+
+    The statement returns one row of (inserted, updated) counts. Staged rows
+    are deduplicated on `(channel_name, message_id)` first (the last copied row
+    wins), since one statement can't update the same target row twice.
+
+    Args:
+        upsert: Update `views`/`forwards` of existing messages when they changed;
+            otherwise existing messages are left untouched.
+        history: Also append inserted/changed engagement to `raw.telegram_message_engagement`.
+
+    Returns:
+        SQL statement.
+    """
+    columns = ", ".join(MESSAGE_COLUMNS)
+    on_conflict = "DO NOTHING"
+    if upsert:
+        on_conflict = """DO UPDATE
+            SET views = EXCLUDED.views, forwards = EXCLUDED.forwards
+            WHERE (t.views, t.forwards) IS DISTINCT FROM (EXCLUDED.views, EXCLUDED.forwards)"""
+    history_cte = ""
+    if history:
+        history_cte = """,
+    history AS (
+        INSERT INTO raw.telegram_message_engagement (channel_name, message_id, views, forwards)
+        SELECT channel_name, message_id, views, forwards FROM merged
+    )"""
+    return f"""
+    WITH merged AS (
+        INSERT INTO raw.telegram_messages AS t ({columns})
+        SELECT DISTINCT ON (channel_name, message_id) {columns}
+        FROM _stg_telegram_messages
+        WHERE channel_name IS NOT NULL AND message_id IS NOT NULL
+        ORDER BY channel_name, message_id, ctid DESC
+        ON CONFLICT (channel_name, message_id) {on_conflict}
+        RETURNING channel_name, message_id, views, forwards, (xmax = 0) AS inserted
+    ){history_cte}
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged
+    """
+
+
+def copy_file(cursor: psycopg2.extensions.cursor, file: Path, merge_sql: str) -> Tuple[int, int, int]:
+    """
+    COPY one partition file into the staging table and merge it.
+
+    Args:
+        cursor: Database cursor.
+        file: Partition file to load.
+        merge_sql: Statement from `_merge_sql`.
+
+    Returns:
+        Tuple of (rows copied, rows inserted, rows updated).
+    """
+    # CREATE TABLE AS doesn't copy NOT NULL constraints, so rows missing a key
+    # reach staging and are filtered by the merge instead of failing the COPY.
+    cursor.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS _stg_telegram_messages AS
+    SELECT * FROM raw.telegram_messages WITH NO DATA;
+    TRUNCATE _stg_telegram_messages;
+    """)
+    rows = copy_rows(
+        cursor,
+        "_stg_telegram_messages",
+        MESSAGE_COLUMNS,
+        message_copy_rows(iter_messages_file(str(file)), file.name),
+    )
+    cursor.execute(merge_sql)
+    inserted, updated = cursor.fetchone()
+    return rows, inserted, updated
 
 
 # -----------------------------------------------------------------------------
-# 4. Cleanup
+# 5. Load ledger: which partition files are already in the database
 # -----------------------------------------------------------------------------
-def cleanup(conn: psycopg2.extensions.connection, cursor: psycopg2.extensions.cursor) -> None:
+def ensure_load_ledger(cursor: psycopg2.extensions.cursor) -> None:
     """
-    Commit the database transaction and close the cursor and connection.
+    Ensure the `raw._load_ledger` table exists.
+
+    The ledger stores one row per loaded partition file (path relative to the
+    data directory, SHA-256 checksum, row count), so later runs only load new
+    or changed files.
 
     Args:
-        conn: Database connection.
         cursor: Database cursor.
     """
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print("🎉 All raw data loaded into PostgreSQL successfully!")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS raw._load_ledger (
+        path TEXT PRIMARY KEY,
+        checksum TEXT NOT NULL,
+        row_count INT NOT NULL,
+        loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    """)
+
+
+def plan_partition_files(
+    cursor: psycopg2.extensions.cursor,
+    base_path: Path,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    channels: Optional[Sequence[str]] = None,
+    force: bool = False,
+) -> List[Tuple[Path, str, str]]:
+    """
+    Select the partition files that still need loading.
 
+    Candidate files come from the lake catalog, refreshed first so files that
+    bypassed the writers (DVC pulls, hand-copied days) are included, filtered
+    by date range and channel; files whose checksum matches the ledger are skipped.
+    Checksums come from the catalog, which the refresh keeps current (files
+    whose size or modification time changed are re-hashed there), so
+    unchanged files are never read; a file is only hashed here if its
+    catalog entry has no checksum.
 
-cleanup(conn, cur)
+    Args:
+        cursor: Database cursor.
+        base_path: Base data directory (e.g. `data/`).
+        start_date: First partition date ('YYYY-MM-DD'), or None for no lower bound.
+        end_date: Last partition date ('YYYY-MM-DD'), or None for no upper bound.
+        channels: Channel names to load, or None for all channels.
+        force: Reload files even if the ledger says they are unchanged.
+
+    Returns:
+        List of (file path, ledger key, checksum) tuples to load, in date order.
+    """
+    refreshed = refresh_catalog(str(base_path))
+    if refreshed:
+        print(f"🗂️ Catalogued {refreshed} partition files added or changed outside the scraper")
+
+    cursor.execute("SELECT path, checksum FROM raw._load_ledger")
+    ledger: Dict[str, str] = dict(cursor.fetchall())
+
+    planned: List[Tuple[Path, str, str]] = []
+    for row in list_partitions(str(base_path), (start_date, end_date), channels):
+        file = Path(row["abs_path"])
+        if not file.is_file():
+            continue
+        checksum = row["checksum"] or file_sha256(str(file))
+        if force or ledger.get(row["path"]) != checksum:
+            planned.append((file, row["path"], checksum))
+
+    print(f"🗂️ {len(planned)} partition files to load ({len(ledger)} already in the ledger)")
+    return planned
+
+
+def record_loaded_files(
+    cursor: psycopg2.extensions.cursor,
+    planned: Sequence[Tuple[Path, str, str]],
+    loaded: Dict[Path, int],
+) -> None:
+    """
+    Record successfully loaded files in `raw._load_ledger`.
+
+    Runs in the same transaction as the load, so the ledger never claims a
+    file whose rows were rolled back.
+
+    Args:
+        cursor: Database cursor.
+        planned: Output of `plan_partition_files`.
+        loaded: Rows loaded per file, as returned by the load functions.
+    """
+    records = [(key, checksum, loaded[file]) for file, key, checksum in planned if file in loaded]
+    if records:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO raw._load_ledger (path, checksum, row_count)
+            VALUES %s
+            ON CONFLICT (path) DO UPDATE
+            SET checksum = EXCLUDED.checksum, row_count = EXCLUDED.row_count, loaded_at = now()
+            """,
+            records
+        )
+
+
+# -----------------------------------------------------------------------------
+# 6. Parallel loading: one transaction per file on a pool of connections
+# -----------------------------------------------------------------------------
+def load_partition_file(
+    conn: psycopg2.extensions.connection,
+    file: Path,
+    ledger_key: str,
+    checksum: str,
+    method: str = "upsert",
+    history: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Load one partition file and record it in the ledger, in a single transaction.
+
+    A failure rolls back only this file, so it is retried on the next run.
+
+    Args:
+        conn: Database connection (not shared with other threads while loading).
+        file: Partition file to load.
+        ledger_key: Path of the file relative to the data directory.
+        checksum: SHA-256 of the file, stored in the ledger.
+        method: One of `LOAD_METHODS`.
+        history: Append engagement changes (upsert/copy methods only).
+        batch_size: Maximum number of records per INSERT (insert method only;
+            COPY streams rows without batching).
+
+    Returns:
+        Result with `file`, `ok`, `rows`, `inserted`, `updated`, `seconds` and `error`.
+    """
+    result: Dict[str, Any] = {
+        "file": str(file), "ok": False, "rows": 0, "inserted": 0, "updated": 0, "error": None,
+    }
+    started = time.perf_counter()
+    try:
+        with conn.cursor() as cursor:
+            if method == "insert":
+                result["rows"] = insert_file(cursor, file, batch_size)
+            else:
+                result["rows"], result["inserted"], result["updated"] = copy_file(
+                    cursor, file, _merge_sql(method == "upsert", history)
+                )
+            record_loaded_files(cursor, [(file, ledger_key, checksum)], {file: result["rows"]})
+        conn.commit()
+        result["ok"] = True
+        print(f"✅ Loaded {result['rows']} messages from {file.name}")
+    except (ValueError, psycopg2.Error) as e:
+        conn.rollback()
+        result["error"] = str(e)
+        print(f"⚠️ Failed to load {file}: {e}")
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+# Per-process connection of the process executor, opened on the first task.
+_process_conn: Optional[psycopg2.extensions.connection] = None
+
+
+def _load_in_process(group: List[Tuple[Path, str, str, str, bool, int]]) -> List[Dict[str, Any]]:
+    global _process_conn
+    if _process_conn is None or _process_conn.closed:
+        _process_conn, _ = get_db_connection()
+        atexit.register(_process_conn.close)
+    return [load_partition_file(_process_conn, *task) for task in group]
+
+
+def group_by_channel(tasks: Sequence[Tuple[Any, ...]]) -> List[List[Tuple[Any, ...]]]:
+    """
+    Group load tasks by the channel of their partition file, keeping their (date) order.
+
+    Messages are keyed on `(channel_name, message_id)`, so files of different
+    channels never touch the same rows. Loading each group on one worker, in
+    order, means a later scrape is always merged after an earlier one (an
+    older partition can't overwrite newer views/forwards), and concurrent
+    upserts can't deadlock on shared keys.
+
+    Args:
+        tasks: Tasks whose first element is the partition file (`<channel>.<ext>`).
+
+    Returns:
+        One list of tasks per channel.
+    """
+    groups: Dict[str, List[Tuple[Any, ...]]] = {}
+    for task in tasks:
+        groups.setdefault(task[0].name.split(".")[0], []).append(task)
+    return list(groups.values())
+
+
+def load_partitions(
+    planned: Sequence[Tuple[Path, str, str]],
+    method: str = "upsert",
+    history: bool = False,
+    workers: int = DEFAULT_LOAD_WORKERS,
+    executor: str = "thread",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Load planned partition files, optionally in parallel.
+
+    With `executor="thread"` files are spread over a `ThreadedConnectionPool`
+    of `workers` connections (psycopg2 releases the GIL while waiting on the
+    server); with `executor="process"` each worker process opens its own
+    connection, which also parallelizes JSON parsing. Each file is its own
+    transaction. Workers take whole channels (see `group_by_channel`), so the
+    files of a channel are merged one after another in date order.
+
+    Args:
+        planned: Output of `plan_partition_files`.
+        method: One of `LOAD_METHODS`.
+        history: Append engagement changes (upsert/copy methods only).
+        workers: Number of concurrent connections.
+        executor: 'thread' or 'process'.
+        batch_size: Maximum number of records per INSERT (insert method only).
+
+    Returns:
+        Aggregated summary: file/row counters, elapsed time, rows/sec and per-file `failures`.
+    """
+    tasks = [(file, key, checksum, method, history, batch_size) for file, key, checksum in planned]
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+
+    if tasks and workers <= 1:
+        conn, cur = get_db_connection()
+        cur.close()
+        try:
+            results = [load_partition_file(conn, *task) for task in tasks]
+        finally:
+            conn.close()
+    elif tasks and executor == "process":
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for group in pool.map(_load_in_process, group_by_channel(tasks)) for r in group]
+    elif tasks:
+        conn_pool = ThreadedConnectionPool(1, workers, **db_config())
+
+        def run(group: List[Tuple[Path, str, str, str, bool, int]]) -> List[Dict[str, Any]]:
+            conn = conn_pool.getconn()
+            try:
+                return [load_partition_file(conn, *task) for task in group]
+            finally:
+                conn_pool.putconn(conn)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = [r for group in pool.map(run, group_by_channel(tasks)) for r in group]
+        finally:
+            conn_pool.closeall()
+
+    return summarize_results(results, time.perf_counter() - started)
+
+
+def summarize_results(results: Sequence[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """
+    Aggregate per-file load results.
+
+    Args:
+        results: Results of `load_partition_file`.
+        elapsed: Wall-clock seconds of the whole load.
+
+    Returns:
+        Summary with `files`, `succeeded`, `failed`, `rows`, `inserted`, `updated`,
+        `seconds`, `rows_per_sec` and the list of `failures`.
+    """
+    ok = [r for r in results if r["ok"]]
+    rows = sum(r["rows"] for r in ok)
+    return {
+        "files": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "rows": rows,
+        "inserted": sum(r["inserted"] for r in ok),
+        "updated": sum(r["updated"] for r in ok),
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+        "failures": [{"file": r["file"], "error": r["error"]} for r in results if not r["ok"]],
+    }
+
+
+def run_load(
+    base_path: Path = PROJECT_ROOT / "data",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    channels: Optional[Sequence[str]] = None,
+    force: bool = False,
+    method: str = "upsert",
+    history: bool = False,
+    workers: int = DEFAULT_LOAD_WORKERS,
+    executor: str = "thread",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Load every new or changed partition file of the lake into PostgreSQL.
+
+    Importable entry point (e.g. for Dagster): creates the tables, plans the
+    files from the catalog and ledger, then loads them with `load_partitions`.
+
+    Args:
+        base_path: Base data directory.
+        start_date: First partition date ('YYYY-MM-DD').
+        end_date: Last partition date ('YYYY-MM-DD').
+        channels: Channel names to load, or None for all.
+        force: Reload files the ledger marks as unchanged.
+        method: One of `LOAD_METHODS`.
+        history: Append engagement changes to `raw.telegram_message_engagement`.
+        workers: Number of concurrent connections.
+        executor: 'thread' or 'process'.
+        batch_size: Maximum number of records per INSERT (insert method only).
+
+    Returns:
+        Summary from `load_partitions`.
+    """
+    conn, cur = get_db_connection()
+    try:
+        ensure_schema_and_table(cur)
+        ensure_load_ledger(cur)
+        if history:
+            ensure_engagement_history(cur)
+        planned = plan_partition_files(cur, base_path, start_date, end_date, channels, force)
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+
+    return load_partitions(
+        planned, method=method, history=history, workers=workers, executor=executor, batch_size=batch_size
+    )
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """
+    Print a load summary.
+
+    Args:
+        summary: Output of `load_partitions`.
+    """
+    print(
+        f"📊 {summary['succeeded']}/{summary['files']} files, {summary['rows']} rows "
+        f"({summary['inserted']} new, {summary['updated']} updated) in {summary['seconds']:.2f}s "
+        f"— {summary['rows_per_sec']:,.0f} rows/sec"
+    )
+    for failure in summary["failures"]:
+        print(f"❌ {failure['file']}: {failure['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load raw Telegram message partitions into PostgreSQL")
+    parser.add_argument(
+        "--method",
+        choices=LOAD_METHODS,
+        default="upsert",
+        help="upsert: COPY into a staging table and merge, refreshing changed views/forwards (default); "
+             "copy: same but never touch loaded messages; insert: multi-row INSERT",
+    )
+    parser.add_argument("--history", action="store_true",
+                        help="With upsert/copy: append engagement changes to raw.telegram_message_engagement")
+    parser.add_argument("--path", type=Path, default=PROJECT_ROOT / "data",
+                        help="Base data directory (default: <project>/data)")
+    parser.add_argument("--start", help="First partition date to load (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last partition date to load (YYYY-MM-DD)")
+    parser.add_argument("--channel", action="append", help="Channel to load (repeatable; default: all)")
+    parser.add_argument("--force", action="store_true", help="Reload files the ledger marks as unchanged")
+    parser.add_argument("--workers", type=int, default=DEFAULT_LOAD_WORKERS,
+                        help=f"Concurrent database connections (default: {DEFAULT_LOAD_WORKERS})")
+    parser.add_argument("--executor", choices=EXECUTORS, default="thread",
+                        help="Run workers as threads sharing a connection pool (default) or as processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per INSERT with --method insert (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    summary = run_load(
+        base_path=args.path,
+        start_date=args.start,
+        end_date=args.end,
+        channels=args.channel,
+        force=args.force,
+        method=args.method,
+        history=args.history,
+        workers=args.workers,
+        executor=args.executor,
+        batch_size=args.batch_size,
+    )
+    print_summary(summary)
+    if summary["failed"]:
+        sys.exit(1)
+    print("🎉 All raw data loaded into PostgreSQL successfully!")
@@ -1,12 +1,22 @@
 import os
+import csv
+import sys
 import logging
-import pandas as pd
 from pathlib import Path
 from dotenv import load_dotenv
 import psycopg2
-from psycopg2.extras import execute_values
 from typing import Tuple
 
+# Allow running this file directly: `python scripts/load_yolo_postgres.py`
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection_db import (
+    BOX_COLUMNS, DETECTION_COLUMNS, box_copy_rows, detection_copy_rows, ensure_detection_tables,
+)
+from src.pg_copy import copy_rows, db_config
+
 # --------------------------------------------------------------------------
 # Configure logging
 # --------------------------------------------------------------------------
@@ -31,13 +41,7 @@ def get_db_connection() -> Tuple[psycopg2.extensions.connection, psycopg2.extens
         Tuple[connection, cursor]: psycopg2 connection and cursor objects.
     """
     try:
-        conn = psycopg2.connect(
-            dbname=os.getenv("DATABASE_NAME"),
-            user=os.getenv("DATABASE_USER"),
-            password=os.getenv("DATABASE_PASSWORD"),
-            host=os.getenv("DATABASE_HOST"),
-            port=os.getenv("DATABASE_PORT")
-        )
+        conn = psycopg2.connect(**db_config())
         cur = conn.cursor()
         logging.info("✅ Database connection established successfully.")
         return conn, cur
@@ -51,35 +55,30 @@ def get_db_connection() -> Tuple[psycopg2.extensions.connection, psycopg2.extens
 def ensure_schema_and_table(conn: psycopg2.extensions.connection, 
                             cursor: psycopg2.extensions.cursor) -> None:
     """
-    Ensure the 'raw' schema and 'yolo_detections' table exist in the database.
-    If not, they are created.
+    Ensure the 'raw' schema and the 'yolo_detections' and 'yolo_detection_boxes'
+    tables exist in the database. If not, they are created; older tables are
+    migrated (see `src.detection_db.ensure_detection_tables`).
 
     Args:
         conn (connection): psycopg2 database connection
         cursor (cursor): psycopg2 cursor object
     """
-    cursor.execute("""
-    CREATE SCHEMA IF NOT EXISTS raw;
-
-    CREATE TABLE IF NOT EXISTS raw.yolo_detections (
-        message_id BIGINT,
-        channel TEXT,
-        image_name TEXT,
-        detected_objects TEXT,
-        confidence_score FLOAT,
-        image_category TEXT,
-        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-    """)
+    ensure_detection_tables(cursor)
     conn.commit()
-    logging.info("✅ Schema 'raw' and table 'yolo_detections' verified/created.")
+    logging.info("✅ Schema 'raw' and tables 'yolo_detections', 'yolo_detection_boxes' verified/created.")
 
 # --------------------------------------------------------------------------
-# 3. Load CSV and insert into database
+# 3. Load detections CSV via COPY
 # --------------------------------------------------------------------------
 def load_csv_to_db(csv_path: Path, cursor: psycopg2.extensions.cursor) -> None:
     """
-    Read YOLO detection CSV, clean columns, and perform bulk insert into PostgreSQL.
+    Read YOLO detection CSV, clean columns, and bulk load it into PostgreSQL.
+
+    Rows are cleaned like the ones the detector streams (see
+    `src.detection_db.detection_copy_rows`) and loaded with COPY. The CSV
+    holds every image of the last detector run, so rows loaded from a
+    previous CSV (those without a `model`) are replaced instead of appended
+    again. Rows streamed by `python -m src.yolo_detect --postgres` are kept.
 
     Args:
         csv_path (Path): Path to the YOLO CSV file
@@ -89,32 +88,41 @@ def load_csv_to_db(csv_path: Path, cursor: psycopg2.extensions.cursor) -> None:
         logging.error(f"❌ CSV file not found at {csv_path}")
         return
 
-    # Read CSV
-    df = pd.read_csv(csv_path)
-    
-    # ----------------- CLEANING STEP -----------------
-    # 1. Ensure message_id contains only digits
-    df['message_id'] = df['message_id'].astype(str).str.extract(r'(\d+)').astype(int)    
-    # 2. Handle NaN in confidence_score
-    df['confidence_score'] = df['confidence_score'].fillna(0.0)
-    # 3. Handle empty detected_objects
-    df['detected_objects'] = df['detected_objects'].fillna('none')
-    # -------------------------------------------------
-
-    # Convert DataFrame to list of tuples for bulk insert
-    records = list(df.itertuples(index=False, name=None))
-
-    if records:
-        execute_values(
-            cursor,
-            """
-            INSERT INTO raw.yolo_detections 
-            (message_id, channel, image_name, detected_objects, confidence_score, image_category)
-            VALUES %s
-            """,
-            records
-        )
-        logging.info(f"✅ Cleaned and loaded {len(records)} records into raw.yolo_detections")
+    cursor.execute("DELETE FROM raw.yolo_detections WHERE model IS NULL")
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        count = copy_rows(cursor, "raw.yolo_detections", DETECTION_COLUMNS,
+                          detection_copy_rows(csv.DictReader(f), None))
+    logging.info(f"✅ Cleaned and loaded {count} records into raw.yolo_detections")
+
+# --------------------------------------------------------------------------
+# 4. Load per-object boxes CSV via COPY
+# --------------------------------------------------------------------------
+def load_boxes_to_db(csv_path: Path, cursor: psycopg2.extensions.cursor) -> int:
+    """
+    Replace the CSV-loaded contents of raw.yolo_detection_boxes with the boxes CSV.
+
+    Each detector run writes the boxes of every image, so boxes loaded from a
+    previous CSV (those without a `model`) are deleted and the table is
+    reloaded with COPY in the caller's transaction, cleaned like streamed
+    boxes (see `src.detection_db.box_copy_rows`). Boxes streamed by the
+    detector are kept.
+
+    Args:
+        csv_path (Path): Path to yolo_detection_boxes.csv
+        cursor (cursor): psycopg2 cursor object
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    if not csv_path.exists():
+        logging.warning(f"⚠️ Boxes CSV not found at {csv_path}; skipping raw.yolo_detection_boxes")
+        return 0
+
+    cursor.execute("DELETE FROM raw.yolo_detection_boxes WHERE model IS NULL")
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        count = copy_rows(cursor, "raw.yolo_detection_boxes", BOX_COLUMNS, box_copy_rows(csv.DictReader(f), None))
+    logging.info(f"✅ Loaded {count} boxes into raw.yolo_detection_boxes")
+    return count
 
 # --------------------------------------------------------------------------
 # Main Execution
@@ -128,6 +136,7 @@ if __name__ == "__main__":
     csv_path = base_dir / "data" / "raw" / "yolo_detections.csv"
 
     load_csv_to_db(csv_path, cur)
+    load_boxes_to_db(base_dir / "data" / "raw" / "yolo_detection_boxes.csv", cur)
 
     # Cleanup
     conn.commit()
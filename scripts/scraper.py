@@ -2,8 +2,10 @@
 Telegram Scraper for Ethiopian Medical Channels
 ================================================
 This script scrapes public Telegram channels and stores:
-- Raw messages as JSON (partitioned by date): data/raw/telegram_messages/YYYY-MM-DD/channel.json
-- Images: data/raw/images/{channel_name}/{message_id}.jpg
+- Raw messages as JSONL or Parquet (partitioned by date): data/raw/telegram_messages/YYYY-MM-DD/channel.{jsonl,parquet}
+- Images: data/raw/images/_blobs/<aa>/<sha256>.jpg, indexed by (channel, message_id)
+  in data/raw/images/_index.sqlite (or data/raw/images/{channel_name}/{message_id}.jpg
+  with --legacy-image-layout)
 - CSV backup: data/raw/csv/YYYY-MM-DD/telegram_data.csv
 - Logs: logs/scrape_YYYY-MM-DD.log
 
@@ -20,10 +22,11 @@ import json
 import asyncio
 import argparse
 import logging
+import shutil
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError
@@ -35,7 +38,16 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.datalake import write_channel_messages_json, write_manifest
+from src.checkpoints import get_checkpoint, update_checkpoint
+from src.datalake import MESSAGE_FORMATS, open_channel_messages_writer, write_manifest
+from src.image_store import ImageStore
+from src.media_downloads import (
+    DEFAULT_DOWNLOAD_RETRIES,
+    DEFAULT_DOWNLOAD_TIMEOUT,
+    DEFAULT_DOWNLOAD_WORKERS,
+    MediaDownloadPool,
+)
+from src.rate_limiter import AdaptiveTokenBucket
 
 # =============================================================================
 # CONFIGURATION
@@ -63,6 +75,17 @@ TODAY = datetime.today().strftime("%Y-%m-%d")
 DEFAULT_CHANNEL_DELAY = 3.0
 DEFAULT_MESSAGE_DELAY = 1.0
 
+# Defaults for concurrent mode, where a shared token bucket replaces the fixed delays.
+DEFAULT_CONCURRENCY = 1
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 10.0
+# Telethon's iter_messages fetches history in pages of this many messages, one API request each.
+MESSAGES_PER_REQUEST = 100
+
+# Scrape modes: see scrape_channel for details.
+SCRAPE_MODES = ("full", "incremental", "backfill")
+DEFAULT_CHUNK_SIZE = 100
+
 # =============================================================================
 # LOGGING SETUP
 # =============================================================================
@@ -102,6 +125,15 @@ async def scrape_channel(
     message_delay: float = DEFAULT_MESSAGE_DELAY,
     channel_delay: float = DEFAULT_CHANNEL_DELAY,
     max_retries: int = 3,
+    rate_limiter: Optional[AdaptiveTokenBucket] = None,
+    mode: str = "full",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    download_retries: int = DEFAULT_DOWNLOAD_RETRIES,
+    download_timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    download_stats: Optional[Dict[str, int]] = None,
+    image_store: Optional[ImageStore] = None,
+    output_format: str = "jsonl",
 ) -> int:
     """
     Scrape a single Telegram channel and save messages + images.
@@ -113,96 +145,224 @@ async def scrape_channel(
         image_dir: Directory to save downloaded images
         json_save_dir: Directory to save JSON output
         limit: Maximum number of messages to scrape (default 100)
+        rate_limiter: Shared token bucket. When given, it replaces the fixed
+            message/channel delays and absorbs FloodWaitError back-offs.
+        mode: 'full' fetches the newest `limit` messages; 'incremental' fetches
+            only messages newer than the channel checkpoint; 'backfill' walks
+            `limit` messages older than the checkpoint in `chunk_size` chunks,
+            persisting after each chunk so a crash resumes where it stopped.
+        chunk_size: Messages per backfill chunk
+        download_workers: Concurrent photo download workers for this channel
+        download_retries: Extra attempts per failed/timed-out photo download
+        download_timeout: Per-attempt photo download timeout in seconds
+        download_stats: Optional dict that downloaded/failed/skipped counts are added to
+        image_store: Content-addressed image store. When None, photos are saved
+            to the legacy data/raw/images/{channel_name}/{message_id}.jpg layout.
+        output_format: Partition file format, 'jsonl' or 'parquet'
     
     Returns:
-        Number of messages scraped
+        Number of messages in the channel's partition for `date_str`
     """
     channel_name = channel.strip('@')
     
     retries = 0
     while True:
         try:
+            checkpoint = get_checkpoint(base_path, channel_name) or {}
+            if mode == "backfill" and checkpoint.get("backfill_complete"):
+                logger.info(f"Backfill of {channel} already reached the start of its history. Skipping.")
+                return 0
+
             # Get channel entity (validates channel exists and is accessible)
+            if rate_limiter:
+                await rate_limiter.acquire()
             entity = await client.get_entity(channel)
             channel_title = entity.title
-            messages = []
 
-            # Create image directory for this channel
-            # Path format: data/raw/images/{channel_name}/
-            channel_image_dir = os.path.join(base_path, "raw", "images", channel_name)
-            os.makedirs(channel_image_dir, exist_ok=True)
-
-            logger.info(f"Starting scrape of {channel} (limit={limit})")
-
-            # Iterate through channel messages (newest first by default)
-            async for message in client.iter_messages(entity, limit=limit):
-                image_path: Optional[str] = None
-                has_media = message.media is not None
-
-                # Download photo if present
-                # Challenge requires: data/raw/images/{channel_name}/{message_id}.jpg
-                if has_media and isinstance(message.media, MessageMediaPhoto):
-                    filename = f"{message.id}.jpg"
-                    image_path = os.path.join(channel_image_dir, filename)
-                    try:
-                        await client.download_media(message.media, image_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to download image for message {message.id}: {e}")
-                        image_path = None
-
-                # Build message dict with all required fields
-                message_dict = {
-                    "message_id": message.id,
-                    "channel_name": channel_name,
-                    "channel_title": channel_title,
-                    "message_date": message.date.isoformat(),  # ISO format for consistency
-                    "message_text": message.message or "",     # Handle None text
-                    "has_media": has_media,
-                    "image_path": image_path,
-                    "views": message.views or 0,               # Some messages may not have views
-                    "forwards": message.forwards or 0,
-                }
-
-                # Write to CSV (backup/alternative format)
-                writer.writerow([
-                    message_dict["message_id"],
-                    message_dict["channel_name"],
-                    message_dict["channel_title"],
-                    message_dict["message_date"],
-                    message_dict["message_text"],
-                    message_dict["has_media"],
-                    message_dict["image_path"],
-                    message_dict["views"],
-                    message_dict["forwards"],
-                ])
-
-                messages.append(message_dict)
-
-                # Optional delay between messages (reduces risk of rate limiting).
-                if message_delay and message_delay > 0:
-                    await asyncio.sleep(message_delay)
-
-            write_channel_messages_json(
+            # Messages are streamed to <channel>.<format>.part and published on close.
+            # Non-full runs may hit the same day more than once (or follow a crashed
+            # run), so they resume what is already in today's partition.
+            partition = open_channel_messages_writer(
                 base_path=base_path,
                 date_str=date_str,
                 channel_name=channel_name,
-                messages=messages,
+                resume=mode != "full",
+                fmt=output_format,
             )
+            seen_ids = set(partition.message_ids)
 
-            logger.info(f"Finished scraping {channel}: {len(messages)} messages saved")
+            # Create image directory for this channel (legacy layout only)
+            # Path format: data/raw/images/{channel_name}/
+            channel_image_dir = os.path.join(base_path, "raw", "images", channel_name)
+            if image_store is None:
+                os.makedirs(channel_image_dir, exist_ok=True)
+
+            def store_image(path: str, record: Dict[str, Any], photo_id: Optional[int]) -> None:
+                """Move a downloaded photo from staging into the content-addressed store."""
+                record["image_path"] = image_store.add_file(
+                    path, record["channel_name"], record["message_id"], photo_id
+                )
+
+            # Messages waiting for their photo downloads before going to the CSV.
+            pending_rows: List[Dict[str, Any]] = []
+
+            with partition:
+                async with MediaDownloadPool(
+                    client.download_media,
+                    workers=download_workers,
+                    max_retries=download_retries,
+                    timeout=download_timeout,
+                    rate_limiter=rate_limiter,
+                    finalize=store_image if image_store else None,
+                ) as pool:
+
+                    async def fetch(**iter_kwargs: Any) -> List[int]:
+                        """Iterate messages with `iter_kwargs` and return the IDs seen."""
+                        fetched_ids: List[int] = []
+
+                        # Iterate through channel messages (newest first by default)
+                        async for message in client.iter_messages(entity, **iter_kwargs):
+                            # Charge the bucket once per page request, not once per message
+                            if rate_limiter and len(fetched_ids) % MESSAGES_PER_REQUEST == 0:
+                                await rate_limiter.acquire()
+                                rate_limiter.on_success()
+
+                            fetched_ids.append(message.id)
+                            if message.id in seen_ids:
+                                continue
+
+                            image_path: Optional[str] = None
+                            photo_id: Optional[int] = None
+                            has_media = message.media is not None
+
+                            # Photo path if present
+                            if has_media and isinstance(message.media, MessageMediaPhoto):
+                                if image_store:
+                                    # Reuse the blob if this message (or a forwarded copy of
+                                    # the same photo) was stored before; else stage a download.
+                                    photo_id = getattr(message.media.photo, "id", None)
+                                    image_path = (
+                                        image_store.lookup(channel_name, message.id, photo_id)
+                                        or image_store.staging_path(channel_name, message.id)
+                                    )
+                                else:
+                                    # Legacy layout: data/raw/images/{channel_name}/{message_id}.jpg
+                                    filename = f"{message.id}.jpg"
+                                    image_path = os.path.join(channel_image_dir, filename)
+
+                            # Build message dict with all required fields
+                            message_dict = {
+                                "message_id": message.id,
+                                "channel_name": channel_name,
+                                "channel_title": channel_title,
+                                "message_date": message.date.isoformat(),  # ISO format for consistency
+                                "message_text": message.message or "",     # Handle None text
+                                "has_media": has_media,
+                                "image_path": image_path,
+                                "views": message.views or 0,               # Some messages may not have views
+                                "forwards": message.forwards or 0,
+                            }
+
+                            # Hand the photo to the download workers and keep iterating;
+                            # they reset image_path to None if the download fails.
+                            if image_path:
+                                await pool.submit(message.media, image_path, message_dict, context=photo_id)
+
+                            pending_rows.append(message_dict)
+                            seen_ids.add(message.id)
+                            # Bound memory: settle downloads and stream rows out every chunk.
+                            if len(pending_rows) >= chunk_size:
+                                await write_pending()
+
+                            # Optional delay between messages (reduces risk of rate limiting).
+                            if not rate_limiter and message_delay and message_delay > 0:
+                                await asyncio.sleep(message_delay)
+
+                        return fetched_ids
+
+                    async def write_pending() -> None:
+                        """Write rows whose photo downloads have settled to the CSV and partition."""
+                        # image_path is only final once the queued downloads are done.
+                        await pool.join()
+
+                        # Write to CSV (backup/alternative format)
+                        for message_dict in pending_rows:
+                            writer.writerow([
+                                message_dict["message_id"],
+                                message_dict["channel_name"],
+                                message_dict["channel_title"],
+                                message_dict["message_date"],
+                                message_dict["message_text"],
+                                message_dict["has_media"],
+                                message_dict["image_path"],
+                                message_dict["views"],
+                                message_dict["forwards"],
+                            ])
+                            partition.append(message_dict)
+                        pending_rows.clear()
+
+                    async def persist(fetched_ids: List[int], backfill_complete: Optional[bool] = None) -> None:
+                        """Make the partition durable first, then advance the checkpoint past it."""
+                        await write_pending()
+                        partition.flush()
+                        update_checkpoint(
+                            base_path=base_path,
+                            channel_name=channel_name,
+                            message_ids=fetched_ids,
+                            backfill_complete=backfill_complete,
+                        )
+
+                    if mode == "backfill":
+                        # offset_id=0 starts from the newest message on a first backfill.
+                        offset_id = checkpoint.get("oldest_message_id", 0)
+                        remaining = limit
+                        logger.info(f"Starting backfill of {channel} below message {offset_id} (limit={limit})")
+                        while remaining > 0:
+                            size = min(chunk_size, remaining)
+                            fetched_ids = await fetch(limit=size, offset_id=offset_id)
+                            reached_start = len(fetched_ids) < size
+                            await persist(fetched_ids, backfill_complete=reached_start)
+                            if reached_start:
+                                break
+                            offset_id = min(fetched_ids)
+                            remaining -= len(fetched_ids)
+
+                    elif mode == "incremental" and "last_message_id" in checkpoint:
+                        min_id = checkpoint["last_message_id"]
+                        logger.info(f"Starting incremental scrape of {channel} above message {min_id}")
+                        # No limit: stopping early would leave a gap below the new high-water mark.
+                        await persist(await fetch(limit=None, min_id=min_id))
+
+                    else:
+                        logger.info(f"Starting scrape of {channel} (limit={limit})")
+                        await persist(await fetch(limit=limit))
+
+            if download_stats is not None:
+                for key, value in pool.stats.items():
+                    download_stats[key] = download_stats.get(key, 0) + value
+
+            logger.info(
+                f"Finished scraping {channel}: {partition.count} messages saved "
+                f"(images downloaded={pool.stats['downloaded']}, "
+                f"failed={pool.stats['failed']}, skipped={pool.stats['skipped']})"
+            )
 
-            # Delay between channels (recommended).
-            if channel_delay and channel_delay > 0:
+            # Delay between channels (recommended). Not needed with a rate limiter.
+            if not rate_limiter and channel_delay and channel_delay > 0:
                 await asyncio.sleep(channel_delay)
 
-            return len(messages)
+            return partition.count
 
         except FloodWaitError as e:
             # Telegram explicitly asks you to wait e.seconds
             wait_seconds = int(getattr(e, "seconds", 0) or 0)
             wait_seconds = max(wait_seconds, 1)
             logger.warning(f"FloodWaitError for {channel}: sleeping {wait_seconds}s")
-            await asyncio.sleep(wait_seconds)
+            if rate_limiter:
+                # Pauses every channel sharing the limiter, not just this one.
+                rate_limiter.on_flood_wait(wait_seconds)
+            else:
+                await asyncio.sleep(wait_seconds)
             retries += 1
             if retries > max_retries:
                 logger.error(f"Too many FloodWait retries for {channel}. Skipping.")
@@ -219,6 +379,15 @@ async def scrape_all_channels(
     limit: int = 100,
     message_delay: float = DEFAULT_MESSAGE_DELAY,
     channel_delay: float = DEFAULT_CHANNEL_DELAY,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_limiter: Optional[AdaptiveTokenBucket] = None,
+    mode: str = "full",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    download_retries: int = DEFAULT_DOWNLOAD_RETRIES,
+    download_timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+    use_image_store: bool = True,
+    output_format: str = "jsonl",
 ) -> dict:
     """
     Scrape multiple Telegram channels and organize output.
@@ -228,6 +397,18 @@ async def scrape_all_channels(
         channels: List of channel usernames to scrape
         base_path: Base directory for all output (e.g., 'data')
         limit: Max messages per channel
+        concurrency: Number of channels scraped at once over the same client.
+            Values above 1 enable concurrent mode, throttled by ``rate_limiter``
+            (a default AdaptiveTokenBucket is created if none is given).
+        rate_limiter: Shared token bucket used instead of fixed delays
+        mode: Scrape mode ('full', 'incremental' or 'backfill')
+        chunk_size: Messages per backfill chunk
+        download_workers: Concurrent photo download workers per channel
+        download_retries: Extra attempts per failed/timed-out photo download
+        download_timeout: Per-attempt photo download timeout in seconds
+        use_image_store: Store photos once per unique content (see src/image_store.py)
+            instead of once per channel/message
+        output_format: Partition file format, 'jsonl' or 'parquet' (typed, zstd-compressed)
     
     Returns:
         Dict with scraping statistics per channel
@@ -248,48 +429,84 @@ async def scrape_all_channels(
     csv_file_path = os.path.join(csv_dir, "telegram_data.csv")
     stats = {}
     
-    with open(csv_file_path, 'w', newline='', encoding='utf-8') as f:
+    # Incremental/backfill runs only add new rows, so append to today's CSV
+    # instead of truncating what an earlier run wrote. Rows go to a .part copy
+    # that replaces the CSV once the run finishes, so a crash never truncates it.
+    append_csv = mode != "full" and os.path.exists(csv_file_path)
+    csv_tmp_path = f"{csv_file_path}.part"
+    if append_csv:
+        shutil.copyfile(csv_file_path, csv_tmp_path)
+
+    with open(csv_tmp_path, 'a' if append_csv else 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         # Header row matching challenge required fields
-        writer.writerow([
-            'message_id',
-            'channel_name', 
-            'channel_title',
-            'message_date',
-            'message_text',
-            'has_media',
-            'image_path',
-            'views',
-            'forwards'
-        ])
+        if not append_csv:
+            writer.writerow([
+                'message_id',
+                'channel_name', 
+                'channel_title',
+                'message_date',
+                'message_text',
+                'has_media',
+                'image_path',
+                'views',
+                'forwards'
+            ])
         
         channel_counts = {}
-
-        for channel in channels:
-            logger.info(f"Scraping {channel}...")
-            count = await scrape_channel(
-                client=client,
-                channel=channel,
-                writer=writer,
-                base_path=base_path,
-                date_str=TODAY,
-                limit=limit,
-                message_delay=message_delay,
-                channel_delay=channel_delay,
-            )
-            stats[channel] = count
-            channel_counts[channel.strip("@")] = count
+        download_stats: Dict[str, Dict[str, int]] = {}
+
+        if concurrency > 1 and rate_limiter is None:
+            rate_limiter = AdaptiveTokenBucket(rate=DEFAULT_RATE, capacity=DEFAULT_BURST)
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        image_store = ImageStore(base_path) if use_image_store else None
+
+        async def run_channel(channel: str) -> None:
+            async with semaphore:
+                logger.info(f"Scraping {channel}...")
+                count = await scrape_channel(
+                    client=client,
+                    channel=channel,
+                    writer=writer,
+                    base_path=base_path,
+                    date_str=TODAY,
+                    limit=limit,
+                    message_delay=message_delay,
+                    channel_delay=channel_delay,
+                    rate_limiter=rate_limiter,
+                    mode=mode,
+                    chunk_size=chunk_size,
+                    download_workers=download_workers,
+                    download_retries=download_retries,
+                    download_timeout=download_timeout,
+                    download_stats=download_stats.setdefault(channel.strip("@"), {}),
+                    image_store=image_store,
+                    output_format=output_format,
+                )
+                stats[channel] = count
+                channel_counts[channel.strip("@")] = count
+
+        # CSV rows are written synchronously between awaits, so sharing the
+        # writer across channel tasks on one event loop is safe.
+        await asyncio.gather(*(run_channel(channel) for channel in channels))
+        if image_store:
+            image_store.close()
 
         write_manifest(
             base_path=base_path,
             date_str=TODAY,
             channel_message_counts=channel_counts,
+            extra={"image_downloads": download_stats},
         )
+
+    os.replace(csv_tmp_path, csv_file_path)
     
     # Log summary
     total = sum(stats.values())
     logger.info(f"Scraping complete. Total messages: {total}")
-    for ch, count in stats.items():
+    for ch in channels:
+        count = stats.get(ch, 0)
         logger.info(f"  {ch}: {count} messages")
     
     return stats
@@ -333,6 +550,66 @@ Examples:
         default=DEFAULT_CHANNEL_DELAY,
         help="Pause (seconds) after finishing a channel (default: 3)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Channels to scrape at once; >1 replaces the fixed delays with a shared rate limiter (default: 1)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Initial rate limiter speed in requests/second for concurrent mode (default: 2)"
+    )
+    parser.add_argument(
+        "--burst",
+        type=float,
+        default=DEFAULT_BURST,
+        help="Rate limiter burst capacity for concurrent mode (default: 10)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=SCRAPE_MODES,
+        default="full",
+        help="full: newest --limit messages; incremental: only messages newer than the "
+             "last checkpoint; backfill: --limit older messages, resumable (default: full)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Messages per backfill chunk; progress is checkpointed after each chunk (default: 100)"
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help="Concurrent photo download workers per channel (default: 4)"
+    )
+    parser.add_argument(
+        "--download-retries",
+        type=int,
+        default=DEFAULT_DOWNLOAD_RETRIES,
+        help="Extra attempts for a failed or timed-out photo download (default: 2)"
+    )
+    parser.add_argument(
+        "--download-timeout",
+        type=float,
+        default=DEFAULT_DOWNLOAD_TIMEOUT,
+        help="Per-attempt photo download timeout in seconds (default: 60)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=MESSAGE_FORMATS,
+        default="jsonl",
+        help="Partition file format: jsonl, or parquet for typed, compressed columnar files (default: jsonl)"
+    )
+    parser.add_argument(
+        "--legacy-image-layout",
+        action="store_true",
+        help="Save photos as images/{channel}/{message_id}.jpg instead of the deduplicating content-addressed store"
+    )
     args = parser.parse_args()
     
     # Initialize Telegram client
@@ -360,6 +637,18 @@ Examples:
                 args.limit,
                 message_delay=args.message_delay,
                 channel_delay=args.channel_delay,
+                concurrency=args.concurrency,
+                rate_limiter=(
+                    AdaptiveTokenBucket(rate=args.rate, capacity=args.burst)
+                    if args.concurrency > 1 else None
+                ),
+                mode=args.mode,
+                chunk_size=args.chunk_size,
+                download_workers=args.download_workers,
+                download_retries=args.download_retries,
+                download_timeout=args.download_timeout,
+                use_image_store=not args.legacy_image_layout,
+                output_format=args.format,
             )
 
     asyncio.run(main())
\ No newline at end of file
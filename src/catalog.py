@@ -0,0 +1,275 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CATALOG_FILENAME = "_catalog.sqlite"
+
+
+def catalog_path(base_path: str) -> str:
+    """
+    Get the path to the partition catalog of a data lake.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        str: Full path to the SQLite catalog file.
+    """
+    return os.path.join(base_path, "raw", CATALOG_FILENAME)
+
+
+def _connect(base_path: str) -> sqlite3.Connection:
+    path = catalog_path(base_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS partitions (
+            path TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            format TEXT NOT NULL,
+            date_min TEXT NOT NULL,
+            date_max TEXT NOT NULL,
+            channel TEXT,
+            row_count INTEGER NOT NULL,
+            byte_size INTEGER NOT NULL,
+            checksum TEXT NOT NULL,
+            min_message_id INTEGER,
+            max_message_id INTEGER,
+            updated_utc TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_partitions_dates ON partitions (kind, date_min, date_max);
+        CREATE INDEX IF NOT EXISTS idx_partitions_channel ON partitions (channel);
+        """
+    )
+    return conn
+
+
+def _relative(base_path: str, path: str) -> str:
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(base_path)).replace(os.sep, "/")
+
+
+def record_partition(
+    *,
+    base_path: str,
+    path: str,
+    kind: str,
+    fmt: str,
+    date_min: str,
+    date_max: str,
+    channel: Optional[str],
+    row_count: int,
+    byte_size: int,
+    checksum: str,
+    min_message_id: Optional[int] = None,
+    max_message_id: Optional[int] = None,
+) -> None:
+    """
+    Insert or replace the catalog entry of a lake file.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        path (str): Path of the file (stored relative to `base_path`).
+        kind (str): 'messages' for message partitions, 'manifest' for manifests.
+        fmt (str): File format ('json', 'jsonl', 'parquet').
+        date_min (str): First date ('YYYY-MM-DD') covered by the file.
+        date_max (str): Last date ('YYYY-MM-DD') covered by the file.
+        channel (Optional[str]): Channel name, or None for files spanning channels.
+        row_count (int): Number of messages in the file.
+        byte_size (int): File size in bytes.
+        checksum (str): SHA-256 of the file contents.
+        min_message_id (Optional[int]): Smallest message_id in the file.
+        max_message_id (Optional[int]): Largest message_id in the file.
+    """
+    with closing(_connect(base_path)) as conn, conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO partitions
+            (path, kind, format, date_min, date_max, channel, row_count, byte_size,
+             checksum, min_message_id, max_message_id, updated_utc)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                _relative(base_path, path), kind, fmt, date_min, date_max, channel,
+                row_count, byte_size, checksum, min_message_id, max_message_id,
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+
+
+def remove_partition(base_path: str, path: str) -> None:
+    """
+    Drop the catalog entry of a file that was deleted or replaced.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        path (str): Path of the removed file.
+    """
+    if not os.path.isfile(catalog_path(base_path)):
+        return
+    with closing(_connect(base_path)) as conn, conn:
+        conn.execute("DELETE FROM partitions WHERE path = ?", (_relative(base_path, path),))
+
+
+def list_partitions(
+    base_path: str,
+    date_range: Optional[Tuple[Optional[str], Optional[str]]] = None,
+    channels: Optional[Iterable[str]] = None,
+    kind: str = "messages",
+) -> List[Dict[str, Any]]:
+    """
+    Look up catalogued files overlapping a date range and/or belonging to given channels.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_range (Optional[Tuple[Optional[str], Optional[str]]]): Inclusive
+            ('YYYY-MM-DD', 'YYYY-MM-DD') bounds; either side may be None.
+        channels (Optional[Iterable[str]]): Channel names to keep. Files that
+            span several channels (channel is NULL) are always returned.
+        kind (str): 'messages' or 'manifest'.
+
+    Returns:
+        List[Dict[str, Any]]: Catalog rows ordered by date and channel, with an
+        absolute `abs_path` added for convenience.
+    """
+    if not os.path.isfile(catalog_path(base_path)):
+        return []
+
+    query = "SELECT * FROM partitions WHERE kind = ?"
+    params: List[Any] = [kind]
+    start, end = date_range if date_range else (None, None)
+    if start:
+        query += " AND date_max >= ?"
+        params.append(start)
+    if end:
+        query += " AND date_min <= ?"
+        params.append(end)
+    if channels is not None:
+        channel_list = list(channels)
+        placeholders = ", ".join("?" for _ in channel_list)
+        query += f" AND (channel IS NULL OR channel IN ({placeholders}))"
+        params.extend(channel_list)
+    query += " ORDER BY date_min, channel, path"
+
+    with closing(_connect(base_path)) as conn:
+        rows = [dict(row) for row in conn.execute(query, params)]
+    for row in rows:
+        row["abs_path"] = os.path.join(base_path, *row["path"].split("/"))
+    return rows
+
+
+def _lake_files(base_path: str) -> Iterator[Tuple[str, str, bool]]:
+    """Yield (partition, path, is_manifest) for every partition file and manifest in the lake."""
+    # Imported here: src.datalake itself depends on this module.
+    from src.datalake import PARTITION_EXTENSIONS
+
+    root = os.path.join(base_path, "raw", "telegram_messages")
+    if not os.path.isdir(root):
+        return
+    for date_str in sorted(os.listdir(root)):
+        partition_dir = os.path.join(root, date_str)
+        if not os.path.isdir(partition_dir):
+            continue
+        for filename in sorted(os.listdir(partition_dir)):
+            path = os.path.join(partition_dir, filename)
+            if filename == "_manifest.json":
+                yield date_str, path, True
+            elif not filename.startswith("_") and filename.endswith(PARTITION_EXTENSIONS):
+                yield date_str, path, False
+
+
+def _catalog_file(base_path: str, date_str: str, path: str, is_manifest: bool) -> None:
+    from src.datalake import catalog_manifest, catalog_messages_file
+
+    if is_manifest:
+        catalog_manifest(base_path, date_str, path)
+    else:
+        catalog_messages_file(base_path, path)
+
+
+def rebuild_catalog(base_path: str) -> int:
+    """
+    Index every partition file and manifest already in the lake.
+
+    Walks `raw/telegram_messages/` once; afterwards the writers in
+    `src.datalake` keep the catalog up to date.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        int: Number of files catalogued.
+    """
+    count = 0
+    for date_str, path, is_manifest in _lake_files(base_path):
+        _catalog_file(base_path, date_str, path, is_manifest)
+        count += 1
+    return count
+
+
+def refresh_catalog(base_path: str) -> int:
+    """
+    Bring the catalog in line with the files on disk, building it if it doesn't exist.
+
+    Files that reached the lake without going through the writers (a DVC
+    pull, hand-copied days, files from before the catalog existed) are
+    catalogued when they are missing from the catalog or their size or
+    modification time changed since they were indexed; entries of deleted
+    files are dropped. Unchanged files are only stat'ed, so this is cheap
+    enough to run before every read.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        int: Number of entries added, updated or dropped.
+    """
+    if not os.path.isfile(catalog_path(base_path)):
+        return rebuild_catalog(base_path)
+
+    with closing(_connect(base_path)) as conn:
+        known = {
+            row["path"]: (row["byte_size"], datetime.fromisoformat(row["updated_utc"]))
+            for row in conn.execute("SELECT path, byte_size, updated_utc FROM partitions")
+        }
+
+    count = 0
+    for date_str, path, is_manifest in _lake_files(base_path):
+        entry = known.pop(_relative(base_path, path), None)
+        stat = os.stat(path)
+        if entry is not None:
+            byte_size, updated = entry
+            modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+            if byte_size == stat.st_size and modified <= updated:
+                continue
+        _catalog_file(base_path, date_str, path, is_manifest)
+        count += 1
+
+    for relative_path in known:
+        remove_partition(base_path, os.path.join(base_path, *relative_path.split("/")))
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild or query the data lake partition catalog")
+    parser.add_argument("--path", default="data", help="Base data directory (default: data)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every file in the lake")
+    parser.add_argument("--refresh", action="store_true", help="Index files added or changed outside the writers")
+    parser.add_argument("--start", help="First date (YYYY-MM-DD) to list")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD) to list")
+    parser.add_argument("--channel", action="append", help="Channel to list (repeatable)")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(f"Catalogued {rebuild_catalog(args.path)} files")
+    elif args.refresh:
+        print(f"Updated {refresh_catalog(args.path)} catalog entries")
+    for row in list_partitions(args.path, (args.start, args.end), args.channel):
+        print(f"{row['date_min']}  {row['channel'] or '*':<20} {row['row_count']:>8} rows  "
+              f"{row['byte_size']:>10} B  {row['path']}")
@@ -0,0 +1,94 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from src.datalake import atomic_write_json, ensure_dir
+
+
+def checkpoint_path(base_path: str) -> str:
+    """
+    Get the path to the scraper checkpoint store.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        str: Full path to the checkpoint JSON file.
+    """
+    return os.path.join(base_path, "raw", "telegram_messages", "_checkpoints.json")
+
+
+def load_checkpoints(base_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load all per-channel checkpoints.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Mapping of channel name to its checkpoint,
+        or an empty dict if no checkpoint store exists yet.
+    """
+    path = checkpoint_path(base_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_checkpoint(base_path: str, channel_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the checkpoint for a single channel.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        channel_name (str): Name of the Telegram channel (without '@').
+
+    Returns:
+        Optional[Dict[str, Any]]: The channel checkpoint, or None if the channel was never scraped.
+    """
+    return load_checkpoints(base_path).get(channel_name)
+
+
+def update_checkpoint(
+    *,
+    base_path: str,
+    channel_name: str,
+    message_ids: Iterable[int],
+    backfill_complete: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Merge newly scraped message IDs into a channel's checkpoint and persist it.
+
+    The checkpoint keeps the high-water mark (`last_message_id`, used as `min_id`
+    by incremental runs), the low-water mark (`oldest_message_id`, used as
+    `offset_id` by backfill runs) and the time of the last run. The store is
+    rewritten atomically so a crash never leaves it truncated.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        channel_name (str): Name of the Telegram channel (without '@').
+        message_ids (Iterable[int]): IDs of the messages captured in this run/chunk.
+        backfill_complete (Optional[bool]): Set when a backfill reaches the start of the channel history.
+
+    Returns:
+        Dict[str, Any]: The updated channel checkpoint.
+    """
+    checkpoints = load_checkpoints(base_path)
+    checkpoint = checkpoints.get(channel_name, {})
+
+    ids = list(message_ids)
+    if ids:
+        checkpoint["last_message_id"] = max(ids + [checkpoint.get("last_message_id", 0)])
+        oldest = checkpoint.get("oldest_message_id")
+        checkpoint["oldest_message_id"] = min(ids) if oldest is None else min(ids + [oldest])
+    if backfill_complete is not None:
+        checkpoint["backfill_complete"] = backfill_complete
+    checkpoint["last_run_utc"] = datetime.now(timezone.utc).isoformat()
+    checkpoints[channel_name] = checkpoint
+
+    path = checkpoint_path(base_path)
+    ensure_dir(os.path.dirname(path))
+    atomic_write_json(path, checkpoints)
+    return checkpoint
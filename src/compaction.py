@@ -0,0 +1,181 @@
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.catalog import remove_partition
+from src.datalake import (
+    MESSAGE_FORMATS,
+    PARTITION_DATE_FIELD,
+    atomic_write_json,
+    catalog_manifest,
+    describe_partition_files,
+    iter_messages_file,
+    manifest_path,
+    open_channel_messages_writer,
+    partition_files,
+    read_manifest,
+    write_manifest,
+)
+
+DAY_PARTITION_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def day_partitions(base_path: str, month: Optional[str] = None) -> List[str]:
+    """
+    List the daily partition directories of the lake.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        month (Optional[str]): Only return days of this 'YYYY-MM' month.
+
+    Returns:
+        List[str]: Sorted 'YYYY-MM-DD' partition names.
+    """
+    root = os.path.join(base_path, "raw", "telegram_messages")
+    if not os.path.isdir(root):
+        return []
+    return [
+        name for name in sorted(os.listdir(root))
+        if DAY_PARTITION_RE.match(name)
+        and os.path.isdir(os.path.join(root, name))
+        and (month is None or name.startswith(f"{month}-"))
+    ]
+
+
+def compactable_months(base_path: str, before: Optional[str] = None) -> List[str]:
+    """
+    List the months that still have daily partition files.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        before (Optional[str]): Only months strictly before this 'YYYY-MM'
+            (default: the current UTC month, which the scraper is still writing).
+
+    Returns:
+        List[str]: Sorted 'YYYY-MM' month names.
+    """
+    before = before or datetime.now(timezone.utc).strftime("%Y-%m")
+    return sorted({
+        day[:7] for day in day_partitions(base_path)
+        if day[:7] < before and partition_files(base_path, day)
+    })
+
+
+def _merge_message(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine two scrapes of the same message.
+
+    The newer scrape wins (so `views`/`forwards` are the latest counts), but a
+    field it left empty, e.g. an `image_path` whose download failed, keeps the
+    older value.
+    """
+    merged = dict(older)
+    merged.update({key: value for key, value in newer.items() if value is not None})
+    return merged
+
+
+def compact_month(
+    *,
+    base_path: str,
+    month: str,
+    fmt: str = "jsonl",
+    keep_sources: bool = False,
+) -> Dict[str, int]:
+    """
+    Merge a month's daily per-channel partitions into one file per channel.
+
+    Daily files (plus any earlier compaction of the month) are read oldest
+    first and deduplicated on `(channel_name, message_id)`, so each message
+    keeps the counts of its latest scrape. Each message records the day it
+    was last scraped in `partition_date`, so date-range reads
+    (`src.datalake.iter_messages`) still return only the requested days. The
+    result is published atomically as `raw/telegram_messages/YYYY-MM/<channel>.<fmt>`
+    and catalogued for the whole month, so catalog-based readers pick it up
+    for any day it covers.
+    The daily files are then removed from disk and from the catalog; each
+    daily manifest is refreshed and records `compacted_into`.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        month (str): Month to compact, in 'YYYY-MM' format.
+        fmt (str): Output format, one of `MESSAGE_FORMATS` ('jsonl' or 'parquet').
+        keep_sources (bool): Leave the daily files in place (readers will then see duplicates).
+
+    Returns:
+        Dict[str, int]: Channel name -> number of unique messages in its monthly file.
+    """
+    days = day_partitions(base_path, month)
+    sources: Dict[str, List[str]] = {}
+    for partition in [month] + days:
+        for path in partition_files(base_path, partition):
+            sources.setdefault(os.path.basename(path).split(".")[0], []).append(path)
+
+    daily_sources = [path for paths in sources.values() for path in paths
+                     if os.path.basename(os.path.dirname(path)) != month]
+    if not daily_sources:
+        return {}
+
+    counts: Dict[str, int] = {}
+    for channel_name, paths in sorted(sources.items()):
+        merged: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for path in paths:
+            partition = os.path.basename(os.path.dirname(path))
+            for message in iter_messages_file(path):
+                if partition != month:
+                    message[PARTITION_DATE_FIELD] = partition
+                key = (message.get("channel_name"), message.get("message_id"))
+                previous = merged.get(key)
+                merged[key] = message if previous is None else _merge_message(previous, message)
+
+        writer = open_channel_messages_writer(
+            base_path=base_path, date_str=month, channel_name=channel_name, fmt=fmt
+        )
+        with writer:
+            for message in sorted(merged.values(), key=lambda m: m.get("message_id") or 0):
+                writer.append(message)
+        counts[channel_name] = writer.count
+
+    if not keep_sources:
+        for path in daily_sources:
+            os.remove(path)
+            remove_partition(base_path, path)
+        for day in days:
+            manifest = read_manifest(base_path, day)
+            if manifest is None:
+                day_dir = os.path.dirname(manifest_path(base_path, day))
+                if not os.listdir(day_dir):
+                    os.rmdir(day_dir)
+                continue
+            manifest["files"] = describe_partition_files(base_path, day)
+            manifest["compacted_into"] = month
+            out_path = manifest_path(base_path, day)
+            atomic_write_json(out_path, manifest)
+            catalog_manifest(base_path, day, out_path)
+
+    previous_manifest = read_manifest(base_path, month) or {}
+    write_manifest(
+        base_path=base_path,
+        date_str=month,
+        channel_message_counts=counts,
+        extra={"compacted_from": sorted(set(previous_manifest.get("compacted_from", [])) | set(days))},
+    )
+    return counts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compact daily raw message partitions into monthly files")
+    parser.add_argument("--path", default="data", help="Base data directory (default: data)")
+    parser.add_argument("--month", action="append",
+                        help="Month (YYYY-MM) to compact; repeatable (default: every finished month)")
+    parser.add_argument("--format", choices=MESSAGE_FORMATS, default="jsonl",
+                        help="Format of the monthly files (default: jsonl)")
+    parser.add_argument("--keep-sources", action="store_true", help="Don't delete the daily files")
+    args = parser.parse_args()
+
+    for month in args.month or compactable_months(args.path):
+        counts = compact_month(base_path=args.path, month=month, fmt=args.format,
+                               keep_sources=args.keep_sources)
+        print(f"{month}: {sum(counts.values())} messages in {len(counts)} channel files")
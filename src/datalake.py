@@ -1,7 +1,90 @@
+import hashlib
 import json
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.catalog import (
+    list_partitions,
+    record_partition,
+    refresh_catalog,
+    remove_partition,
+)
+
+
+# Partition file formats, in the order readers look for them.
+PARTITION_EXTENSIONS = (".jsonl", ".parquet", ".json")
+
+# Formats the streaming writers can produce.
+MESSAGE_FORMATS = ("jsonl", "parquet")
+
+# Typed Parquet columns for a scraped message; see `message_parquet_schema`.
+MESSAGE_PARQUET_COLUMNS = (
+    ("message_id", "int64"),
+    ("channel_name", "string"),
+    ("channel_title", "string"),
+    ("message_date", "timestamp"),
+    ("message_text", "string"),
+    ("has_media", "bool"),
+    ("image_path", "string"),
+    ("views", "int64"),
+    ("forwards", "int64"),
+    ("partition_date", "string"),
+)
+
+# Field holding the day partition ('YYYY-MM-DD') a message was scraped into. Only
+# compaction sets it, so date-range reads can still select days of a monthly file.
+PARTITION_DATE_FIELD = "partition_date"
+
+# Rows per Parquet row group: large enough for zstd and column statistics to pay off.
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow lazily so JSON-only users don't need it installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet support requires pyarrow. Install it with `pip install pyarrow`."
+        ) from e
+    return pyarrow
+
+
+def message_parquet_schema() -> Any:
+    """
+    Get the Arrow schema used for Parquet message partitions.
+
+    Returns:
+        pyarrow.Schema: Schema matching the scraper's message dictionaries.
+    """
+    pa = _import_pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "bool": pa.bool_(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in MESSAGE_PARQUET_COLUMNS])
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file without loading it into memory.
+
+    Args:
+        path (str): Path to the file.
+        chunk_size (int): Bytes read per iteration.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def ensure_dir(path: str) -> None:
@@ -14,6 +97,26 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def atomic_write_json(path: str, payload: Any, indent: Optional[int] = 2) -> None:
+    """
+    Write JSON to a temporary file and atomically rename it into place.
+
+    Readers see either the previous file or the complete new one, never a
+    truncated file left behind by a crash mid-write.
+
+    Args:
+        path (str): Destination path.
+        payload (Any): JSON-serialisable object to write.
+        indent (Optional[int]): Indentation passed to `json.dump`.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 def telegram_messages_partition_dir(base_path: str, date_str: str) -> str:
     """
     Get the path to the Telegram messages partition directory for a given date.
@@ -28,6 +131,25 @@ def telegram_messages_partition_dir(base_path: str, date_str: str) -> str:
     return os.path.join(base_path, "raw", "telegram_messages", date_str)
 
 
+def partition_date_bounds(partition: str) -> Tuple[str, str]:
+    """
+    Get the first and last date covered by a partition directory.
+
+    Daily partitions are named 'YYYY-MM-DD'; monthly partitions written by
+    compaction (see `src.compaction`) are named 'YYYY-MM' and cover the whole
+    month. '-31' is used as the month end since bounds are compared as strings.
+
+    Args:
+        partition (str): Partition directory name.
+
+    Returns:
+        Tuple[str, str]: Inclusive ('YYYY-MM-DD', 'YYYY-MM-DD') bounds.
+    """
+    if len(partition) == 7:
+        return f"{partition}-01", f"{partition}-31"
+    return partition, partition
+
+
 def telegram_images_dir(base_path: str) -> str:
     """
     Get the path to the Telegram images directory.
@@ -80,11 +202,470 @@ def write_channel_messages_json(
         str: Full path to the written JSON file.
     """
     out_path = channel_messages_json_path(base_path, date_str, channel_name)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(messages, f, ensure_ascii=False, indent=2)
+    atomic_write_json(out_path, messages)
+    catalog_messages_file(
+        base_path,
+        out_path,
+        row_count=len(messages),
+        message_ids=[m.get("message_id") for m in messages],
+    )
     return out_path
 
 
+def channel_messages_jsonl_path(base_path: str, date_str: str, channel_name: str) -> str:
+    """
+    Get the path for a channel's newline-delimited JSON (JSONL) messages file for a specific date.
+
+    Ensures that the partition directory exists.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+        channel_name (str): Name of the Telegram channel.
+
+    Returns:
+        str: Full path to the channel's JSONL file.
+    """
+    partition_dir = telegram_messages_partition_dir(base_path, date_str)
+    ensure_dir(partition_dir)
+    return os.path.join(partition_dir, f"{channel_name}.jsonl")
+
+
+def channel_messages_parquet_path(base_path: str, date_str: str, channel_name: str) -> str:
+    """
+    Get the path for a channel's Parquet messages file for a specific date.
+
+    Ensures that the partition directory exists.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+        channel_name (str): Name of the Telegram channel.
+
+    Returns:
+        str: Full path to the channel's Parquet file.
+    """
+    partition_dir = telegram_messages_partition_dir(base_path, date_str)
+    ensure_dir(partition_dir)
+    return os.path.join(partition_dir, f"{channel_name}.parquet")
+
+
+def find_channel_messages_path(base_path: str, date_str: str, channel_name: str) -> Optional[str]:
+    """
+    Find the existing messages file of a (date, channel) partition, in `PARTITION_EXTENSIONS` order.
+
+    If the day was compacted, the monthly file now holding its messages is returned.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+        channel_name (str): Name of the Telegram channel.
+
+    Returns:
+        Optional[str]: Path to the partition file, or None if the partition doesn't exist.
+    """
+    for partition in (date_str, date_str[:7]):
+        partition_dir = telegram_messages_partition_dir(base_path, partition)
+        for ext in PARTITION_EXTENSIONS:
+            path = os.path.join(partition_dir, f"{channel_name}{ext}")
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def _iter_json_array(f: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array one at a time, reading `f` in chunks."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace and separators between items
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("JSON file does not contain an array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Item may be cut off at the chunk boundary; read more unless we can't.
+                if eof:
+                    raise
+            else:
+                # Only trust an item once its delimiter is buffered: a number at
+                # the end of the buffer (e.g. "12" of "12.5") may continue in the next chunk.
+                next_pos = end
+                while next_pos < len(buffer) and buffer[next_pos] in " \t\r\n":
+                    next_pos += 1
+                if next_pos < len(buffer) and buffer[next_pos] in ",]":
+                    yield item
+                    pos = next_pos
+                    continue
+                if eof:
+                    raise json.JSONDecodeError("Expected ',' or ']'", buffer, next_pos)
+        elif eof:
+            if not started:
+                raise ValueError("JSON file does not contain an array")
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_messages_file(path: str, columns: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the messages of a partition file without loading it into memory.
+
+    Reads Parquet (`.parquet`) one record batch at a time, the legacy
+    JSON-array format (`.json`) incrementally and anything else (`.jsonl`,
+    `.part` journals) as one message per line, so every format is readable at
+    constant memory and yields the same dictionaries.
+
+    Args:
+        path (str): Path to a partition file.
+        columns (Optional[Iterable[str]]): Fields to keep; missing ones are None.
+            Parquet files only decode these columns.
+
+    Yields:
+        Dict[str, Any]: One message dictionary at a time.
+    """
+    fields = list(columns) if columns is not None else None
+    if path.endswith(".parquet"):
+        yield from _iter_parquet(path, fields)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        messages = _iter_json_array(f) if path.endswith(".json") else (
+            json.loads(line) for line in f if line.strip()
+        )
+        for message in messages:
+            if fields is not None and isinstance(message, dict):
+                message = {name: message.get(name) for name in fields}
+            yield message
+
+
+def _iter_parquet(path: str, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield Parquet rows as message dicts, with `message_date` as an ISO string like the JSON formats."""
+    pa = _import_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(path)
+    stored = None
+    if columns is not None:
+        available = set(parquet_file.schema_arrow.names)
+        stored = [name for name in columns if name in available]
+    for batch in parquet_file.iter_batches(columns=stored):
+        for row in batch.to_pylist():
+            if isinstance(row.get("message_date"), datetime):
+                row["message_date"] = row["message_date"].isoformat()
+            if columns is not None:
+                row = {name: row.get(name) for name in columns}
+            elif row.get(PARTITION_DATE_FIELD) is None:
+                # Like the JSON formats, only compacted messages carry it
+                row.pop(PARTITION_DATE_FIELD, None)
+            yield row
+
+
+def iter_messages(
+    base_path: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    channels: Optional[Iterable[str]] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream messages from the raw lake, partition by partition.
+
+    Partitions are selected from the catalog by date range and channel before
+    any file is opened (the catalog is first refreshed, see
+    `src.catalog.refresh_catalog`, so files added outside the writers aren't
+    missed), so reading one channel never touches the others. Dates are partition
+    (scrape) dates. A compacted month that only partly overlaps the range is
+    filtered by each message's `partition_date`; messages compacted before
+    that field was recorded don't have it and are returned for any day of
+    their month.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        start_date (Optional[str]): First partition date ('YYYY-MM-DD'), inclusive.
+        end_date (Optional[str]): Last partition date ('YYYY-MM-DD'), inclusive.
+        channels (Optional[Iterable[str]]): Channel names to read; None reads all.
+        columns (Optional[Iterable[str]]): Fields to materialize; None keeps every field.
+
+    Yields:
+        Dict[str, Any]: One message dictionary at a time.
+    """
+    refresh_catalog(base_path)
+    fields = list(columns) if columns is not None else None
+    for row in list_partitions(base_path, (start_date, end_date), channels):
+        if not os.path.exists(row["abs_path"]):
+            continue
+        if (not start_date or row["date_min"] >= start_date) and (not end_date or row["date_max"] <= end_date):
+            yield from iter_messages_file(row["abs_path"], fields)
+            continue
+
+        # Compacted month partly in range: keep the messages of the days in range
+        projected = fields is not None and PARTITION_DATE_FIELD not in fields
+        read_fields = fields + [PARTITION_DATE_FIELD] if projected else fields
+        for message in iter_messages_file(row["abs_path"], read_fields):
+            day = message.pop(PARTITION_DATE_FIELD, None) if projected else message.get(PARTITION_DATE_FIELD)
+            if day is not None and ((start_date and day < start_date) or (end_date and day > end_date)):
+                continue
+            yield message
+
+
+def _sibling_partition_paths(path: str) -> List[str]:
+    """Paths of the same (date, channel) partition in the other file formats."""
+    stem = os.path.splitext(path)[0]
+    return [stem + ext for ext in PARTITION_EXTENSIONS if stem + ext != path]
+
+
+class ChannelMessagesWriter:
+    """
+    Streaming JSONL writer for one (date, channel) partition.
+
+    Messages are appended to ``<channel>.jsonl.part`` as they arrive and the
+    file is atomically renamed to ``<channel>.jsonl`` on :meth:`close`, so
+    readers never see a half-written partition. If a run dies mid-channel the
+    ``.part`` file is kept and a writer opened with ``resume=True`` continues
+    from its last complete line instead of starting over.
+    """
+
+    def __init__(self, path: str, resume: bool = False, base_path: Optional[str] = None) -> None:
+        """
+        Args:
+            path (str): Final `.jsonl` path of the partition.
+            resume (bool): Keep the content of an interrupted `.part` file, or
+                else of the already published partition, and append to it.
+            base_path (Optional[str]): Lake base path; when set, the published file is catalogued.
+        """
+        self.path = path
+        self.base_path = base_path
+        self.tmp_path = f"{path}.part"
+        self.count = 0
+        self.message_ids: Set[Any] = set()
+
+        if resume and os.path.exists(self.tmp_path):
+            self._truncate_partial_line()
+            for message in iter_messages_file(self.tmp_path):
+                self._track(message)
+            self._file = open(self.tmp_path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.tmp_path, "w", encoding="utf-8")
+            if resume:
+                self._seed()
+
+    def _seed(self) -> None:
+        """Carry over the already published partition, whichever format it was written in."""
+        for seed_path in [self.path] + _sibling_partition_paths(self.path):
+            if os.path.exists(seed_path):
+                for message in iter_messages_file(seed_path):
+                    self.append(message)
+                return
+
+    def _truncate_partial_line(self, block_size: int = 64 * 1024) -> None:
+        """Drop a trailing line that was only partly written when the previous run died."""
+        with open(self.tmp_path, "rb+") as f:
+            # Scan backwards from the end in fixed-size blocks for the last newline
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(end - block_size, 0)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                f.truncate(end)
+
+    def _track(self, message: Dict[str, Any]) -> None:
+        self.count += 1
+        self.message_ids.add(message.get("message_id"))
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """
+        Append one message to the partition.
+
+        Args:
+            message (Dict[str, Any]): Message dictionary to write.
+        """
+        self._file.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self._track(message)
+
+    def flush(self) -> None:
+        """Flush buffered lines to disk so they survive a crash."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> str:
+        """
+        Publish the partition by atomically renaming the `.part` file.
+
+        Files of the same partition in other formats are removed: the new
+        file replaces them (their messages were carried over when resuming).
+
+        Returns:
+            str: Full path to the published file.
+        """
+        self.flush()
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        self._publish()
+        return self.path
+
+    def _publish(self) -> None:
+        """Remove the partition's files in other formats and catalog the new one."""
+        for sibling in _sibling_partition_paths(self.path):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+                if self.base_path:
+                    remove_partition(self.base_path, sibling)
+        if self.base_path:
+            catalog_messages_file(
+                self.base_path,
+                self.path,
+                row_count=self.count,
+                message_ids=self.message_ids,
+            )
+
+    def release(self) -> None:
+        """Close the file handle but keep the `.part` file for a later resume."""
+        if not self._file.closed:
+            self._file.flush()
+            self._file.close()
+
+    def __enter__(self) -> "ChannelMessagesWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.release()
+
+
+class ParquetMessagesWriter(ChannelMessagesWriter):
+    """
+    Streaming Parquet writer for one (date, channel) partition.
+
+    While the partition is open, messages are journalled to
+    ``<channel>.parquet.part`` one JSON line at a time, exactly like
+    :class:`ChannelMessagesWriter`: :meth:`flush` makes them durable and a
+    writer opened with ``resume=True`` continues from the journal after a
+    crash. An unfinished Parquet file has no footer and can't be read back,
+    so the columnar file is only built on :meth:`close`, which converts the
+    journal into zstd-compressed row groups of `row_group_size` rows and
+    atomically publishes ``<channel>.parquet``. Large row groups keep
+    compression and column statistics effective.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resume: bool = False,
+        base_path: Optional[str] = None,
+        compression: str = "zstd",
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+    ) -> None:
+        """
+        Args:
+            path (str): Final `.parquet` path of the partition.
+            resume (bool): Keep the content of an interrupted `.part` journal, or
+                else of the already published partition, and append to it.
+            base_path (Optional[str]): Lake base path; when set, the published file is catalogued.
+            compression (str): Parquet compression codec.
+            row_group_size (int): Number of rows per row group of the published file.
+        """
+        self._pa = _import_pyarrow()
+        self.compression = compression
+        self.row_group_size = row_group_size
+        super().__init__(path, resume=resume, base_path=base_path)
+
+    def _parquet_row(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        row = {name: message.get(name) for name, _ in MESSAGE_PARQUET_COLUMNS}
+        message_date = row["message_date"]
+        if isinstance(message_date, str):
+            row["message_date"] = datetime.fromisoformat(message_date.replace("Z", "+00:00"))
+        return row
+
+    def close(self) -> str:
+        """
+        Convert the journal into a Parquet file and publish it by atomically renaming it into place.
+
+        Returns:
+            str: Full path to the published Parquet file.
+        """
+        self.flush()
+        self._file.close()
+
+        schema = message_parquet_schema()
+        build_path = f"{self.path}.build"
+        writer = self._pa.parquet.ParquetWriter(build_path, schema, compression=self.compression)
+        rows: List[Dict[str, Any]] = []
+        try:
+            for message in iter_messages_file(self.tmp_path):
+                rows.append(self._parquet_row(message))
+                if len(rows) >= self.row_group_size:
+                    writer.write_table(self._pa.Table.from_pylist(rows, schema=schema))
+                    rows = []
+            if rows:
+                writer.write_table(self._pa.Table.from_pylist(rows, schema=schema))
+        finally:
+            writer.close()
+        os.replace(build_path, self.path)
+        os.remove(self.tmp_path)
+        self._publish()
+        return self.path
+
+
+def open_channel_messages_writer(
+    *,
+    base_path: str,
+    date_str: str,
+    channel_name: str,
+    resume: bool = False,
+    fmt: str = "jsonl",
+) -> ChannelMessagesWriter:
+    """
+    Open a streaming writer for a (date, channel) partition of the raw data lake.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+        channel_name (str): Name of the Telegram channel.
+        resume (bool): Continue an interrupted or already published partition instead of replacing it.
+        fmt (str): Output format, one of `MESSAGE_FORMATS` ('jsonl' or 'parquet').
+
+    Returns:
+        ChannelMessagesWriter: Writer to append messages to; call `close()` to publish the file.
+    """
+    if fmt == "parquet":
+        return ParquetMessagesWriter(
+            channel_messages_parquet_path(base_path, date_str, channel_name),
+            resume=resume,
+            base_path=base_path,
+        )
+    if fmt != "jsonl":
+        raise ValueError(f"Unknown message format {fmt!r}; expected one of {MESSAGE_FORMATS}")
+    return ChannelMessagesWriter(
+        channel_messages_jsonl_path(base_path, date_str, channel_name),
+        resume=resume,
+        base_path=base_path,
+    )
+
+
 def manifest_path(base_path: str, date_str: str) -> str:
     """
     Get the path to the manifest file for a given date.
@@ -113,6 +694,10 @@ def write_manifest(
     """
     Write a simple audit/metadata manifest file for the day's Telegram messages.
 
+    Besides the per-channel counts, the manifest lists every partition file of
+    the day under `files` with its SHA-256, byte size and row count, so later
+    runs can tell which files changed (see `files_changed_since`).
+
     Args:
         base_path (str): Base path of the data lake.
         date_str (str): Date string in 'YYYY-MM-DD' format.
@@ -130,8 +715,190 @@ def write_manifest(
     }
     if extra:
         payload.update(extra)
+    payload["files"] = describe_partition_files(base_path, date_str)
 
     out_path = manifest_path(base_path, date_str)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    atomic_write_json(out_path, payload)
+    catalog_manifest(base_path, date_str, out_path)
     return out_path
+
+
+def partition_files(base_path: str, date_str: str) -> List[str]:
+    """
+    List the message partition files of a date (manifests and in-progress files excluded).
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+
+    Returns:
+        List[str]: Sorted full paths of the partition files.
+    """
+    partition_dir = telegram_messages_partition_dir(base_path, date_str)
+    if not os.path.isdir(partition_dir):
+        return []
+    return [
+        os.path.join(partition_dir, name)
+        for name in sorted(os.listdir(partition_dir))
+        if not name.startswith("_") and name.endswith(PARTITION_EXTENSIONS)
+    ]
+
+
+def describe_partition_files(
+    base_path: str,
+    date_str: str,
+    count_rows: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fingerprint every partition file of a date.
+
+    Row counts come from the catalog when its checksum still matches the file,
+    and are otherwise counted by streaming the file.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+        count_rows (bool): Include `rows`; skip it when only change detection is needed.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: File name -> {'sha256', 'bytes'[, 'rows']}.
+    """
+    catalogued = {
+        row["abs_path"]: row for row in list_partitions(base_path, partition_date_bounds(date_str))
+    }
+    files: Dict[str, Dict[str, Any]] = {}
+    for path in partition_files(base_path, date_str):
+        entry: Dict[str, Any] = {"sha256": file_sha256(path), "bytes": os.path.getsize(path)}
+        if count_rows:
+            row = catalogued.get(path)
+            if row is not None and row["checksum"] == entry["sha256"]:
+                entry["rows"] = row["row_count"]
+            else:
+                entry["rows"] = sum(1 for _ in iter_messages_file(path))
+        files[os.path.basename(path)] = entry
+    return files
+
+
+def read_manifest(base_path: str, date_str: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest of a date.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+
+    Returns:
+        Optional[Dict[str, Any]]: The manifest, or None if the date has none.
+    """
+    path = os.path.join(telegram_messages_partition_dir(base_path, date_str), "_manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def files_changed_since(
+    base_path: str,
+    date_str: str,
+    manifest: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """
+    List partition files of a date that are new or changed relative to an earlier manifest.
+
+    A loader keeps the manifest it last processed and passes it here to skip
+    every partition whose content hash is unchanged.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format.
+        manifest (Optional[Dict[str, Any]]): Previously processed manifest; None means everything changed.
+
+    Returns:
+        List[str]: Full paths of the new or changed partition files.
+    """
+    known = (manifest or {}).get("files", {})
+    partition_dir = telegram_messages_partition_dir(base_path, date_str)
+    return [
+        os.path.join(partition_dir, name)
+        for name, entry in describe_partition_files(base_path, date_str, count_rows=False).items()
+        if known.get(name, {}).get("sha256") != entry["sha256"]
+    ]
+
+
+def _partition_format(path: str) -> str:
+    """File format of a partition file, from its extension."""
+    return os.path.splitext(path)[1].lstrip(".")
+
+
+def catalog_messages_file(
+    base_path: str,
+    path: str,
+    *,
+    date_min: Optional[str] = None,
+    date_max: Optional[str] = None,
+    channel: Optional[str] = None,
+    row_count: Optional[int] = None,
+    message_ids: Optional[Iterable[Any]] = None,
+) -> None:
+    """
+    Record a message partition file in the lake catalog (see `src.catalog`).
+
+    Date and channel default to the `YYYY-MM-DD/<channel>.<ext>` layout (or
+    `YYYY-MM/<channel>.<ext>` for a compacted month). Row
+    count and message ID range are read from the file when not supplied.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        path (str): Path to the partition file.
+        date_min (Optional[str]): First date covered by the file.
+        date_max (Optional[str]): Last date covered by the file.
+        channel (Optional[str]): Channel name of the file.
+        row_count (Optional[int]): Number of messages in the file.
+        message_ids (Optional[Iterable[Any]]): Message IDs in the file.
+    """
+    if row_count is None or message_ids is None:
+        ids = [m.get("message_id") for m in iter_messages_file(path)]
+        row_count, message_ids = len(ids), ids
+    numeric_ids = [i for i in message_ids if isinstance(i, int)]
+    dir_min, dir_max = partition_date_bounds(os.path.basename(os.path.dirname(path)))
+
+    record_partition(
+        base_path=base_path,
+        path=path,
+        kind="messages",
+        fmt=_partition_format(path),
+        date_min=date_min or dir_min,
+        date_max=date_max or date_min or dir_max,
+        channel=channel or os.path.basename(path).split(".")[0],
+        row_count=row_count,
+        byte_size=os.path.getsize(path),
+        checksum=file_sha256(path),
+        min_message_id=min(numeric_ids) if numeric_ids else None,
+        max_message_id=max(numeric_ids) if numeric_ids else None,
+    )
+
+
+def catalog_manifest(base_path: str, date_str: str, path: str) -> None:
+    """
+    Record a day's (or compacted month's) manifest file in the lake catalog.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        date_str (str): Date string in 'YYYY-MM-DD' format, or 'YYYY-MM' for a compacted month.
+        path (str): Path to the manifest file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    date_min, date_max = partition_date_bounds(date_str)
+    record_partition(
+        base_path=base_path,
+        path=path,
+        kind="manifest",
+        fmt="json",
+        date_min=date_min,
+        date_max=date_max,
+        channel=None,
+        row_count=int(manifest.get("total_messages", 0)),
+        byte_size=os.path.getsize(path),
+        checksum=file_sha256(path),
+    )
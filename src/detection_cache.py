@@ -0,0 +1,255 @@
+import json
+import os
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+from src.datalake import ensure_dir, file_sha256, telegram_images_dir
+from src.image_hash import hamming_distance, hash_bands, join_bands
+
+CACHE_FILENAME = "_detections.sqlite"
+
+
+def detection_cache_path(base_path: str) -> str:
+    """
+    Get the path to the detection cache of a data lake.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        str: Full path to the SQLite cache file.
+    """
+    return os.path.join(telegram_images_dir(base_path), CACHE_FILENAME)
+
+
+class DetectionCache:
+    """
+    Persistent cache of YOLO results keyed by image content.
+
+    An entry is keyed by the image's SHA-256 plus the model identifier and the
+    inference settings (``imgsz``, ``conf``), so a rerun only sends new or
+    changed images to the model, and changing the model or thresholds
+    invalidates exactly the affected results. Entries from before per-object
+    boxes were recorded count as misses, so those images are detected again
+    once. Hashes of files outside the
+    content-addressed store are memoized by path, size and mtime so unchanged
+    files aren't re-read on every run.
+
+    The cache also indexes a perceptual hash (dHash) per image, split into four
+    16-bit band columns with one index each, so near-duplicates of an image
+    (re-encoded reposts) are found by exact band lookups
+    (:meth:`find_near_duplicate`) instead of a scan over every hash.
+    """
+
+    def __init__(self, base_path: str) -> None:
+        """
+        Args:
+            base_path (str): Base path of the data lake.
+        """
+        self.path = detection_cache_path(base_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(os.path.dirname(self.path))
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS detections (
+                    sha256 TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    imgsz INTEGER NOT NULL,
+                    conf REAL NOT NULL,
+                    labels TEXT NOT NULL,
+                    max_conf REAL NOT NULL,
+                    boxes TEXT,
+                    PRIMARY KEY (sha256, model, imgsz, conf)
+                );
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS perceptual_hashes (
+                    sha256 TEXT PRIMARY KEY,
+                    band0 INTEGER NOT NULL,
+                    band1 INTEGER NOT NULL,
+                    band2 INTEGER NOT NULL,
+                    band3 INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_perceptual_hashes_band0 ON perceptual_hashes (band0);
+                CREATE INDEX IF NOT EXISTS idx_perceptual_hashes_band1 ON perceptual_hashes (band1);
+                CREATE INDEX IF NOT EXISTS idx_perceptual_hashes_band2 ON perceptual_hashes (band2);
+                CREATE INDEX IF NOT EXISTS idx_perceptual_hashes_band3 ON perceptual_hashes (band3);
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(detections)")}
+            if "boxes" not in columns:
+                self._conn.execute("ALTER TABLE detections ADD COLUMN boxes TEXT")
+        return self._conn
+
+    def close(self) -> None:
+        """Commit pending entries and close the cache."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def image_hash(self, image_path: str) -> str:
+        """
+        Get the SHA-256 of an image, reusing the memoized hash of an unchanged file.
+
+        Args:
+            image_path (str): Path to the image file.
+
+        Returns:
+            str: Hex digest of the file contents.
+        """
+        stat = os.stat(image_path)
+        row = self.conn.execute(
+            "SELECT sha256 FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (image_path, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        sha256 = file_sha256(image_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+            (image_path, stat.st_size, stat.st_mtime_ns, sha256),
+        )
+        return sha256
+
+    def get(
+        self, sha256: str, model: str, imgsz: int, conf: float
+    ) -> Optional[Tuple[List[str], float, List[Tuple[Any, ...]]]]:
+        """
+        Look up a cached detection.
+
+        Args:
+            sha256 (str): Hex digest of the image.
+            model (str): Model identifier.
+            imgsz (int): Inference image size.
+            conf (float): Confidence threshold.
+
+        Returns:
+            Optional[Tuple[List[str], float, List[Tuple[Any, ...]]]]: Detected labels,
+            highest confidence and boxes, or None on a miss.
+        """
+        row = self.conn.execute(
+            "SELECT labels, max_conf, boxes FROM detections "
+            "WHERE sha256 = ? AND model = ? AND imgsz = ? AND conf = ? AND boxes IS NOT NULL",
+            (sha256, model, imgsz, conf),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], [tuple(box) for box in json.loads(row[2])]
+
+    def put(
+        self,
+        sha256: str,
+        model: str,
+        imgsz: int,
+        conf: float,
+        labels: List[str],
+        max_conf: float,
+        boxes: List[Tuple[Any, ...]],
+    ) -> None:
+        """
+        Store a detection result. Entries are committed in bulk by :meth:`commit`/:meth:`close`.
+
+        Args:
+            sha256 (str): Hex digest of the image.
+            model (str): Model identifier.
+            imgsz (int): Inference image size.
+            conf (float): Confidence threshold.
+            labels (List[str]): Detected labels.
+            max_conf (float): Highest detection confidence.
+            boxes (List[Tuple[Any, ...]]): Detected objects (class id, class name, confidence, normalized box).
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO detections (sha256, model, imgsz, conf, labels, max_conf, boxes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (sha256, model, imgsz, conf, json.dumps(labels), max_conf, json.dumps(boxes)),
+        )
+
+    def commit(self) -> None:
+        """Persist the entries stored so far."""
+        if self._conn is not None:
+            self._conn.commit()
+
+    def get_perceptual_hash(self, sha256: str) -> Optional[int]:
+        """
+        Get the stored perceptual hash of an image.
+
+        Args:
+            sha256 (str): Hex digest of the image.
+
+        Returns:
+            Optional[int]: The 64-bit dHash, or None if it wasn't computed yet.
+        """
+        row = self.conn.execute(
+            "SELECT band0, band1, band2, band3 FROM perceptual_hashes WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        return None if row is None else join_bands(row)
+
+    def put_perceptual_hash(self, sha256: str, value: int) -> None:
+        """
+        Store the perceptual hash of an image.
+
+        Args:
+            sha256 (str): Hex digest of the image.
+            value (int): The 64-bit dHash.
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO perceptual_hashes (sha256, band0, band1, band2, band3) VALUES (?, ?, ?, ?, ?)",
+            (sha256, *hash_bands(value)),
+        )
+
+    def find_near_duplicate(
+        self,
+        value: int,
+        model: str,
+        imgsz: int,
+        conf: float,
+        max_distance: int,
+        exclude: Optional[str] = None,
+    ) -> Optional[Tuple[str, int, Tuple[List[str], float, List[Tuple[Any, ...]]]]]:
+        """
+        Find the closest image with a cached detection whose perceptual hash is within `max_distance`.
+
+        Only images sharing a band with `value` are compared, which finds every
+        match up to a distance of 3 (see `src.image_hash.MAX_HASH_DISTANCE`).
+
+        Args:
+            value (int): The 64-bit dHash to look up.
+            model (str): Model identifier.
+            imgsz (int): Inference image size.
+            conf (float): Confidence threshold.
+            max_distance (int): Largest Hamming distance that counts as a near-duplicate.
+            exclude (Optional[str]): Hex digest of the image itself.
+
+        Returns:
+            Optional[Tuple[str, int, Tuple[List[str], float, List[Tuple[Any, ...]]]]]: Hex digest
+            of the closest image, its distance and its detection, or None.
+        """
+        bands = hash_bands(value)
+        rows = self.conn.execute(
+            """
+            SELECT p.sha256, p.band0, p.band1, p.band2, p.band3, d.labels, d.max_conf, d.boxes
+            FROM perceptual_hashes p
+            JOIN detections d ON d.sha256 = p.sha256
+            WHERE (p.band0 = ? OR p.band1 = ? OR p.band2 = ? OR p.band3 = ?)
+              AND d.model = ? AND d.imgsz = ? AND d.conf = ? AND d.boxes IS NOT NULL
+              AND p.sha256 != ?
+            """,
+            (*bands, model, imgsz, conf, exclude or ""),
+        ).fetchall()
+        best = None
+        for sha256, b0, b1, b2, b3, labels, max_conf, boxes in rows:
+            distance = hamming_distance(value, join_bands((b0, b1, b2, b3)))
+            if distance <= max_distance and (best is None or (distance, sha256) < best[:2]):
+                detection = (json.loads(labels), max_conf, [tuple(box) for box in json.loads(boxes)])
+                best = (distance, sha256, detection)
+        return None if best is None else (best[1], best[0], best[2])
@@ -0,0 +1,249 @@
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.pg_copy import copy_rows, db_config
+
+# Columns of raw.yolo_detections written by the detector; (channel, image_name, model) is the key.
+DETECTION_COLUMNS = ('message_id', 'channel', 'image_name', 'model', 'detected_objects', 'confidence_score',
+                     'image_category', 'image_sha256', 'duplicate_of')
+DETECTION_KEY = ('channel', 'image_name', 'model')
+
+# Columns of raw.yolo_detection_boxes written by the detector.
+BOX_COLUMNS = ('message_id', 'channel', 'image_name', 'model', 'class_id', 'class_name', 'confidence',
+               'bbox_x1', 'bbox_y1', 'bbox_x2', 'bbox_y2')
+
+# Columns of yolo_detection_boxes.csv: one row per detected object, box corners normalized to [0, 1].
+# The CSV doesn't record the model; rows loaded from it have a NULL model.
+BOX_CSV_COLUMNS = tuple(column for column in BOX_COLUMNS if column != 'model')
+
+_MESSAGE_ID = re.compile(r"\d+")
+
+
+def _import_psycopg2() -> Any:
+    try:
+        import psycopg2
+    except ImportError as e:
+        raise ImportError(
+            "Streaming detections to PostgreSQL requires psycopg2: pip install psycopg2-binary"
+        ) from e
+    return psycopg2
+
+
+def ensure_detection_tables(cursor: Any) -> None:
+    """
+    Ensure the 'raw' schema and the 'yolo_detections' and 'yolo_detection_boxes' tables exist.
+
+    Tables created before are migrated in place: missing columns are added,
+    and `raw.yolo_detections` gets a unique index on (channel, image_name,
+    model). Rows appended from the CSV have no model, and NULLs never
+    collide in a unique index, so existing duplicates don't block it.
+
+    `yolo_detection_boxes` holds one typed row per detected object, indexed by
+    class and confidence (e.g. "bottles with conf > 0.7") and by message.
+
+    Args:
+        cursor (Any): psycopg2 cursor.
+    """
+    cursor.execute("""
+    CREATE SCHEMA IF NOT EXISTS raw;
+
+    CREATE TABLE IF NOT EXISTS raw.yolo_detections (
+        message_id BIGINT,
+        channel TEXT,
+        image_name TEXT,
+        detected_objects TEXT,
+        confidence_score FLOAT,
+        image_category TEXT,
+        image_sha256 TEXT,
+        duplicate_of TEXT,
+        model TEXT,
+        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    ALTER TABLE raw.yolo_detections
+        ADD COLUMN IF NOT EXISTS image_sha256 TEXT,
+        ADD COLUMN IF NOT EXISTS duplicate_of TEXT,
+        ADD COLUMN IF NOT EXISTS model TEXT;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS yolo_detections_key_idx
+        ON raw.yolo_detections (channel, image_name, model);
+
+    CREATE TABLE IF NOT EXISTS raw.yolo_detection_boxes (
+        message_id BIGINT NOT NULL,
+        channel TEXT NOT NULL,
+        image_name TEXT NOT NULL,
+        class_id SMALLINT NOT NULL,
+        class_name TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        bbox_x1 REAL NOT NULL,
+        bbox_y1 REAL NOT NULL,
+        bbox_x2 REAL NOT NULL,
+        bbox_y2 REAL NOT NULL,
+        model TEXT,
+        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    ALTER TABLE raw.yolo_detection_boxes ADD COLUMN IF NOT EXISTS model TEXT;
+
+    CREATE INDEX IF NOT EXISTS yolo_detection_boxes_class_idx
+        ON raw.yolo_detection_boxes (class_name, confidence);
+    CREATE INDEX IF NOT EXISTS yolo_detection_boxes_message_idx
+        ON raw.yolo_detection_boxes (channel, message_id);
+    CREATE INDEX IF NOT EXISTS yolo_detection_boxes_key_idx
+        ON raw.yolo_detection_boxes (channel, image_name, model);
+    """)
+
+
+def clean_message_id(message_id: Any) -> Optional[int]:
+    """
+    Extract the numeric message ID from a file name part (e.g. ``"123_photo"`` -> 123).
+
+    Args:
+        message_id (Any): Message ID as captured from the image path.
+
+    Returns:
+        Optional[int]: The first run of digits, or None if there is none.
+    """
+    match = _MESSAGE_ID.search(str(message_id))
+    return None if match is None else int(match.group())
+
+
+def detection_copy_rows(rows: Iterable[Dict[str, Any]], model: Optional[str]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Turn detection rows into COPY rows in `DETECTION_COLUMNS` order.
+
+    Shared by the detector and the CSV loader (`scripts/load_yolo_postgres.py`):
+    the message ID is reduced to its digits (rows without one are skipped),
+    images without detections get ``'none'`` and a confidence of 0, and empty
+    or missing hashes (CSVs written before duplicate links were recorded)
+    become NULL.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Rows with the `yolo_detections.csv` columns.
+        model (Optional[str]): Model identifier; None for rows loaded from the CSV.
+
+    Yields:
+        Tuple[Any, ...]: One row per image usage.
+    """
+    for row in rows:
+        message_id = clean_message_id(row['message_id'])
+        if message_id is None:
+            continue
+        yield (message_id, row['channel'], row['image_name'], model, row['detected_objects'] or 'none',
+               row['confidence_score'] or 0.0, row['image_category'], row.get('image_sha256') or None,
+               row.get('duplicate_of') or None)
+
+
+def box_copy_rows(rows: Iterable[Dict[str, Any]], model: Optional[str]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Turn box rows into COPY rows in `BOX_COLUMNS` order, skipping rows without a numeric message ID.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Rows with the `yolo_detection_boxes.csv` columns.
+        model (Optional[str]): Model identifier; None for rows loaded from the CSV.
+
+    Yields:
+        Tuple[Any, ...]: One row per detected object.
+    """
+    for row in rows:
+        message_id = clean_message_id(row['message_id'])
+        if message_id is None:
+            continue
+        yield (message_id, row['channel'], row['image_name'], model) + tuple(
+            row[column] for column in BOX_COLUMNS[4:]
+        )
+
+
+MERGE_SQL = f"""
+INSERT INTO raw.yolo_detections AS t ({', '.join(DETECTION_COLUMNS)})
+SELECT DISTINCT ON ({', '.join(DETECTION_KEY)}) {', '.join(DETECTION_COLUMNS)}
+FROM _stg_yolo_detections
+ORDER BY {', '.join(DETECTION_KEY)}, ctid DESC
+ON CONFLICT ({', '.join(DETECTION_KEY)}) DO UPDATE
+    SET {', '.join(f'{column} = EXCLUDED.{column}' for column in DETECTION_COLUMNS if column not in DETECTION_KEY)},
+        loaded_at = CURRENT_TIMESTAMP
+    WHERE ({', '.join(f't.{column}' for column in DETECTION_COLUMNS)})
+        IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in DETECTION_COLUMNS)});
+
+DELETE FROM raw.yolo_detection_boxes b
+USING _stg_yolo_detections s
+WHERE b.channel = s.channel AND b.image_name = s.image_name AND b.model = s.model;
+
+INSERT INTO raw.yolo_detection_boxes ({', '.join(BOX_COLUMNS)})
+SELECT {', '.join(BOX_COLUMNS)} FROM _stg_yolo_detection_boxes;
+"""
+
+
+class DetectionSink:
+    """
+    Streams detection rows into PostgreSQL as the detector produces them.
+
+    Each batch is copied with ``COPY ... FROM STDIN`` into temporary staging
+    tables and merged in the same transaction (see `MERGE_SQL`): detections
+    are upserted on (channel, image_name, model), so a rerun updates rows
+    instead of appending them, and the boxes of every merged image are
+    replaced. A batch becomes visible when it is committed, so an interrupted
+    run leaves only whole batches behind and the next run simply redoes the
+    rest.
+    """
+
+    def __init__(self, model: str, config: Optional[Dict[str, Optional[str]]] = None) -> None:
+        """
+        Args:
+            model (str): Model identifier stored with every row (the model version of the key).
+            config (Optional[Dict[str, Optional[str]]]): `psycopg2.connect` arguments; defaults to `db_config()`.
+        """
+        self.model = model
+        self.config = config
+        self._conn: Optional[Any] = None
+
+    @property
+    def conn(self) -> Any:
+        if self._conn is None:
+            psycopg2 = _import_psycopg2()
+            self._conn = psycopg2.connect(**(self.config or db_config()))
+            with self._conn.cursor() as cursor:
+                ensure_detection_tables(cursor)
+                cursor.execute(f"""
+                CREATE TEMP TABLE _stg_yolo_detections AS
+                SELECT {', '.join(DETECTION_COLUMNS)} FROM raw.yolo_detections WITH NO DATA;
+                CREATE TEMP TABLE _stg_yolo_detection_boxes AS
+                SELECT {', '.join(BOX_COLUMNS)} FROM raw.yolo_detection_boxes WITH NO DATA;
+                """)
+            self._conn.commit()
+        return self._conn
+
+    def write(self, rows: List[Dict[str, Any]], box_rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Upsert the detections of a batch of images and replace their boxes.
+
+        Rows without a numeric message ID are skipped, as in the CSV loader.
+
+        Args:
+            rows (List[Dict[str, Any]]): Rows with the `yolo_detections.csv` columns.
+            box_rows (List[Dict[str, Any]]): Rows with the `yolo_detection_boxes.csv` columns.
+
+        Returns:
+            Tuple[int, int]: Number of detection and box rows copied.
+        """
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute("TRUNCATE _stg_yolo_detections, _stg_yolo_detection_boxes")
+                detections = copy_rows(cursor, "_stg_yolo_detections", DETECTION_COLUMNS,
+                                       detection_copy_rows(rows, self.model))
+                boxes = copy_rows(cursor, "_stg_yolo_detection_boxes", BOX_COLUMNS,
+                                  box_copy_rows(box_rows, self.model))
+                cursor.execute(MERGE_SQL)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        logging.debug(f"Streamed {detections} detections and {boxes} boxes to PostgreSQL")
+        return detections, boxes
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
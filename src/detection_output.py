@@ -0,0 +1,128 @@
+import csv
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+def checkpoint_path(output_csv: str) -> str:
+    """
+    Get the path to the resume checkpoint of a detections CSV.
+
+    Args:
+        output_csv (str): Path to the (first) detections CSV.
+
+    Returns:
+        str: Full path to the checkpoint file next to the CSV.
+    """
+    return f"{output_csv}.checkpoint"
+
+
+def _fsync(f: Any) -> None:
+    f.flush()
+    os.fsync(f.fileno())
+
+
+class DetectionWriter:
+    """
+    Appends detection rows to one or more CSVs in chunks, with a checkpoint to resume an interrupted run.
+
+    The checkpoint is a JSON-lines file next to the first CSV. Its first line
+    holds the run settings; each further line lists the image paths of one
+    written chunk and the size of every CSV after it. Each chunk is synced to
+    disk before its checkpoint line, and a resumed run truncates the CSVs to
+    the last recorded sizes, so a crash mid-chunk leaves neither duplicate nor
+    partial rows. The checkpoint is removed once the run finishes. A
+    checkpoint written with different settings (e.g. another model) or
+    outputs is discarded and the run starts over.
+    """
+
+    def __init__(self, outputs: Dict[str, List[str]], settings: Dict[str, Any], resume: bool = True) -> None:
+        """
+        Args:
+            outputs (Dict[str, List[str]]): Columns of each output CSV, by path.
+            settings (Dict[str, Any]): JSON-serializable settings a resumed run must match.
+            resume (bool): Continue from an existing checkpoint instead of starting over.
+        """
+        self.outputs = outputs
+        self.checkpoint = checkpoint_path(next(iter(outputs)))
+        self.settings = {**settings, "outputs": {os.path.basename(path): columns for path, columns in outputs.items()}}
+        self.done: Set[str] = set()
+
+        sizes = self._load_checkpoint() if resume else None
+        if sizes is None:
+            for path, columns in outputs.items():
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    csv.writer(f, lineterminator="\n").writerow(columns)
+                    _fsync(f)
+            with open(self.checkpoint, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"settings": self.settings, "sizes": self._sizes()}) + "\n")
+                _fsync(f)
+        else:
+            for path in outputs:
+                with open(path, "r+b") as f:
+                    f.truncate(sizes[os.path.basename(path)])
+            logging.info(f"Resuming from checkpoint: {len(self.done)} images already written")
+
+        self._files = {path: open(path, "a", encoding="utf-8", newline="") for path in outputs}
+        self._writers = {
+            path: csv.DictWriter(self._files[path], fieldnames=columns, lineterminator="\n")
+            for path, columns in outputs.items()
+        }
+        self._log = open(self.checkpoint, "a", encoding="utf-8")
+
+    def _sizes(self) -> Dict[str, int]:
+        return {os.path.basename(path): os.path.getsize(path) for path in self.outputs}
+
+    def _load_checkpoint(self) -> Optional[Dict[str, int]]:
+        """Read the processed paths of a matching checkpoint; return the CSV sizes to resume at, or None."""
+        if not os.path.isfile(self.checkpoint) or not all(os.path.isfile(path) for path in self.outputs):
+            return None
+        with open(self.checkpoint, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # torn last line of an interrupted write
+        if not entries or entries[0].get("settings") != self.settings:
+            logging.warning("Ignoring checkpoint written with different settings; starting over")
+            return None
+        for entry in entries[1:]:
+            self.done.update(entry["paths"])
+        if len(entries) < len(lines):
+            # Drop the torn line so later chunks aren't appended to it
+            with open(self.checkpoint, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+                _fsync(f)
+        return entries[-1]["sizes"]
+
+    def write(self, rows: Dict[str, Iterable[Dict[str, Any]]], paths: List[str]) -> None:
+        """
+        Append the rows of a chunk of images and checkpoint the images as processed.
+
+        Args:
+            rows (Dict[str, Iterable[Dict[str, Any]]]): Output rows of the chunk, by output path.
+            paths (List[str]): Image paths the chunk covers (including images without rows).
+        """
+        for path, output_rows in rows.items():
+            self._writers[path].writerows(output_rows)
+        for f in self._files.values():
+            _fsync(f)
+        self._log.write(json.dumps({"paths": paths, "sizes": self._sizes()}) + "\n")
+        _fsync(self._log)
+        self.done.update(paths)
+
+    def close(self, finished: bool = False) -> None:
+        """
+        Close the outputs.
+
+        Args:
+            finished (bool): The run completed, so the checkpoint is removed.
+        """
+        for f in self._files.values():
+            f.close()
+        self._log.close()
+        if finished and os.path.isfile(self.checkpoint):
+            os.remove(self.checkpoint)
@@ -0,0 +1,125 @@
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# A 64-bit hash is split into this many 16-bit bands. Two hashes within a
+# Hamming distance of HASH_BANDS - 1 share at least one band exactly, so an
+# exact lookup on the bands finds every near-duplicate up to that distance.
+HASH_BANDS = 4
+BAND_BITS = 16
+MAX_HASH_DISTANCE = HASH_BANDS - 1
+
+
+def dhash(image_path: str) -> Optional[int]:
+    """
+    Compute the 64-bit difference hash (dHash) of an image.
+
+    The image is decoded at reduced size in grayscale (JPEGs are decoded at
+    1/8 scale directly), shrunk to 9x8 pixels, and each bit records whether a
+    pixel is brighter than its left neighbour. Re-encodes, resizes and small
+    compression artifacts change only a few bits.
+
+    Args:
+        image_path (str): Path to the image file.
+
+    Returns:
+        Optional[int]: The hash, or None if the file is missing, empty or not a decodable image.
+    """
+    try:
+        data = np.fromfile(image_path, dtype=np.uint8)
+    except OSError:
+        return None
+    if data.size == 0:
+        return None
+    image = cv2.imdecode(data, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if image is None:
+        return None
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Count the bits that differ between two hashes.
+
+    Args:
+        a (int): First hash.
+        b (int): Second hash.
+
+    Returns:
+        int: Hamming distance.
+    """
+    return (a ^ b).bit_count()
+
+
+def hash_bands(value: int) -> Tuple[int, ...]:
+    """
+    Split a 64-bit hash into its `HASH_BANDS` bands, most significant first.
+
+    Args:
+        value (int): The hash.
+
+    Returns:
+        Tuple[int, ...]: The 16-bit bands.
+    """
+    mask = (1 << BAND_BITS) - 1
+    return tuple((value >> (BAND_BITS * (HASH_BANDS - 1 - i))) & mask for i in range(HASH_BANDS))
+
+
+def join_bands(bands: Tuple[int, ...]) -> int:
+    """
+    Reassemble a hash from its bands.
+
+    Args:
+        bands (Tuple[int, ...]): The bands, most significant first.
+
+    Returns:
+        int: The 64-bit hash.
+    """
+    value = 0
+    for band in bands:
+        value = (value << BAND_BITS) | band
+    return value
+
+
+class BandIndex:
+    """
+    In-memory near-duplicate index over 64-bit hashes, bucketed by band.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: List[Dict[int, List[Tuple[int, str, int]]]] = [{} for _ in range(HASH_BANDS)]
+        self._count = 0
+
+    def add(self, key: str, value: int) -> None:
+        """
+        Index a hash.
+
+        Args:
+            key (str): Identifier returned by lookups.
+            value (int): The hash.
+        """
+        for bucket, band in zip(self._buckets, hash_bands(value)):
+            bucket.setdefault(band, []).append((self._count, key, value))
+        self._count += 1
+
+    def find(self, value: int, max_distance: int = MAX_HASH_DISTANCE) -> Optional[Tuple[str, int]]:
+        """
+        Find the closest indexed hash within `max_distance` (at most `MAX_HASH_DISTANCE`).
+
+        Args:
+            value (int): The hash to look up.
+            max_distance (int): Largest Hamming distance that counts as a near-duplicate.
+
+        Returns:
+            Optional[Tuple[str, int]]: Key of the closest match and its distance (earliest added wins ties), or None.
+        """
+        best: Optional[Tuple[int, int, str]] = None
+        for bucket, band in zip(self._buckets, hash_bands(value)):
+            for order, key, other in bucket.get(band, ()):
+                distance = hamming_distance(value, other)
+                if distance <= max_distance and (best is None or (distance, order) < best[:2]):
+                    best = (distance, order, key)
+        return None if best is None else (best[2], best[0])
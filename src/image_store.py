@@ -0,0 +1,192 @@
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.datalake import ensure_dir, file_sha256, telegram_images_dir
+
+# Directory names under data/raw/images/ that hold the store rather than a channel.
+BLOBS_DIRNAME = "_blobs"
+STAGING_DIRNAME = "_staging"
+INDEX_FILENAME = "_index.sqlite"
+
+
+def image_index_path(base_path: str) -> str:
+    """
+    Get the path to the image store index for a data lake.
+
+    Args:
+        base_path (str): Base path of the data lake.
+
+    Returns:
+        str: Full path to the SQLite index file.
+    """
+    return os.path.join(telegram_images_dir(base_path), INDEX_FILENAME)
+
+
+class ImageStore:
+    """
+    Content-addressed store for Telegram photos.
+
+    Each unique image is kept once as ``images/_blobs/<aa>/<sha256>.jpg``. A
+    SQLite index maps ``(channel, message_id)`` to the blob hash, and also
+    remembers Telegram's ``photo_id`` so forwarded copies of a photo that was
+    already stored can be linked without downloading it again.
+    """
+
+    def __init__(self, base_path: str) -> None:
+        """
+        Args:
+            base_path (str): Base path of the data lake.
+        """
+        self.root = telegram_images_dir(base_path)
+        self.index_path = image_index_path(base_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.root)
+            self._conn = sqlite3.connect(self.index_path)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS image_index (
+                    channel TEXT NOT NULL,
+                    message_id INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    photo_id INTEGER,
+                    PRIMARY KEY (channel, message_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_image_index_sha256 ON image_index (sha256);
+                CREATE INDEX IF NOT EXISTS idx_image_index_photo_id ON image_index (photo_id);
+                """
+            )
+        return self._conn
+
+    def close(self) -> None:
+        """Close the index connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def blob_path(self, sha256: str) -> str:
+        """
+        Get the path of the blob for a content hash.
+
+        Args:
+            sha256 (str): Hex digest of the image.
+
+        Returns:
+            str: Full path to the blob file.
+        """
+        return os.path.join(self.root, BLOBS_DIRNAME, sha256[:2], f"{sha256}.jpg")
+
+    def staging_path(self, channel: str, message_id: int) -> str:
+        """
+        Get a temporary download path for an image that is not stored yet.
+
+        A leftover file from an interrupted run is discarded.
+
+        Args:
+            channel (str): Channel name.
+            message_id (int): Telegram message ID.
+
+        Returns:
+            str: Full path inside the staging directory.
+        """
+        staging_dir = os.path.join(self.root, STAGING_DIRNAME)
+        ensure_dir(staging_dir)
+        path = os.path.join(staging_dir, f"{channel}_{message_id}.jpg")
+        if os.path.exists(path):
+            os.remove(path)
+        return path
+
+    def lookup(self, channel: str, message_id: int, photo_id: Optional[int] = None) -> Optional[str]:
+        """
+        Find the stored blob for a message, linking it if only the photo is known.
+
+        Args:
+            channel (str): Channel name.
+            message_id (int): Telegram message ID.
+            photo_id (Optional[int]): Telegram photo ID, shared by forwarded copies.
+
+        Returns:
+            Optional[str]: Blob path if the image is already stored, else None.
+        """
+        row = self.conn.execute(
+            "SELECT sha256 FROM image_index WHERE channel = ? AND message_id = ?",
+            (channel, message_id),
+        ).fetchone()
+        if row is None and photo_id is not None:
+            row = self.conn.execute(
+                "SELECT sha256 FROM image_index WHERE photo_id = ? LIMIT 1",
+                (photo_id,),
+            ).fetchone()
+            if row is not None:
+                self._link(channel, message_id, row[0], photo_id)
+
+        if row is None or not os.path.isfile(self.blob_path(row[0])):
+            return None
+        return self.blob_path(row[0])
+
+    def add_file(
+        self,
+        path: str,
+        channel: str,
+        message_id: int,
+        photo_id: Optional[int] = None,
+    ) -> str:
+        """
+        Move a downloaded file into the store and index it.
+
+        If a blob with the same content already exists the file is simply
+        deleted, so reposts cost one index row instead of another copy.
+
+        Args:
+            path (str): Path of the downloaded file (consumed).
+            channel (str): Channel name.
+            message_id (int): Telegram message ID.
+            photo_id (Optional[int]): Telegram photo ID.
+
+        Returns:
+            str: Path of the blob now holding the image.
+        """
+        sha256 = file_sha256(path)
+        blob = self.blob_path(sha256)
+        if os.path.isfile(blob):
+            os.remove(path)
+        else:
+            ensure_dir(os.path.dirname(blob))
+            os.replace(path, blob)
+        self._link(channel, message_id, sha256, photo_id)
+        return blob
+
+    def _link(self, channel: str, message_id: int, sha256: str, photo_id: Optional[int]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO image_index (channel, message_id, sha256, photo_id) VALUES (?, ?, ?, ?)",
+            (channel, message_id, sha256, photo_id),
+        )
+        self.conn.commit()
+
+    def iter_entries(self) -> Iterator[Tuple[str, int, str]]:
+        """
+        Iterate over every indexed image.
+
+        Yields:
+            Tuple[str, int, str]: ``(channel, message_id, blob_path)`` ordered by channel and message ID.
+        """
+        for channel, message_id, sha256 in self.conn.execute(
+            "SELECT channel, message_id, sha256 FROM image_index ORDER BY channel, message_id"
+        ):
+            yield channel, message_id, self.blob_path(sha256)
+
+    def unique_images(self) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Group indexed messages by the blob they point to.
+
+        Returns:
+            Dict[str, List[Tuple[str, int]]]: Blob path -> list of ``(channel, message_id)`` using it.
+        """
+        groups: Dict[str, List[Tuple[str, int]]] = {}
+        for channel, message_id, blob in self.iter_entries():
+            groups.setdefault(blob, []).append((channel, message_id))
+        return groups
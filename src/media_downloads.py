@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from telethon.errors import FloodWaitError
+
+from src.rate_limiter import AdaptiveTokenBucket
+
+logger = logging.getLogger("telegram_scraper")
+
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_DOWNLOAD_RETRIES = 2
+DEFAULT_DOWNLOAD_TIMEOUT = 60.0
+DEFAULT_DOWNLOAD_QUEUE_SIZE = 100
+
+
+class MediaDownloadPool:
+    """
+    Bounded pool of asyncio workers that download media off the message loop.
+
+    Message iteration calls :meth:`submit` and moves on; workers pull jobs from
+    a bounded ``asyncio.Queue`` (so a slow download applies back-pressure
+    instead of growing memory), retry failures with a per-file timeout, and
+    keep ``downloaded``/``failed``/``skipped`` counters in :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[Any, str], Awaitable[Any]],
+        workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        max_retries: int = DEFAULT_DOWNLOAD_RETRIES,
+        timeout: float = DEFAULT_DOWNLOAD_TIMEOUT,
+        queue_size: int = DEFAULT_DOWNLOAD_QUEUE_SIZE,
+        rate_limiter: Optional[AdaptiveTokenBucket] = None,
+        finalize: Optional[Callable[[str, Dict[str, Any], Any], None]] = None,
+    ) -> None:
+        """
+        Args:
+            download (Callable): Coroutine function ``download(media, path)``, e.g. ``client.download_media``.
+            workers (int): Number of concurrent download workers.
+            max_retries (int): Extra attempts after a failed or timed-out download.
+            timeout (float): Per-attempt timeout in seconds.
+            queue_size (int): Maximum number of pending jobs before :meth:`submit` blocks.
+            rate_limiter (Optional[AdaptiveTokenBucket]): Shared limiter consulted before each attempt.
+            finalize (Optional[Callable]): Called as ``finalize(path, record, context)`` after a
+                successful download, e.g. to move the file into the image store.
+        """
+        self.download = download
+        self.workers = max(workers, 1)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.finalize = finalize
+        self.stats: Dict[str, int] = {"downloaded": 0, "failed": 0, "skipped": 0}
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+
+    async def __aenter__(self) -> "MediaDownloadPool":
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, media: Any, path: str, record: Dict[str, Any], context: Any = None) -> None:
+        """
+        Queue a download. ``record["image_path"]`` is reset to None if it ultimately fails.
+
+        Files that already exist with a non-zero size are counted as skipped
+        without touching the network.
+
+        Args:
+            media (Any): Telethon media object to download.
+            path (str): Destination file path.
+            record (Dict[str, Any]): Message dict referencing ``path``.
+            context (Any): Extra value passed through to ``finalize``.
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.stats["skipped"] += 1
+            return
+        await self._queue.put((media, path, record, context))
+
+    async def join(self) -> None:
+        """Wait until every submitted download has finished (successfully or not)."""
+        await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            media, path, record, context = await self._queue.get()
+            try:
+                ok = await self._download_with_retries(media, path)
+                if ok and self.finalize:
+                    try:
+                        self.finalize(path, record, context)
+                    except Exception as e:
+                        logger.warning(f"Failed to finalize {os.path.basename(path)}: {e}")
+                        ok = False
+                if ok:
+                    self.stats["downloaded"] += 1
+                else:
+                    self.stats["failed"] += 1
+                    record["image_path"] = None
+            finally:
+                self._queue.task_done()
+
+    async def _download_with_retries(self, media: Any, path: str) -> bool:
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            try:
+                await asyncio.wait_for(self.download(media, path), timeout=self.timeout)
+                if self.rate_limiter:
+                    self.rate_limiter.on_success()
+                return True
+            except Exception as e:
+                if isinstance(e, FloodWaitError):
+                    wait_seconds = max(int(getattr(e, "seconds", 0) or 0), 1)
+                    if self.rate_limiter:
+                        self.rate_limiter.on_flood_wait(wait_seconds)
+                    else:
+                        await asyncio.sleep(wait_seconds)
+                reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logger.warning(
+                    f"Download of {os.path.basename(path)} failed "
+                    f"(attempt {attempt + 1}/{self.max_retries + 1}): {reason}"
+                )
+                # Don't leave a truncated file behind; it would be skipped next run.
+                if os.path.exists(path):
+                    os.remove(path)
+        return False
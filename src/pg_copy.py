@@ -0,0 +1,118 @@
+import io
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from dotenv import load_dotenv
+
+# COPY text format: columns separated by tabs, rows by newlines, NULL as \N.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def db_config() -> Dict[str, Optional[str]]:
+    """
+    Get the PostgreSQL connection settings from environment variables (or a `.env` file).
+
+    Returns:
+        Dict[str, Optional[str]]: Keyword arguments for `psycopg2.connect`.
+    """
+    load_dotenv()
+    return {
+        "dbname": os.getenv("DATABASE_NAME"),
+        "user": os.getenv("DATABASE_USER"),
+        "password": os.getenv("DATABASE_PASSWORD"),
+        "host": os.getenv("DATABASE_HOST"),
+        "port": os.getenv("DATABASE_PORT"),
+    }
+
+
+def format_copy_value(value: Any) -> str:
+    """
+    Render one value in PostgreSQL's COPY text format.
+
+    Args:
+        value (Any): Python value (None, bool, number, str, datetime, ...).
+
+    Returns:
+        str: Escaped field text; None becomes ``\\N``.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class IteratorFile(io.TextIOBase):
+    """
+    Read-only file object over an iterator of text lines.
+
+    Lets ``cursor.copy_expert`` pull COPY data as it is generated, so rows are
+    streamed to PostgreSQL without building the whole payload in memory or in
+    a temporary file.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        """
+        Args:
+            lines (Iterable[str]): Lines to serve, each ending with a newline.
+        """
+        self._lines: Iterator[str] = iter(lines)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            chunks = [self._buffer] + list(self._lines)
+            self._buffer = ""
+            return "".join(chunks)
+
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = "".join(chunks)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            return line
+        return next(self._lines, "")
+
+
+def copy_rows(cursor: Any, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Stream rows into a table with ``COPY ... FROM STDIN``.
+
+    Args:
+        cursor (Any): psycopg2 cursor.
+        table (str): Target table, optionally schema-qualified.
+        columns (Sequence[str]): Column names matching the order of each row.
+        rows (Iterable[Sequence[Any]]): Rows to copy; consumed lazily.
+
+    Returns:
+        int: Number of rows copied.
+    """
+    count = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield "\t".join(format_copy_value(value) for value in row) + "\n"
+
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)",
+        IteratorFile(lines()),
+    )
+    return count
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket shared by every coroutine talking to the Telegram API.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``. The
+    rate adapts AIMD-style: every successful call nudges it up additively,
+    while a ``FloodWaitError`` halves it (multiplicatively) and pauses all
+    callers until Telegram's requested wait has elapsed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        capacity: float = 5.0,
+        min_rate: float = 0.05,
+        max_rate: float = 10.0,
+        increase_step: float = 0.05,
+        backoff_factor: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            rate (float): Initial refill rate in tokens (requests) per second.
+            capacity (float): Maximum burst size.
+            min_rate (float): Lower bound the rate can be backed off to.
+            max_rate (float): Upper bound the rate can grow to.
+            increase_step (float): Amount added to the rate after each success.
+            backoff_factor (float): Multiplier applied to the rate on a flood wait.
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.backoff_factor = backoff_factor
+
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated_at, 0.0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Wait until ``tokens`` are available (and no flood wait is active), then consume them.
+
+        Args:
+            tokens (float): Number of tokens to consume (default 1).
+        """
+        # Created lazily so the bucket can be built outside a running event loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def on_success(self) -> None:
+        """Additively increase the rate after a call that was not throttled."""
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_flood_wait(self, seconds: float) -> None:
+        """
+        Back off after Telegram returned a ``FloodWaitError``.
+
+        Halves the rate, drains the bucket and blocks every caller of
+        :meth:`acquire` for ``seconds``.
+
+        Args:
+            seconds (float): Wait requested by Telegram.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + max(seconds, 0.0))
+        # Don't let tokens accumulate while blocked, or callers would burst right after.
+        self._updated_at = self._blocked_until
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Allow running this file directly: `python src/yolo_benchmark.py`
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.datalake import telegram_images_dir
+from src.yolo_detect import (
+    BACKENDS,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONF,
+    DEFAULT_IMGSZ,
+    MODEL_WEIGHTS,
+    Detector,
+    classify_image,
+    collect_image_jobs,
+    decode_image,
+    detect_batch,
+)
+
+
+def load_sample_images(base_path: str, limit: int) -> List[Any]:
+    """
+    Decode up to `limit` readable images from the data lake.
+
+    Args:
+        base_path (str): Base path of the data lake.
+        limit (int): Maximum number of images.
+
+    Returns:
+        List[numpy.ndarray]: Decoded images.
+    """
+    images = []
+    for image_path, _ in collect_image_jobs(telegram_images_dir(base_path), base_path):
+        image = decode_image(image_path)
+        if image is not None:
+            images.append(image)
+            if len(images) >= limit:
+                break
+    return images
+
+
+def compare_backends(
+    images: List[Any],
+    backends: Sequence[str] = BACKENDS,
+    weights: str = MODEL_WEIGHTS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    imgsz: int = DEFAULT_IMGSZ,
+    conf: float = DEFAULT_CONF,
+    device: Optional[str] = None,
+    threads: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Measure throughput of each backend and its agreement with the first one.
+
+    Each backend is warmed up on one image first, so exporting, loading and
+    predictor setup are not counted.
+
+    Args:
+        images (List[Any]): Decoded images to run detection on.
+        backends (Sequence[str]): Backends to compare; the first is the accuracy reference.
+        weights (str): PyTorch weights file name or path.
+        batch_size (int): Number of images per model call.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        device (Optional[str]): Inference device.
+        threads (Optional[int]): Number of CPU threads for every backend.
+
+    Returns:
+        List[Dict[str, Any]]: Per backend: images/sec, and the share of images whose
+        labels and category match the reference plus the mean absolute
+        difference of their confidence scores.
+    """
+    rows: List[Dict[str, Any]] = []
+    reference: Optional[List[Any]] = None
+    for backend in backends:
+        detector = Detector(weights, device=device, threads=threads, backend=backend)
+        detect_batch(images[:1], imgsz=imgsz, conf=conf, detector=detector)
+
+        detections = []
+        started = time.perf_counter()
+        for i in range(0, len(images), batch_size):
+            detections.extend(detect_batch(images[i:i + batch_size], imgsz=imgsz, conf=conf, detector=detector))
+        elapsed = time.perf_counter() - started
+
+        if reference is None:
+            reference = detections
+        pairs = list(zip(reference, detections))
+        n = max(len(pairs), 1)
+        rows.append({
+            'backend': backend,
+            'images': len(detections),
+            'images_per_sec': len(detections) / elapsed if elapsed > 0 else float('inf'),
+            'label_agreement': sum(set(a[0]) == set(b[0]) for a, b in pairs) / n,
+            'category_agreement': sum(classify_image(set(a[0])) == classify_image(set(b[0])) for a, b in pairs) / n,
+            'mean_conf_delta': sum(abs(a[1] - b[1]) for a, b in pairs) / n,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare accuracy and throughput of YOLO inference backends")
+    parser.add_argument("--path", default="data", help="Base data directory (default: data)")
+    parser.add_argument("--limit", type=int, default=100, help="Number of sample images (default: 100)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS),
+                        help="Backends to compare; the first is the accuracy reference (default: all)")
+    parser.add_argument("--weights", default=MODEL_WEIGHTS, help=f"YOLO weights file (default: {MODEL_WEIGHTS})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Images per model call (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--imgsz", type=int, default=DEFAULT_IMGSZ,
+                        help=f"Inference image size (default: {DEFAULT_IMGSZ})")
+    parser.add_argument("--conf", type=float, default=DEFAULT_CONF,
+                        help=f"Minimum detection confidence (default: {DEFAULT_CONF})")
+    parser.add_argument("--device", default=None, help="Inference device (default: chosen by ultralytics)")
+    parser.add_argument("--threads", type=int, default=None, help="CPU inference threads, for every backend (default: the runtime's own setting)")
+    args = parser.parse_args()
+
+    sample = load_sample_images(args.path, args.limit)
+    if not sample:
+        sys.exit(f"No readable images found under {telegram_images_dir(args.path)}")
+
+    print(f"{'backend':<10} {'images':>6} {'img/s':>8} {'labels':>7} {'category':>8} {'conf Δ':>7}")
+    for row in compare_backends(sample, backends=args.backends, weights=args.weights,
+                                batch_size=args.batch_size, imgsz=args.imgsz, conf=args.conf,
+                                device=args.device, threads=args.threads):
+        print(f"{row['backend']:<10} {row['images']:>6} {row['images_per_sec']:>8.1f} "
+              f"{row['label_agreement']:>7.1%} {row['category_agreement']:>8.1%} {row['mean_conf_delta']:>7.3f}")
@@ -1,8 +1,29 @@
 import os
+import sys
+import time
+import zlib
 import logging
-from typing import List, Set, Dict
-import pandas as pd
-from ultralytics import YOLO
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from functools import lru_cache
+from typing import Any, Deque, Iterator, List, Optional, Set, Dict, Tuple
+import cv2
+import numpy as np
+
+# Allow running this file directly: `python src/yolo_detect.py`
+# by adding the project root to PYTHONPATH so `import src.*` works.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.datalake import file_sha256
+from src.detection_cache import DetectionCache
+from src.detection_db import BOX_CSV_COLUMNS, DetectionSink
+from src.detection_output import DetectionWriter
+from src.image_hash import MAX_HASH_DISTANCE, BandIndex, dhash
+from src.image_store import BLOBS_DIRNAME, ImageStore, image_index_path
 
 # Configure logging
 logging.basicConfig(
@@ -11,7 +32,32 @@ logging.basicConfig(
 )
 
 # The nano model was selected for efficient local processing
-model = YOLO('yolov8n.pt')
+MODEL_WEIGHTS = 'yolov8n.pt'
+
+# Inference backends: PyTorch, or an ONNX export run by ONNX Runtime (optionally INT8-quantized).
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+DEFAULT_BACKEND = 'torch'
+
+# Inference settings; the defaults match a plain `model(image_path)` call.
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_IMGSZ = 640
+DEFAULT_CONF = 0.25
+DEFAULT_DECODE_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 256
+
+# Columns of yolo_detections.csv (written even when there are no rows). `duplicate_of` is the
+# image_sha256 of the near-duplicate whose detection was reused, empty for detected images.
+RESULT_COLUMNS = ['message_id', 'channel', 'image_name', 'detected_objects', 'confidence_score', 'image_category',
+                  'image_sha256', 'duplicate_of']
+
+# An image to run detection on, with every (message_id, channel, image_name) it belongs to.
+ImageJob = Tuple[str, List[Tuple[str, str, str]]]
+
+# One detected object: class id, class name, confidence and the normalized (x1, y1, x2, y2) box.
+Box = Tuple[int, str, float, float, float, float, float]
+
+# Detection result of one image: its labels, the highest confidence and the individual boxes.
+Detection = Tuple[List[str], float, List[Box]]
 
 
 def classify_image(detected_objects: Set[str]) -> str:
@@ -44,68 +90,917 @@ def classify_image(detected_objects: Set[str]) -> str:
         return 'other'
 
 
-def run_yolo_pipeline() -> None:
+def load_yolo_model(weights: str, **kwargs: Any) -> Any:
+    """
+    Construct an ultralytics YOLO model, importing ultralytics (and torch) only when called.
+
+    Args:
+        weights (str): Weights file name or path.
+        **kwargs: Passed on to `ultralytics.YOLO` (e.g. `task`).
+
+    Returns:
+        ultralytics.YOLO: The loaded model.
+    """
+    from ultralytics import YOLO as UltralyticsYOLO
+
+    return UltralyticsYOLO(weights, **kwargs)
+
+
+def _import_onnx() -> Any:
+    """Import onnx and onnxruntime lazily so the PyTorch backend doesn't need them installed."""
+    try:
+        import onnx
+        import onnxruntime  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "The ONNX backends require onnx and onnxruntime. Install them with `pip install onnx onnxruntime`."
+        ) from e
+    return onnx
+
+
+def _is_fresh(path: str, source: str) -> bool:
+    """Whether `path` exists and is at least as new as `source` (if `source` exists)."""
+    if not os.path.isfile(path):
+        return False
+    return not os.path.isfile(source) or os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def export_onnx(weights: str = MODEL_WEIGHTS, int8: bool = False) -> str:
+    """
+    Export PyTorch weights to ONNX once and reuse the export on later runs.
+
+    The export has dynamic batch and image size axes, so any `batch_size`
+    and `imgsz` can be used with it. It is written next to the weights
+    (`yolov8n.onnx`), and the INT8 variant is produced from it with ONNX
+    Runtime's dynamic quantization (`yolov8n.int8.onnx`). Both are
+    regenerated when the weights file is newer.
+
+    Args:
+        weights (str): PyTorch weights file name or path.
+        int8 (bool): Return the dynamically quantized INT8 model.
+
+    Returns:
+        str: Path to the ONNX model.
+    """
+    onnx = _import_onnx()
+    stem = os.path.splitext(weights)[0]
+    fp32_path = f"{stem}.onnx"
+    if not _is_fresh(fp32_path, weights):
+        logging.info(f"Exporting {weights} to ONNX")
+        fp32_path = str(load_yolo_model(weights).export(format='onnx', dynamic=True))
+    if not int8:
+        return fp32_path
+
+    int8_path = f"{stem}.int8.onnx"
+    if not _is_fresh(int8_path, fp32_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logging.info(f"Quantizing {fp32_path} to INT8")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QUInt8)
+        # ultralytics reads class names, stride and task from the model metadata
+        fp32_model, int8_model = onnx.load(fp32_path), onnx.load(int8_path)
+        if not int8_model.metadata_props:
+            for prop in fp32_model.metadata_props:
+                int8_model.metadata_props.add(key=prop.key, value=prop.value)
+            onnx.save(int8_model, int8_path)
+    return int8_path
+
+
+def limit_cpu_threads(threads: int) -> None:
+    """
+    Cap the CPU threads of the inference runtimes loaded after this call.
+
+    Sets `OMP_NUM_THREADS`, which torch and OpenMP builds of ONNX Runtime read
+    when they initialize; ultralytics creates the ONNX Runtime session itself,
+    so there is no `SessionOptions` to pass the limit through. Also used as the
+    initializer of the detection worker processes, before anything is imported.
+
+    Args:
+        threads (int): Number of CPU threads.
+    """
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+
+
+class Detector:
+    """
+    YOLO model that is loaded on first use rather than at import.
+
+    Importing this module (e.g. for `classify_image`) therefore doesn't pull in
+    torch or load, let alone download, the weights. With the `onnx` and
+    `onnx-int8` backends the weights are exported (see `export_onnx`) and run
+    by ONNX Runtime through the same ultralytics pre- and post-processing, so
+    results have the same shape as with PyTorch.
+    """
+
+    def __init__(self, weights: str = MODEL_WEIGHTS, device: Optional[str] = None,
+                 threads: Optional[int] = None, backend: str = DEFAULT_BACKEND) -> None:
+        """
+        Args:
+            weights (str): PyTorch weights file name or path.
+            device (Optional[str]): Inference device (e.g. 'cpu', '0'); None lets ultralytics choose.
+            threads (Optional[int]): Number of CPU threads for every backend (see
+                `limit_cpu_threads`); None keeps the runtimes' defaults.
+            backend (str): One of `BACKENDS`.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+        self.weights = weights
+        self.device = device
+        self.threads = threads
+        self.backend = backend
+        self._model: Optional[Any] = None
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            if self.threads:
+                limit_cpu_threads(self.threads)
+            if self.backend == 'torch':
+                logging.info(f"Loading YOLO model {self.weights}")
+                self._model = load_yolo_model(self.weights)
+            else:
+                path = export_onnx(self.weights, int8=self.backend == 'onnx-int8')
+                logging.info(f"Loading ONNX model {path}")
+                self._model = load_yolo_model(path, task='detect')
+        return self._model
+
+    def predict(self, images: List[Any], imgsz: int = DEFAULT_IMGSZ, conf: float = DEFAULT_CONF) -> List[Any]:
+        """
+        Run the model on a batch of images.
+
+        Args:
+            images (List[Any]): Image paths or decoded arrays.
+            imgsz (int): Inference image size.
+            conf (float): Minimum confidence of a detection.
+
+        Returns:
+            List[ultralytics.engine.results.Results]: One result per image.
+        """
+        model = self.model
+        if self.threads:
+            # Applied per call: ultralytics resets the torch thread count when it sets up its predictor
+            import torch
+
+            torch.set_num_threads(self.threads)
+        device = {} if self.device is None else {'device': self.device}
+        return model(images, imgsz=imgsz, conf=conf, batch=len(images), verbose=False, **device)
+
+
+@lru_cache(maxsize=None)
+def get_detector(weights: str = MODEL_WEIGHTS, device: Optional[str] = None,
+                 threads: Optional[int] = None, backend: str = DEFAULT_BACKEND) -> Detector:
+    """
+    Get the shared detector for a configuration, so the model is loaded once per process.
+
+    Args:
+        weights (str): Weights file name or path.
+        device (Optional[str]): Inference device.
+        threads (Optional[int]): Number of CPU threads for every backend.
+        backend (str): One of `BACKENDS`.
+
+    Returns:
+        Detector: The cached detector.
+    """
+    return Detector(weights, device=device, threads=threads, backend=backend)
+
+
+def detect_objects(
+    image_path: str,
+    imgsz: int = DEFAULT_IMGSZ,
+    conf: float = DEFAULT_CONF,
+    detector: Optional[Detector] = None,
+) -> Detection:
+    """
+    Run YOLO on a single image.
+
+    Args:
+        image_path (str): Path to the image file.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        detector (Optional[Detector]): Detector to use; defaults to `get_detector()`.
+
+    Returns:
+        Detection: Detected labels, the highest confidence among them and the boxes.
+    """
+    return detect_batch([image_path], imgsz=imgsz, conf=conf, detector=detector)[0]
+
+
+def detect_batch(
+    images: List[Any],
+    imgsz: int = DEFAULT_IMGSZ,
+    conf: float = DEFAULT_CONF,
+    detector: Optional[Detector] = None,
+) -> List[Detection]:
+    """
+    Run YOLO on several images in one call, amortizing per-call overhead.
+
+    Args:
+        images (List[Any]): Image paths (or decoded arrays) to process together.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        detector (Optional[Detector]): Detector to use; defaults to `get_detector()`.
+
+    Returns:
+        List[Detection]: Detected labels, highest confidence and boxes, per image.
+    """
+    # Perform inference
+    results = (detector or get_detector()).predict(images, imgsz=imgsz, conf=conf)
+    return [summarize_result(result) for result in results]
+
+
+def detect_batch_isolated(
+    images: List[Any],
+    imgsz: int = DEFAULT_IMGSZ,
+    conf: float = DEFAULT_CONF,
+    detector: Optional[Detector] = None,
+) -> List[Optional[Detection]]:
+    """
+    Run `detect_batch`, falling back to one image at a time if the batch fails.
+
+    Args:
+        images (List[Any]): Image paths or decoded arrays.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        detector (Optional[Detector]): Detector to use; defaults to `get_detector()`.
+
+    Returns:
+        List[Optional[Detection]]: Detections per image; None for an image that failed.
+    """
+    try:
+        return list(detect_batch(images, imgsz=imgsz, conf=conf, detector=detector))
+    except Exception as e:
+        if len(images) == 1:
+            logging.warning(f"Detection failed: {e}")
+            return [None]
+        logging.warning(f"Batch of {len(images)} images failed ({e}); retrying one by one")
+        return [detect_batch_isolated([image], imgsz=imgsz, conf=conf, detector=detector)[0] for image in images]
+
+
+def summarize_result(result: Any) -> Detection:
+    """
+    Reduce one YOLO result to its labels, highest confidence and boxes.
+
+    Args:
+        result (Any): An `ultralytics` result for one image.
+
+    Returns:
+        Detection: Detected labels, the highest confidence among them and the
+        boxes with corners normalized to the image size.
+    """
+    detected_in_image: List[str] = []
+    max_conf = 0.0
+    boxes: List[Box] = []
+
+    for box in result.boxes:
+        class_id = int(box.cls)
+        label = result.names[class_id]
+        conf = float(box.conf)
+        x1, y1, x2, y2 = (float(v) for v in box.xyxyn[0])
+        detected_in_image.append(label)
+        boxes.append((class_id, label, conf, x1, y1, x2, y2))
+        if conf > max_conf:
+            max_conf = conf
+
+    return detected_in_image, max_conf, boxes
+
+
+def build_result_row(
+    msg_id: str,
+    channel_name: str,
+    filename: str,
+    detected_in_image: List[str],
+    max_conf: float,
+    image_sha256: str = '',
+    duplicate_of: str = '',
+) -> Dict[str, str]:
+    """
+    Build one output row of the detections CSV.
+
+    Args:
+        msg_id (str): Telegram message ID.
+        channel_name (str): Channel the image was posted in.
+        filename (str): Image file name.
+        detected_in_image (List[str]): Detected labels.
+        max_conf (float): Highest detection confidence.
+        image_sha256 (str): Content hash of the image, if known.
+        duplicate_of (str): Content hash of the near-duplicate image whose detection was reused.
+
+    Returns:
+        Dict[str, str]: Row matching the `yolo_detections.csv` columns.
+    """
+    return {
+        'message_id': msg_id,
+        'channel': channel_name,
+        'image_name': filename,
+        'detected_objects': ", ".join(detected_in_image),
+        'confidence_score': round(max_conf, 4),
+        'image_category': classify_image(set(detected_in_image)),
+        'image_sha256': image_sha256,
+        'duplicate_of': duplicate_of,
+    }
+
+
+def build_box_rows(
+    msg_id: str,
+    channel_name: str,
+    filename: str,
+    boxes: List[Box],
+) -> List[Dict[str, Any]]:
+    """
+    Build the rows of the per-object detections CSV for one image.
+
+    Args:
+        msg_id (str): Telegram message ID.
+        channel_name (str): Channel the image was posted in.
+        filename (str): Image file name.
+        boxes (List[Box]): Detected objects.
+
+    Returns:
+        List[Dict[str, Any]]: Rows matching the `yolo_detection_boxes.csv` columns.
+    """
+    return [
+        {
+            'message_id': msg_id,
+            'channel': channel_name,
+            'image_name': filename,
+            'class_id': class_id,
+            'class_name': class_name,
+            'confidence': round(conf, 4),
+            'bbox_x1': round(x1, 4),
+            'bbox_y1': round(y1, 4),
+            'bbox_x2': round(x2, 4),
+            'bbox_y2': round(y2, 4),
+        }
+        for class_id, class_name, conf, x1, y1, x2, y2 in boxes
+    ]
+
+
+def collect_image_jobs(image_root: str, lake_path: str) -> List[ImageJob]:
+    """
+    List the images to run detection on.
+
+    Images of the content-addressed store are listed once per unique blob with
+    every (channel, message_id) that uses it; images in the legacy channel
+    subdirectories are added unless the store already covers their message.
+
+    Args:
+        image_root (str): The `data/raw/images` directory.
+        lake_path (str): Base path of the data lake (`data/`).
+
+    Returns:
+        List[ImageJob]: Image path and its (message_id, channel, image_name) usages.
+    """
+    jobs: List[ImageJob] = []
+    seen: Set[Tuple[str, str]] = set()
+
+    # Content-addressed store: one inference per unique blob, however often it was reposted.
+    if os.path.isfile(image_index_path(lake_path)):
+        store = ImageStore(lake_path)
+        for blob, usages in store.unique_images().items():
+            if not os.path.isfile(blob):
+                logging.warning(f"Indexed image missing from store: {blob}")
+                continue
+            jobs.append((blob, [(str(message_id), channel_name, f"{message_id}.jpg")
+                                for channel_name, message_id in usages]))
+            seen.update((channel_name, str(message_id)) for channel_name, message_id in usages)
+        store.close()
+
+    # Legacy layout: data/raw/images/{channel_name}/{message_id}.jpg
+    for root, dirs, files in os.walk(image_root):
+        # Skip the store's own directories (_blobs, _staging)
+        dirs[:] = [d for d in dirs if not d.startswith('_')]
+        for filename in files:
+            if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
+                # Capture channel name from folder and message ID from filename
+                channel_name = os.path.basename(root)
+                msg_id = filename.split('_')[0].split('.')[0]
+                if (channel_name, msg_id) in seen:
+                    continue
+                jobs.append((os.path.join(root, filename), [(msg_id, channel_name, filename)]))
+
+    return jobs
+
+
+def model_identifier(weights: str = MODEL_WEIGHTS, backend: str = DEFAULT_BACKEND) -> str:
+    """
+    Identify the model weights and backend for the detection cache.
+
+    Args:
+        weights (str): Weights file name or path.
+        backend (str): Inference backend; results of different backends are cached separately.
+
+    Returns:
+        str: The weights name plus a short content hash when the file is available locally,
+        suffixed with the backend unless it is `torch`.
+    """
+    name = os.path.basename(weights)
+    if os.path.isfile(weights):
+        name = f"{name}:{file_sha256(weights)[:12]}"
+    return name if backend == DEFAULT_BACKEND else f"{name}:{backend}"
+
+
+def image_sha256(image_path: str, cache: Optional[DetectionCache] = None) -> str:
+    """
+    Get the content hash of an image; store blobs are already named by it.
+
+    Args:
+        image_path (str): Path to the image file.
+        cache (Optional[DetectionCache]): Cache memoizing the hashes of other files.
+
+    Returns:
+        str: Hex digest of the image.
+    """
+    if os.path.basename(os.path.dirname(os.path.dirname(image_path))) == BLOBS_DIRNAME:
+        return os.path.splitext(os.path.basename(image_path))[0]
+    if cache is None:
+        return file_sha256(image_path)
+    return cache.image_hash(image_path)
+
+
+def plan_near_duplicates(
+    image_paths: List[str],
+    pending: List[str],
+    hashes: Dict[str, str],
+    cache: DetectionCache,
+    model_id: str,
+    imgsz: int,
+    conf: float,
+    max_distance: int = MAX_HASH_DISTANCE,
+    workers: int = DEFAULT_DECODE_WORKERS,
+) -> Tuple[List[str], Dict[str, Tuple[str, int, Detection]], Dict[str, Tuple[str, int]]]:
+    """
+    Find the images that don't need inference because a near-duplicate was or will be detected.
+
+    Perceptual hashes missing from the cache are computed for all images
+    first (on `workers` threads), so earlier results become candidates too.
+    Then each image still to detect, in order, is matched against cached
+    detections of other images, and otherwise against the images of this run
+    scheduled before it.
+
+    Args:
+        image_paths (List[str]): Every image of the run.
+        pending (List[str]): Images without a cached detection, in discovery order.
+        hashes (Dict[str, str]): Content hash per image path.
+        cache (DetectionCache): Detection cache holding the perceptual hash index.
+        model_id (str): Model identifier.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        max_distance (int): Largest Hamming distance between dHashes that counts as a near-duplicate.
+        workers (int): Number of hashing threads.
+
+    Returns:
+        Tuple: The images to run inference on; images reusing a cached detection,
+        mapped to (content hash of the original, distance, detection); and images
+        that follow an image of this run, mapped to (its path, distance).
+    """
+    if not 0 <= max_distance <= MAX_HASH_DISTANCE:
+        raise ValueError(f"max_distance must be between 0 and {MAX_HASH_DISTANCE}")
+
+    phashes: Dict[str, int] = {}
+    missing: List[str] = []
+    for image_path in image_paths:
+        if image_path not in hashes:
+            continue
+        value = cache.get_perceptual_hash(hashes[image_path])
+        if value is None:
+            missing.append(image_path)
+        else:
+            phashes[image_path] = value
+    if missing:
+        logging.info(f"Computing perceptual hashes of {len(missing)} images")
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            for image_path, value in zip(missing, pool.map(dhash, missing)):
+                if value is not None:
+                    cache.put_perceptual_hash(hashes[image_path], value)
+                    phashes[image_path] = value
+        cache.commit()
+
+    to_detect: List[str] = []
+    reused: Dict[str, Tuple[str, int, Detection]] = {}
+    followers: Dict[str, Tuple[str, int]] = {}
+    scheduled = BandIndex()
+    for image_path in pending:
+        value = phashes.get(image_path)
+        if value is None:
+            to_detect.append(image_path)
+            continue
+        match = cache.find_near_duplicate(value, model_id, imgsz, conf, max_distance, exclude=hashes[image_path])
+        if match is not None:
+            reused[image_path] = match
+            continue
+        earlier = scheduled.find(value, max_distance)
+        if earlier is not None:
+            followers[image_path] = earlier
+            continue
+        scheduled.add(image_path, value)
+        to_detect.append(image_path)
+    return to_detect, reused, followers
+
+
+def decode_image(image_path: str) -> Optional[Any]:
+    """
+    Read, validate and decode an image file.
+
+    Args:
+        image_path (str): Path to the image file.
+
+    Returns:
+        Optional[numpy.ndarray]: BGR pixel array as expected by YOLO, or None
+        if the file is missing, empty or not a decodable image.
+    """
+    try:
+        if os.path.getsize(image_path) == 0:
+            return None
+        data = np.fromfile(image_path, dtype=np.uint8)
+    except OSError:
+        return None
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def prefetch_images(
+    jobs: List[ImageJob],
+    workers: int = DEFAULT_DECODE_WORKERS,
+    prefetch: int = 2 * DEFAULT_BATCH_SIZE,
+) -> Iterator[Tuple[ImageJob, Optional[Any]]]:
+    """
+    Decode images on a thread pool ahead of inference.
+
+    At most `prefetch` images are read or held decoded at once, so file I/O
+    and JPEG decoding overlap with inference without unbounded memory.
+
+    Args:
+        jobs (List[ImageJob]): Images to decode.
+        workers (int): Number of decode threads.
+        prefetch (int): Maximum number of images decoded ahead of the consumer.
+
+    Yields:
+        Tuple[ImageJob, Optional[numpy.ndarray]]: Each job, in order, with its
+        decoded image (None if it couldn't be decoded).
+    """
+    pending: Deque[Tuple[ImageJob, Future]] = deque()
+    remaining = iter(jobs)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        for job in remaining:
+            pending.append((job, pool.submit(decode_image, job[0])))
+            if len(pending) >= max(prefetch, 1):
+                break
+        while pending:
+            job, future = pending.popleft()
+            next_job = next(remaining, None)
+            if next_job is not None:
+                pending.append((next_job, pool.submit(decode_image, next_job[0])))
+            yield job, future.result()
+
+
+def shard_of(image_path: str, shards: int) -> int:
+    """
+    Assign an image to a shard by a stable hash of its path.
+
+    Args:
+        image_path (str): Path to the image file.
+        shards (int): Number of shards.
+
+    Returns:
+        int: Shard index in `[0, shards)`, the same on every run.
+    """
+    return zlib.crc32(image_path.encode('utf-8')) % shards
+
+
+def iter_detections(
+    image_paths: List[str],
+    detector: Detector,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    imgsz: int = DEFAULT_IMGSZ,
+    conf: float = DEFAULT_CONF,
+    decode_workers: int = DEFAULT_DECODE_WORKERS,
+) -> Iterator[Dict[str, Optional[Detection]]]:
+    """
+    Decode images ahead of inference and run detection on them in batches.
+
+    Args:
+        image_paths (List[str]): Images to process.
+        detector (Detector): Detector to run.
+        batch_size (int): Number of images per model call.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        decode_workers (int): Number of image decoding threads.
+
+    Yields:
+        Dict[str, Optional[Detection]]: After each batch, the detection per
+        image path finished since the previous yield; None for images that couldn't be
+        decoded or failed detection.
+    """
+    ready: Dict[str, Optional[Detection]] = {}
+    batch_size = max(batch_size, 1)
+    batch: List[Tuple[str, Any]] = []
+
+    def flush() -> None:
+        results = detect_batch_isolated([image for _, image in batch], imgsz=imgsz, conf=conf,
+                                        detector=detector)
+        for (image_path, _), detection in zip(batch, results):
+            if detection is None:
+                logging.warning(f"Skipping image that failed detection: {image_path}")
+            ready[image_path] = detection
+        batch.clear()
+
+    jobs: List[ImageJob] = [(image_path, []) for image_path in image_paths]
+    for done, ((image_path, _), image) in enumerate(
+        prefetch_images(jobs, workers=decode_workers, prefetch=2 * batch_size), start=1
+    ):
+        if image is None:
+            logging.warning(f"Skipping empty or unreadable image: {image_path}")
+            ready[image_path] = None
+        else:
+            batch.append((image_path, image))
+        if len(batch) >= batch_size:
+            logging.info(f"Processing images up to {done} of {len(jobs)}")
+            flush()
+            yield ready
+            ready = {}
+    if batch:
+        flush()
+    if ready:
+        yield ready
+
+
+def _detect_shard(task: Tuple[List[str], Dict[str, Any], Dict[str, Any]]) -> Dict[str, Optional[Detection]]:
+    """Worker process entry point: run `iter_detections` on a chunk of this process's shard with its own model."""
+    image_paths, detector_options, detect_options = task
+    detections: Dict[str, Optional[Detection]] = {}
+    for batch in iter_detections(image_paths, get_detector(**detector_options), **detect_options):
+        detections.update(batch)
+    return detections
+
+
+def run_yolo_pipeline(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    imgsz: int = DEFAULT_IMGSZ,
+    conf: float = DEFAULT_CONF,
+    decode_workers: int = DEFAULT_DECODE_WORKERS,
+    use_cache: bool = True,
+    weights: str = MODEL_WEIGHTS,
+    device: Optional[str] = None,
+    threads: Optional[int] = None,
+    backend: str = DEFAULT_BACKEND,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    max_hash_distance: Optional[int] = MAX_HASH_DISTANCE,
+    postgres: bool = False,
+) -> None:
     """
     Run the YOLO object detection pipeline on all images in the data/raw/images directory.
 
-    - Walks through all subdirectories under the image root.
-    - Performs object detection on each image.
+    - Runs detection once per unique image in the content-addressed image store
+      and fans the result out to every (channel, message_id) that uses it.
+    - Walks the legacy channel subdirectories for images not in the store.
+    - Reuses results from the detection cache (`data/raw/images/_detections.sqlite`)
+      for images already processed with the same model and settings, so a
+      rerun only runs inference on new or changed images.
+    - Reads and decodes images on `decode_workers` threads ahead of inference;
+      empty or corrupt files are skipped instead of failing the run.
+    - Skips inference for near-duplicates (e.g. re-encoded reposts): images
+      whose perceptual hash is within `max_hash_distance` of an already
+      detected image reuse its detection, and the output links them to it
+      (`duplicate_of`). Requires the detection cache, which indexes the hashes.
+    - Sends decoded images to the model in batches of `batch_size`.
+    - With `workers > 1`, splits the images into that many shards by path hash
+      and runs each in its own single-process pool, so every chunk of a shard
+      reaches the same process and model. Without `threads`,
+      each process gets an equal share of the CPU cores as inference threads,
+      for every backend (see `limit_cpu_threads`).
+      Only the main process touches the detection cache and the output.
     - Classifies the image based on detected objects.
-    - Saves results to 'yolo_detections.csv' in the raw data directory.
+    - Appends results to 'yolo_detections.csv' (one row per image) and
+      'yolo_detection_boxes.csv' (one row per detected object, see
+      `BOX_CSV_COLUMNS`) in the raw data directory as images are processed, in
+      discovery order regardless of the number of workers. A checkpoint of
+      the processed images lets an interrupted run resume where it stopped
+      (see `DetectionWriter`).
+    - With `postgres`, streams the same rows straight into `raw.yolo_detections`
+      and `raw.yolo_detection_boxes` instead of the CSVs, upserting on
+      (channel, image_name, model) so reruns don't duplicate rows (see
+      `DetectionSink`). There is no checkpoint: committed batches stay, and a
+      rerun after an interruption gets the finished images from the cache.
+
+    Args:
+        batch_size (int): Number of images per model call.
+        imgsz (int): Inference image size.
+        conf (float): Minimum confidence of a detection.
+        decode_workers (int): Number of image decoding threads (per process).
+        use_cache (bool): Consult and update the detection cache.
+        weights (str): YOLO weights file name or path.
+        device (Optional[str]): Inference device; None lets ultralytics choose.
+        threads (Optional[int]): Number of CPU inference threads (per process, every backend).
+        backend (str): Inference backend, one of `BACKENDS`.
+        workers (int): Number of detection processes.
+        chunk_size (int): Images per task sent to a detection process.
+        resume (bool): Continue an interrupted run from its checkpoint.
+        max_hash_distance (Optional[int]): Largest dHash distance (0-3) at which an image
+            reuses the detection of a near-duplicate; None disables the check.
+        postgres (bool): Write the results to PostgreSQL instead of the CSVs.
     """
     base_dir = os.path.dirname(os.path.abspath(__file__))
     data_raw_dir = os.path.abspath(os.path.join(base_dir, os.pardir, 'data', 'raw'))
     image_root = os.path.join(data_raw_dir, 'images')
     output_csv = os.path.join(data_raw_dir, 'yolo_detections.csv')
+    boxes_csv = os.path.join(data_raw_dir, 'yolo_detection_boxes.csv')
 
     if not os.path.exists(image_root):
         logging.error(f"Image root directory not found at {image_root}")
         return
 
-    results_list: List[Dict[str, str]] = []
-
     logging.info(f"Starting YOLO pipeline on images in {image_root}...")
-    
-    for root, _, files in os.walk(image_root):
-        for filename in files:
-            if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-                image_path = os.path.join(root, filename)
-                logging.info(f"Processing image: {image_path}")
+    jobs = collect_image_jobs(image_root, os.path.dirname(data_raw_dir))
+
+    model_id = model_identifier(weights, backend)
+    writer: Optional[DetectionWriter] = None
+    sink: Optional[DetectionSink] = None
+    if postgres:
+        sink = DetectionSink(model_id)
+    else:
+        writer = DetectionWriter({output_csv: RESULT_COLUMNS, boxes_csv: list(BOX_CSV_COLUMNS)}, resume=resume,
+                                 settings={'model': model_id, 'imgsz': imgsz, 'conf': conf,
+                                           'max_hash_distance': max_hash_distance})
+        jobs = [job for job in jobs if job[0] not in writer.done]
 
-                # Perform inference
-                results = model(image_path)
+    # The cache lives next to the images; without a real images directory run uncached.
+    cache: Optional[DetectionCache] = None
+    if use_cache and os.path.isdir(image_root):
+        cache = DetectionCache(os.path.dirname(data_raw_dir))
+    hashes: Dict[str, str] = {}
+    detections: Dict[str, Optional[Detection]] = {}
+    pending: List[str] = []
+    for image_path, _ in jobs:
+        try:
+            hashes[image_path] = image_sha256(image_path, cache)
+        except OSError:
+            pass  # unreadable; the decode stage skips it
+        if cache is not None and image_path in hashes:
+            cached = cache.get(hashes[image_path], model_id, imgsz, conf)
+            if cached is not None:
+                detections[image_path] = cached
+                continue
+        pending.append(image_path)
+    if cache is not None:
+        logging.info(f"Detection cache: {len(jobs) - len(pending)} hits, {len(pending)} images to process")
 
-                detected_in_image: List[str] = []
-                max_conf = 0.0
+    # Near-duplicates reuse a cached detection right away, or wait for an image detected in this run
+    links: Dict[str, str] = {}
+    followers: Dict[str, List[str]] = {}
+    if cache is not None and max_hash_distance is not None:
+        pending, reused, following = plan_near_duplicates(
+            [image_path for image_path, _ in jobs], pending, hashes, cache, model_id, imgsz, conf,
+            max_distance=max_hash_distance, workers=decode_workers,
+        )
+        for image_path, (original, _, detection) in reused.items():
+            detections[image_path] = detection
+            links[image_path] = original
+        for image_path, (original_path, _) in following.items():
+            followers.setdefault(original_path, []).append(image_path)
+        if reused or following:
+            logging.info(f"Near-duplicates: {len(reused)} reuse cached detections, "
+                         f"{len(following)} reuse detections of this run; {len(pending)} images to process")
 
-                for result in results:
-                    for box in result.boxes:
-                        label = result.names[int(box.cls)]
-                        conf = float(box.conf)
-                        detected_in_image.append(label)
-                        if conf > max_conf:
-                            max_conf = conf
+    # Rows are written in discovery order, so the output doesn't depend on sharding;
+    # `written` is the number of leading jobs already flushed to the CSV.
+    written = 0
+    skipped = 0
 
-                category = classify_image(set(detected_in_image))
+    def drain() -> None:
+        nonlocal written, skipped
+        rows: List[Dict[str, Any]] = []
+        box_rows: List[Dict[str, Any]] = []
+        paths: List[str] = []
+        while written < len(jobs) and jobs[written][0] in detections:
+            image_path, usages = jobs[written]
+            detection = detections.pop(image_path)
+            if detection is None:
+                skipped += 1
+            else:
+                detected_in_image, max_conf, boxes = detection
+                for msg_id, channel_name, filename in usages:
+                    rows.append(build_result_row(msg_id, channel_name, filename, detected_in_image, max_conf,
+                                                 hashes.get(image_path, ''), links.get(image_path, '')))
+                    box_rows.extend(build_box_rows(msg_id, channel_name, filename, boxes))
+            paths.append(image_path)
+            written += 1
+        if paths and sink is not None:
+            sink.write(rows, box_rows)
+        elif paths:
+            writer.write({output_csv: rows, boxes_csv: box_rows}, paths)
 
-                # Capture channel name from folder and message ID from filename
-                channel_name = os.path.basename(root)
-                msg_id = filename.split('_')[0]
+    def store(batch: Dict[str, Optional[Detection]]) -> None:
+        if cache is not None:
+            for image_path, detection in batch.items():
+                if detection is not None and image_path in hashes:
+                    cache.put(hashes[image_path], model_id, imgsz, conf, *detection)
+            cache.commit()
+        detections.update(batch)
+        for image_path, detection in batch.items():
+            for follower in followers.pop(image_path, []):
+                detections[follower] = detection
+                if detection is not None:
+                    links[follower] = hashes[image_path]
+        drain()
 
-                results_list.append({
-                    'message_id': msg_id,
-                    'channel': channel_name,
-                    'image_name': filename,
-                    'detected_objects': ", ".join(detected_in_image),
-                    'confidence_score': round(max_conf, 4),
-                    'image_category': category
-                })
+    detect_options = dict(batch_size=batch_size, imgsz=imgsz, conf=conf, decode_workers=decode_workers)
+    started = time.perf_counter()
+    try:
+        drain()
+        if workers > 1 and len(pending) > 1:
+            # Each shard is submitted in chunks so results stream back while the shards run
+            chunks: List[Tuple[int, List[str]]] = []
+            open_chunks: Dict[int, List[str]] = {}
+            for image_path in pending:
+                shard = shard_of(image_path, workers)
+                chunk = open_chunks.setdefault(shard, [])
+                chunk.append(image_path)
+                if len(chunk) >= chunk_size:
+                    chunks.append((shard, open_chunks.pop(shard)))
+            chunks.extend(open_chunks.items())
+            threads = threads or max(1, (os.cpu_count() or 1) // workers)
+            detector_options = dict(weights=weights, device=device, threads=threads, backend=backend)
+            logging.info(f"Running detection in {workers} processes ({threads} CPU threads each)")
+            with ExitStack() as stack:
+                # One single-process pool per shard, so a shard's chunks always reach the same
+                # process. spawn: each worker imports torch and loads its model from scratch.
+                pools = [
+                    stack.enter_context(ProcessPoolExecutor(
+                        max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                        initializer=limit_cpu_threads, initargs=(threads,),
+                    ))
+                    for _ in range(workers)
+                ]
+                futures = [pools[shard].submit(_detect_shard, (chunk, detector_options, detect_options))
+                           for shard, chunk in chunks]
+                for future in as_completed(futures):
+                    store(future.result())
+        else:
+            detector = get_detector(weights, device=device, threads=threads, backend=backend)
+            for batch in iter_detections(pending, detector, **detect_options):
+                store(batch)
+    finally:
+        if cache is not None:
+            cache.close()
+        if sink is not None:
+            sink.close()
+        else:
+            writer.close(finished=written == len(jobs))
 
-    # Save results to CSV
-    df = pd.DataFrame(results_list)
-    df.to_csv(output_csv, index=False)
-    logging.info(f"Processing finished. Results saved to: {output_csv}")
+    elapsed = time.perf_counter() - started
+    processed = len(pending) - skipped
+    if processed and elapsed > 0:
+        logging.info(f"Ran detection on {processed} images in {elapsed:.1f}s ({processed / elapsed:.1f} images/sec)")
+    if skipped:
+        logging.warning(f"Skipped {skipped} unreadable images")
+    if postgres:
+        logging.info("Processing finished. Results streamed to raw.yolo_detections and raw.yolo_detection_boxes")
+    else:
+        logging.info(f"Processing finished. Results saved to: {output_csv} and {boxes_csv}")
 
 
 if __name__ == "__main__":
-    run_yolo_pipeline()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run YOLOv8 detection on scraped images")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Images per model call (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--imgsz", type=int, default=DEFAULT_IMGSZ,
+                        help=f"Inference image size (default: {DEFAULT_IMGSZ})")
+    parser.add_argument("--conf", type=float, default=DEFAULT_CONF,
+                        help=f"Minimum detection confidence (default: {DEFAULT_CONF})")
+    parser.add_argument("--decode-workers", type=int, default=DEFAULT_DECODE_WORKERS,
+                        help=f"Image decoding threads (default: {DEFAULT_DECODE_WORKERS})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the detection cache and run inference on every image")
+    parser.add_argument("--weights", default=MODEL_WEIGHTS,
+                        help=f"YOLO weights file (default: {MODEL_WEIGHTS})")
+    parser.add_argument("--device", default=None,
+                        help="Inference device, e.g. 'cpu' or '0' (default: chosen by ultralytics)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="CPU inference threads, for every backend (default: the runtime's own setting)")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"Inference backend (default: {DEFAULT_BACKEND})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Detection processes, each with its own model (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Images per task sent to a detection process (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the checkpoint of an interrupted run and start over")
+    parser.add_argument("--max-hash-distance", type=int, choices=range(MAX_HASH_DISTANCE + 1),
+                        default=MAX_HASH_DISTANCE,
+                        help=f"Largest perceptual hash distance treated as a near-duplicate (default: {MAX_HASH_DISTANCE})")
+    parser.add_argument("--no-near-duplicates", action="store_true",
+                        help="Run inference on near-duplicate images instead of reusing detections")
+    parser.add_argument("--postgres", action="store_true",
+                        help="Stream results into PostgreSQL (raw.yolo_detections) instead of writing the CSVs")
+    args = parser.parse_args()
+
+    run_yolo_pipeline(batch_size=args.batch_size, imgsz=args.imgsz, conf=args.conf,
+                      decode_workers=args.decode_workers, use_cache=not args.no_cache,
+                      weights=args.weights, device=args.device, threads=args.threads,
+                      backend=args.backend, workers=args.workers, chunk_size=args.chunk_size,
+                      resume=not args.restart,
+                      max_hash_distance=None if args.no_near_duplicates else args.max_hash_distance,
+                      postgres=args.postgres)
@@ -0,0 +1,116 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.catalog import list_partitions, rebuild_catalog, refresh_catalog
+from src.datalake import (
+    iter_messages,
+    open_channel_messages_writer,
+    write_channel_messages_json,
+    write_manifest,
+)
+
+
+def _write(base_path: str, date_str: str, channel_name: str, ids: List[int]) -> str:
+    with open_channel_messages_writer(
+        base_path=base_path, date_str=date_str, channel_name=channel_name
+    ) as writer:
+        for message_id in ids:
+            writer.append({"message_id": message_id, "channel_name": channel_name})
+    return writer.path
+
+
+def test_writers_maintain_catalog(tmp_path: Path) -> None:
+    """
+    Test that published partitions and manifests are recorded with their stats.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    path = _write(base_path, "2026-01-18", "cheMed123", [5, 9, 7])
+    write_manifest(base_path=base_path, date_str="2026-01-18", channel_message_counts={"cheMed123": 3})
+
+    rows: List[Dict[str, Any]] = list_partitions(base_path)
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["abs_path"] == path
+    assert row["channel"] == "cheMed123"
+    assert row["format"] == "jsonl"
+    assert row["row_count"] == 3
+    assert (row["min_message_id"], row["max_message_id"]) == (5, 9)
+    assert row["byte_size"] == Path(path).stat().st_size
+    assert len(row["checksum"]) == 64
+
+    manifests = list_partitions(base_path, kind="manifest")
+    assert [m["row_count"] for m in manifests] == [3]
+
+
+def test_list_partitions_filters_by_date_and_channel(tmp_path: Path) -> None:
+    """
+    Test that queries prune by date range and channel without touching the files.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    _write(base_path, "2026-01-17", "cheMed123", [1])
+    _write(base_path, "2026-01-18", "cheMed123", [2])
+    _write(base_path, "2026-01-18", "tikvahpharma", [3])
+    _write(base_path, "2026-01-19", "tikvahpharma", [4])
+
+    rows = list_partitions(base_path, ("2026-01-18", "2026-01-19"), ["tikvahpharma"])
+
+    assert [(r["date_min"], r["channel"]) for r in rows] == [
+        ("2026-01-18", "tikvahpharma"),
+        ("2026-01-19", "tikvahpharma"),
+    ]
+
+
+def test_rebuild_catalog_indexes_existing_files(tmp_path: Path) -> None:
+    """
+    Test that a lake written before the catalog existed can be indexed in one pass.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    write_channel_messages_json(
+        base_path=base_path,
+        date_str="2026-01-18",
+        channel_name="lobelia4cosmetics",
+        messages=[{"message_id": 11}, {"message_id": 12}],
+    )
+    (tmp_path / "raw" / "_catalog.sqlite").unlink()
+
+    assert rebuild_catalog(base_path) == 1
+    rows = list_partitions(base_path, channels=["lobelia4cosmetics"])
+    assert [(r["format"], r["row_count"]) for r in rows] == [("json", 2)]
+
+
+def test_refresh_catalog_picks_up_files_written_outside_the_writers(tmp_path: Path) -> None:
+    """
+    Test that reads and loads don't miss partitions that bypassed the catalog.
+
+    Steps:
+    1. Catalogs one day, then copies in a second day by hand and appends to the first.
+    2. Verifies `iter_messages` sees the copied day and the appended message.
+    3. Deletes a file and verifies its entry is dropped, and that an up-to-date catalog is left alone.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    first = _write(base_path, "2026-01-18", "tikvahpharma", [1])
+    copied = tmp_path / "raw" / "telegram_messages" / "2026-01-19" / "tikvahpharma.jsonl"
+    copied.parent.mkdir()
+    copied.write_text('{"message_id": 2, "channel_name": "tikvahpharma"}\n', encoding="utf-8")
+    with open(first, "a", encoding="utf-8") as f:
+        f.write('{"message_id": 3, "channel_name": "tikvahpharma"}\n')
+
+    assert sorted(m["message_id"] for m in iter_messages(base_path)) == [1, 2, 3]
+    assert refresh_catalog(base_path) == 0
+
+    copied.unlink()
+    assert refresh_catalog(base_path) == 1
+    assert [r["date_min"] for r in list_partitions(base_path)] == ["2026-01-18"]
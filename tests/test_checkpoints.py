@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from src.checkpoints import get_checkpoint, update_checkpoint
+
+
+def test_update_checkpoint_tracks_high_and_low_water_marks(tmp_path: Path) -> None:
+    """
+    Test that successive updates keep the max/min message IDs seen for a channel.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+
+    update_checkpoint(base_path=base_path, channel_name="cheMed123", message_ids=[10, 12, 11])
+    update_checkpoint(base_path=base_path, channel_name="cheMed123", message_ids=[5, 6])
+
+    checkpoint = get_checkpoint(base_path, "cheMed123")
+
+    assert checkpoint["last_message_id"] == 12
+    assert checkpoint["oldest_message_id"] == 5
+    assert "last_run_utc" in checkpoint
+
+
+def test_update_checkpoint_records_backfill_completion(tmp_path: Path) -> None:
+    """
+    Test that an empty chunk still persists the run time and backfill flag.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+
+    update_checkpoint(
+        base_path=base_path,
+        channel_name="tikvahpharma",
+        message_ids=[],
+        backfill_complete=True,
+    )
+
+    checkpoint = get_checkpoint(base_path, "tikvahpharma")
+
+    assert checkpoint["backfill_complete"] is True
+    assert "last_message_id" not in checkpoint
+    assert get_checkpoint(base_path, "unknown") is None
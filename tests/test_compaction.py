@@ -0,0 +1,117 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.catalog import list_partitions
+from src.compaction import compact_month, compactable_months
+from src.datalake import (
+    find_channel_messages_path,
+    iter_messages,
+    iter_messages_file,
+    open_channel_messages_writer,
+    read_manifest,
+    write_manifest,
+)
+
+
+def _write_day(base_path: str, date_str: str, messages: List[Dict[str, Any]]) -> None:
+    with open_channel_messages_writer(
+        base_path=base_path, date_str=date_str, channel_name="cheMed123"
+    ) as writer:
+        for message in messages:
+            writer.append({"channel_name": "cheMed123", **message})
+    write_manifest(base_path=base_path, date_str=date_str, channel_message_counts={"cheMed123": writer.count})
+
+
+def test_compact_month_deduplicates_and_keeps_latest_counts(tmp_path: Path) -> None:
+    """
+    Test that compaction merges daily files into one monthly file per channel.
+
+    Steps:
+        1. Writes two daily partitions in which message 2 was scraped twice.
+        2. Compacts the month.
+        3. Verifies the monthly file holds each message once with its latest
+           views/forwards, and that an image path missing from the later scrape is kept.
+        4. Verifies the daily files are gone and catalog/manifests/readers point to the monthly file.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    _write_day(base_path, "2026-01-05", [
+        {"message_id": 1, "views": 10, "forwards": 1},
+        {"message_id": 2, "views": 20, "forwards": 2, "image_path": "a.jpg"},
+    ])
+    _write_day(base_path, "2026-01-20", [
+        {"message_id": 2, "views": 50, "forwards": 5, "image_path": None},
+        {"message_id": 3, "views": 30, "forwards": 3},
+    ])
+
+    assert compactable_months(base_path, before="2026-02") == ["2026-01"]
+    counts = compact_month(base_path=base_path, month="2026-01")
+
+    assert counts == {"cheMed123": 3}
+    monthly = find_channel_messages_path(base_path, "2026-01-05", "cheMed123")
+    assert monthly == os.path.join(base_path, "raw", "telegram_messages", "2026-01", "cheMed123.jsonl")
+    messages = {m["message_id"]: m for m in iter_messages_file(monthly)}
+    assert sorted(messages) == [1, 2, 3]
+    assert (messages[2]["views"], messages[2]["forwards"]) == (50, 5)
+    assert messages[2]["image_path"] == "a.jpg"
+
+    rows = list_partitions(base_path, ("2026-01-20", "2026-01-20"))
+    assert [row["abs_path"] for row in rows] == [monthly]
+    assert rows[0]["row_count"] == 3
+    assert compactable_months(base_path, before="2026-02") == []
+
+    day_manifest = read_manifest(base_path, "2026-01-05")
+    assert day_manifest["files"] == {}
+    assert day_manifest["compacted_into"] == "2026-01"
+    month_manifest = read_manifest(base_path, "2026-01")
+    assert month_manifest["compacted_from"] == ["2026-01-05", "2026-01-20"]
+    assert month_manifest["files"]["cheMed123.jsonl"]["rows"] == 3
+
+
+def test_day_reads_of_a_compacted_month_keep_only_that_day(tmp_path: Path) -> None:
+    """
+    Test that a one-day read of a compacted month returns only the messages last scraped that day.
+
+    Steps:
+        1. Writes two daily partitions (message 2 re-scraped on the second day) and compacts them to Parquet.
+        2. Verifies one-day reads, with and without a column projection, and a read of the whole month.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    _write_day(base_path, "2026-01-05", [{"message_id": 1, "views": 10}, {"message_id": 2, "views": 20}])
+    _write_day(base_path, "2026-01-20", [{"message_id": 2, "views": 50}, {"message_id": 3, "views": 30}])
+    compact_month(base_path=base_path, month="2026-01", fmt="parquet")
+
+    first_day = list(iter_messages(base_path, "2026-01-05", "2026-01-05"))
+    assert [(m["message_id"], m["partition_date"]) for m in first_day] == [(1, "2026-01-05")]
+    assert list(iter_messages(base_path, "2026-01-20", "2026-01-20", columns=["message_id", "views"])) == [
+        {"message_id": 2, "views": 50},
+        {"message_id": 3, "views": 30},
+    ]
+    assert [m["message_id"] for m in iter_messages(base_path, "2026-01-01", "2026-01-31")] == [1, 2, 3]
+
+
+def test_compact_month_merges_into_existing_monthly_file(tmp_path: Path) -> None:
+    """
+    Test that compacting a month again folds late daily files into the monthly file.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path = str(tmp_path)
+    _write_day(base_path, "2026-01-05", [{"message_id": 1, "views": 10}])
+    compact_month(base_path=base_path, month="2026-01")
+    _write_day(base_path, "2026-01-31", [{"message_id": 1, "views": 15}, {"message_id": 4, "views": 1}])
+
+    counts = compact_month(base_path=base_path, month="2026-01")
+
+    assert counts == {"cheMed123": 2}
+    monthly = find_channel_messages_path(base_path, "2026-01-31", "cheMed123")
+    assert [m["views"] for m in iter_messages_file(monthly)] == [15, 1]
+    assert read_manifest(base_path, "2026-01")["compacted_from"] == ["2026-01-05", "2026-01-31"]
+    assert compact_month(base_path=base_path, month="2026-01") == {}
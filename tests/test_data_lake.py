@@ -1,7 +1,13 @@
 import json
+import pytest
 from pathlib import Path
 from typing import List, Dict, Any
+from src.checkpoints import update_checkpoint
 from src.datalake import (
+    files_changed_since,
+    iter_messages,
+    iter_messages_file,
+    open_channel_messages_writer,
     write_channel_messages_json,
     write_manifest,
     telegram_messages_partition_dir,
@@ -105,3 +111,326 @@ def test_partition_directory_created(tmp_path: Path) -> None:
     )
 
     assert partition_dir.endswith(date_str)
+
+
+def test_streaming_writer_publishes_jsonl_atomically(tmp_path: Path) -> None:
+    """
+    Test that `open_channel_messages_writer` only exposes the partition once closed.
+
+    Steps:
+    1. Appends messages and checks only the `.part` file exists.
+    2. Closes the writer and checks the `.jsonl` file is published.
+    3. Reads it back with `iter_messages_file`.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    messages: List[Dict[str, Any]] = [
+        {"message_id": i, "channel_name": "testchannel", "views": i * 10} for i in range(3)
+    ]
+
+    writer = open_channel_messages_writer(
+        base_path=str(tmp_path),
+        date_str="2026-01-18",
+        channel_name="testchannel",
+    )
+    for message in messages:
+        writer.append(message)
+
+    assert not Path(writer.path).exists()
+    assert Path(writer.tmp_path).exists()
+
+    out_path: str = writer.close()
+
+    assert out_path.endswith("testchannel.jsonl")
+    assert not Path(writer.tmp_path).exists()
+    assert list(iter_messages_file(out_path)) == messages
+
+
+def test_streaming_writer_resumes_interrupted_partition(tmp_path: Path) -> None:
+    """
+    Test that a resumed writer keeps complete lines of a crashed run and drops a torn last line.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    writer = open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel"
+    )
+    writer.append({"message_id": 1})
+    writer.append({"message_id": 2})
+    writer.flush()
+    writer.release()  # simulate a crash: nothing published
+    with open(writer.tmp_path, "a", encoding="utf-8") as f:
+        f.write('{"message_id": 3, "chan')
+
+    with open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", resume=True
+    ) as resumed:
+        assert resumed.message_ids == {1, 2}
+        resumed.append({"message_id": 3})
+
+    assert [m["message_id"] for m in iter_messages_file(resumed.path)] == [1, 2, 3]
+
+
+def test_streaming_writer_drops_torn_line_longer_than_a_scan_block(tmp_path: Path) -> None:
+    """
+    Test that a torn last line spanning several backward-scan blocks is dropped.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    writer = open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel"
+    )
+    writer.append({"message_id": 1, "message_text": "x" * 100_000})
+    writer.flush()
+    writer.release()
+    complete = Path(writer.tmp_path).stat().st_size
+    with open(writer.tmp_path, "a", encoding="utf-8") as f:
+        f.write('{"message_id": 2, "message_text": "' + "y" * 200_000)
+
+    with open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", resume=True
+    ) as resumed:
+        assert Path(resumed.tmp_path).stat().st_size == complete
+        assert resumed.message_ids == {1}
+
+
+def test_iter_messages_file_reads_legacy_json_array(tmp_path: Path) -> None:
+    """
+    Test that the streaming reader still understands the pretty-printed JSON-array format.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    messages: List[Dict[str, Any]] = [
+        {"message_id": i, "message_text": "[not, the, end]", "views": 1.5} for i in range(50)
+    ]
+    out_path: str = write_channel_messages_json(
+        base_path=str(tmp_path),
+        date_str="2026-01-18",
+        channel_name="testchannel",
+        messages=messages,
+    )
+
+    assert list(iter_messages_file(out_path)) == messages
+
+
+def test_parquet_writer_round_trips_typed_messages(tmp_path: Path) -> None:
+    """
+    Test that the Parquet sink writes a typed partition that reads back like the JSON formats.
+
+    Steps:
+    1. Writes two messages with `fmt="parquet"`.
+    2. Checks the Parquet schema types.
+    3. Reads the partition back with `iter_messages_file`.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    messages: List[Dict[str, Any]] = [
+        {
+            "message_id": i,
+            "channel_name": "testchannel",
+            "channel_title": "Test Channel",
+            "message_date": "2026-01-18T08:30:00+00:00",
+            "message_text": "Paracetamol 500mg",
+            "has_media": False,
+            "image_path": None,
+            "views": 100 + i,
+            "forwards": i,
+        }
+        for i in range(2)
+    ]
+
+    with open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", fmt="parquet"
+    ) as writer:
+        for message in messages:
+            writer.append(message)
+
+    assert writer.path.endswith("testchannel.parquet")
+
+    schema = pq.read_schema(writer.path)
+    assert str(schema.field("message_id").type) == "int64"
+    assert str(schema.field("message_date").type) == "timestamp[us, tz=UTC]"
+
+    assert list(iter_messages_file(writer.path)) == messages
+
+
+def test_parquet_writer_buffers_flushes_into_full_row_groups(tmp_path: Path) -> None:
+    """
+    Test that per-chunk flushes don't cut the Parquet file into small row groups.
+
+    Steps:
+    1. Writes 250 messages in chunks of 100 with a flush after each chunk.
+    2. Verifies the published file holds a single row group with every message.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    writer = open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", fmt="parquet"
+    )
+    for i in range(250):
+        writer.append({"message_id": i, "message_date": "2026-01-18T08:30:00+00:00"})
+        if i % 100 == 99:
+            writer.flush()
+    path = writer.close()
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 1
+    assert metadata.num_rows == 250
+
+
+def test_parquet_writer_resumes_flushed_rows_after_an_interrupted_write(tmp_path: Path) -> None:
+    """
+    Test that Parquet rows made durable by `flush()` survive a crash before `close()`.
+
+    Steps:
+    1. Appends 10 messages, flushes, advances the checkpoint past them and fails inside the writer.
+    2. Reopens the partition with `resume=True` and checks the flushed messages were carried over.
+    3. Closes it and reads every message back from the published Parquet file.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    pytest.importorskip("pyarrow.parquet")
+
+    writer = open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", fmt="parquet"
+    )
+    with pytest.raises(RuntimeError):
+        with writer:
+            for message_id in range(91, 101):
+                writer.append({"message_id": message_id, "message_date": "2026-01-18T08:30:00+00:00"})
+            writer.flush()
+            update_checkpoint(base_path=str(tmp_path), channel_name="testchannel", message_ids=range(91, 101))
+            raise RuntimeError("FloodWait abort")
+    assert not Path(writer.path).exists()
+
+    with open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", fmt="parquet", resume=True
+    ) as resumed:
+        assert resumed.message_ids == set(range(91, 101))
+        resumed.append({"message_id": 101, "message_date": "2026-01-18T09:00:00+00:00"})
+
+    assert not Path(resumed.tmp_path).exists()
+    assert [m["message_id"] for m in iter_messages(str(tmp_path))] == list(range(91, 102))
+
+
+def test_manifest_fingerprints_files_and_detects_changes(tmp_path: Path) -> None:
+    """
+    Test that the manifest records per-file hashes/sizes/rows and drives change detection.
+
+    Steps:
+    1. Writes two channel partitions and a manifest.
+    2. Checks the manifest `files` section and that no temp files are left behind.
+    3. Rewrites one partition and checks only it is reported as changed.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path: str = str(tmp_path)
+    date_str: str = "2026-01-18"
+
+    for channel_name, ids in (("cheMed123", [1, 2]), ("tikvahpharma", [3])):
+        write_channel_messages_json(
+            base_path=base_path,
+            date_str=date_str,
+            channel_name=channel_name,
+            messages=[{"message_id": i} for i in ids],
+        )
+    out_path: str = write_manifest(
+        base_path=base_path,
+        date_str=date_str,
+        channel_message_counts={"cheMed123": 2, "tikvahpharma": 1},
+    )
+
+    with open(out_path, "r", encoding="utf-8") as f:
+        manifest: Dict[str, Any] = json.load(f)
+
+    files = manifest["files"]
+    assert set(files) == {"cheMed123.json", "tikvahpharma.json"}
+    assert files["cheMed123.json"]["rows"] == 2
+    assert files["tikvahpharma.json"]["bytes"] > 0
+    assert len(files["tikvahpharma.json"]["sha256"]) == 64
+    assert not list(Path(out_path).parent.glob("*.tmp"))
+
+    assert files_changed_since(base_path, date_str, manifest) == []
+
+    write_channel_messages_json(
+        base_path=base_path,
+        date_str=date_str,
+        channel_name="tikvahpharma",
+        messages=[{"message_id": 3, "views": 40}],
+    )
+
+    changed: List[str] = files_changed_since(base_path, date_str, manifest)
+    assert [Path(p).name for p in changed] == ["tikvahpharma.json"]
+    assert len(files_changed_since(base_path, date_str, None)) == 2
+
+
+def test_iter_messages_prunes_partitions_and_projects_columns(tmp_path: Path) -> None:
+    """
+    Test that `iter_messages` reads only the requested dates, channels and fields.
+
+    Steps:
+    1. Writes partitions for two dates and two channels, one of them as legacy JSON.
+    2. Reads one date and one channel with a column projection.
+    3. Verifies that other partitions are skipped and only the requested fields are returned.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    base_path: str = str(tmp_path)
+    for date_str, channel_name, ids in (
+        ("2026-01-17", "cheMed123", [1]),
+        ("2026-01-18", "cheMed123", [2, 3]),
+        ("2026-01-18", "tikvahpharma", [4]),
+    ):
+        with open_channel_messages_writer(
+            base_path=base_path, date_str=date_str, channel_name=channel_name
+        ) as writer:
+            for message_id in ids:
+                writer.append({"message_id": message_id, "channel_name": channel_name, "views": message_id * 10})
+    write_channel_messages_json(
+        base_path=base_path,
+        date_str="2026-01-19",
+        channel_name="cheMed123",
+        messages=[{"message_id": 5, "channel_name": "cheMed123", "views": 50}],
+    )
+
+    selected: List[Dict[str, Any]] = list(iter_messages(
+        base_path, "2026-01-18", "2026-01-19", channels=["cheMed123"], columns=["message_id", "views"]
+    ))
+
+    assert selected == [
+        {"message_id": 2, "views": 20},
+        {"message_id": 3, "views": 30},
+        {"message_id": 5, "views": 50},
+    ]
+    assert len(list(iter_messages(base_path))) == 5
+
+
+def test_iter_messages_projects_parquet_columns(tmp_path: Path) -> None:
+    """
+    Test that column projection also applies to Parquet partitions.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    pytest.importorskip("pyarrow.parquet")
+    with open_channel_messages_writer(
+        base_path=str(tmp_path), date_str="2026-01-18", channel_name="testchannel", fmt="parquet"
+    ) as writer:
+        writer.append({"message_id": 1, "channel_name": "testchannel", "views": 7})
+
+    selected = list(iter_messages(str(tmp_path), columns=["message_id", "views", "unknown"]))
+
+    assert selected == [{"message_id": 1, "views": 7, "unknown": None}]
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+
+from src.detection_cache import DetectionCache, detection_cache_path
+
+
+def test_detection_cache_keys_on_content_model_and_settings(tmp_path) -> None:
+    """
+    Test that cached detections survive a reopen and only match the same model and settings.
+
+    Steps:
+    1. Stores a detection and reopens the cache.
+    2. Verifies a hit for the same key and misses for another model, image size or threshold.
+    """
+    cache = DetectionCache(str(tmp_path))
+    boxes = [(0, "person", 0.9, 0.1, 0.1, 0.5, 0.9), (39, "bottle", 0.4, 0.6, 0.2, 0.7, 0.5)]
+    cache.put("abc", "yolov8n.pt", 640, 0.25, ["person", "bottle"], 0.9, boxes)
+    cache.close()
+
+    assert os.path.isfile(detection_cache_path(str(tmp_path)))
+    cache = DetectionCache(str(tmp_path))
+    assert cache.get("abc", "yolov8n.pt", 640, 0.25) == (["person", "bottle"], 0.9, boxes)
+    assert cache.get("abc", "yolov8s.pt", 640, 0.25) is None
+    assert cache.get("abc", "yolov8n.pt", 320, 0.25) is None
+    assert cache.get("abc", "yolov8n.pt", 640, 0.5) is None
+    assert cache.get("def", "yolov8n.pt", 640, 0.25) is None
+    cache.close()
+
+
+def test_image_hash_is_memoized_until_the_file_changes(tmp_path, monkeypatch) -> None:
+    """
+    Test that unchanged files are not re-hashed and changed files are.
+
+    Steps:
+    1. Hashes an image twice and verifies the second call reads the memoized hash.
+    2. Rewrites the image and verifies the hash is recomputed.
+    """
+    image = tmp_path / "1.jpg"
+    image.write_bytes(b"first")
+    cache = DetectionCache(str(tmp_path))
+    first = cache.image_hash(str(image))
+
+    calls = []
+    import src.detection_cache as detection_cache
+    real_sha256 = detection_cache.file_sha256
+    monkeypatch.setattr(detection_cache, "file_sha256", lambda path: calls.append(path) or real_sha256(path))
+
+    assert cache.image_hash(str(image)) == first
+    assert calls == []
+
+    image.write_bytes(b"second version")
+    assert cache.image_hash(str(image)) != first
+    assert calls == [str(image)]
+    cache.close()
+
+
+def test_entries_without_boxes_are_misses(tmp_path) -> None:
+    """
+    Test that a cache created before boxes were stored is migrated and its entries are recomputed.
+    """
+    cache = DetectionCache(str(tmp_path))
+    path = cache.path
+    os.makedirs(os.path.dirname(path))
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE detections (sha256 TEXT NOT NULL, model TEXT NOT NULL, imgsz INTEGER NOT NULL, "
+            "conf REAL NOT NULL, labels TEXT NOT NULL, max_conf REAL NOT NULL, PRIMARY KEY (sha256, model, imgsz, conf))"
+        )
+        conn.execute("INSERT INTO detections VALUES ('abc', 'yolov8n.pt', 640, 0.25, '[\"person\"]', 0.9)")
+
+    assert cache.get("abc", "yolov8n.pt", 640, 0.25) is None
+    cache.put("abc", "yolov8n.pt", 640, 0.25, ["person"], 0.9, [(0, "person", 0.9, 0.0, 0.0, 1.0, 1.0)])
+    assert cache.get("abc", "yolov8n.pt", 640, 0.25) == (["person"], 0.9, [(0, "person", 0.9, 0.0, 0.0, 1.0, 1.0)])
+    cache.close()
+
+
+def test_find_near_duplicate_returns_closest_cached_detection(tmp_path) -> None:
+    """
+    Test that near-duplicates are found through the perceptual hash bands.
+
+    Steps:
+    1. Stores detections and perceptual hashes of an image and of a distant image.
+    2. Verifies a hash 2 bits away finds the first image, but not beyond max_distance,
+       for another model, or when it is the image itself.
+    """
+    value = 0x0123456789ABCDEF
+    cache = DetectionCache(str(tmp_path))
+    cache.put("abc", "yolov8n.pt", 640, 0.25, ["bottle"], 0.8, [(39, "bottle", 0.8, 0.1, 0.1, 0.4, 0.9)])
+    cache.put_perceptual_hash("abc", value)
+    cache.put("def", "yolov8n.pt", 640, 0.25, [], 0.0, [])
+    cache.put_perceptual_hash("def", ~value & (2 ** 64 - 1))
+    cache.close()
+
+    cache = DetectionCache(str(tmp_path))
+    assert cache.get_perceptual_hash("abc") == value
+    assert cache.get_perceptual_hash("xyz") is None
+    near = value ^ (1 << 63 | 1)
+    assert cache.find_near_duplicate(near, "yolov8n.pt", 640, 0.25, max_distance=3) == (
+        "abc", 2, (["bottle"], 0.8, [(39, "bottle", 0.8, 0.1, 0.1, 0.4, 0.9)])
+    )
+    assert cache.find_near_duplicate(near, "yolov8n.pt", 640, 0.25, max_distance=1) is None
+    assert cache.find_near_duplicate(near, "yolov8s.pt", 640, 0.25, max_distance=3) is None
+    assert cache.find_near_duplicate(value, "yolov8n.pt", 640, 0.25, max_distance=3, exclude="abc") is None
+    cache.close()
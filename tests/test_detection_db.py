@@ -0,0 +1,103 @@
+from typing import Any, List
+
+import pytest
+
+from src.detection_db import MERGE_SQL, DetectionSink, detection_copy_rows
+
+
+class _FakeCursor:
+    """Records executed statements and the data of each COPY."""
+
+    def __init__(self, log: List[Any], fail_on: str = "") -> None:
+        self.log = log
+        self.fail_on = fail_on
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def execute(self, sql: str) -> None:
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("statement failed")
+        self.log.append(("execute", sql))
+
+    def copy_expert(self, sql: str, file: Any) -> None:
+        self.log.append(("copy", sql, file.read()))
+
+
+class _FakeConnection:
+    def __init__(self, fail_on: str = "") -> None:
+        self.log: List[Any] = []
+        self.fail_on = fail_on
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self.log, self.fail_on)
+
+    def commit(self) -> None:
+        self.log.append(("commit",))
+
+    def rollback(self) -> None:
+        self.log.append(("rollback",))
+
+    def close(self) -> None:
+        self.log.append(("close",))
+
+
+def _rows():
+    detection = {'message_id': '12_photo', 'channel': 'lobelia', 'image_name': '12_photo.jpg',
+                 'detected_objects': '', 'confidence_score': 0.0, 'image_category': 'other',
+                 'image_sha256': 'abc', 'duplicate_of': ''}
+    box = {'message_id': '12_photo', 'channel': 'lobelia', 'image_name': '12_photo.jpg', 'class_id': 39,
+           'class_name': 'bottle', 'confidence': 0.8, 'bbox_x1': 0.1, 'bbox_y1': 0.2, 'bbox_x2': 0.3,
+           'bbox_y2': 0.4}
+    unnamed = {**detection, 'message_id': 'photo'}
+    return [detection, unnamed], [box]
+
+
+def test_detection_copy_rows_cleans_like_the_csv_loader() -> None:
+    """
+    Test that detection rows get the model, a numeric message ID and the CSV loader's defaults.
+    """
+    rows, _ = _rows()
+    assert list(detection_copy_rows(rows, "yolov8n.pt")) == [
+        (12, 'lobelia', '12_photo.jpg', 'yolov8n.pt', 'none', 0.0, 'other', 'abc', None)
+    ]
+
+    # Rows read from an older CSV: strings, empty confidence, no hash columns, no model
+    csv_row = {'message_id': '12_photo', 'channel': 'lobelia', 'image_name': '12_photo.jpg',
+               'detected_objects': '', 'confidence_score': '', 'image_category': 'other'}
+    assert list(detection_copy_rows([csv_row], None)) == [
+        (12, 'lobelia', '12_photo.jpg', None, 'none', 0.0, 'other', None, None)
+    ]
+
+
+def test_sink_copies_a_batch_into_staging_and_merges_it_in_one_transaction() -> None:
+    """
+    Test that each write stages the batch with COPY, merges it and commits.
+
+    Steps:
+    1. Writes a batch through a sink with an open fake connection.
+    2. Verifies staging is cleared, both tables are copied, the merge upserts on the key, and the batch is committed.
+    3. Verifies a failing merge rolls the batch back.
+    """
+    sink = DetectionSink("yolov8n.pt")
+    sink._conn = conn = _FakeConnection()
+    rows, box_rows = _rows()
+
+    assert sink.write(rows, box_rows) == (1, 1)
+    kinds = [entry[0] for entry in conn.log]
+    assert kinds == ["execute", "copy", "copy", "execute", "commit"]
+    assert conn.log[0][1].startswith("TRUNCATE _stg_yolo_detections")
+    assert conn.log[1][1].startswith("COPY _stg_yolo_detections (message_id, channel, image_name, model,")
+    assert conn.log[2][2] == "12\tlobelia\t12_photo.jpg\tyolov8n.pt\t39\tbottle\t0.8\t0.1\t0.2\t0.3\t0.4\n"
+    assert conn.log[3][1] == MERGE_SQL
+    assert "ON CONFLICT (channel, image_name, model) DO UPDATE" in MERGE_SQL
+
+    sink._conn = conn = _FakeConnection(fail_on="INSERT INTO raw.yolo_detections")
+    with pytest.raises(RuntimeError):
+        sink.write(rows, box_rows)
+    assert conn.log[-1] == ("rollback",)
+    sink.close()
+    assert conn.log[-1] == ("close",)
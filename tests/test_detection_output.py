@@ -0,0 +1,74 @@
+import os
+
+from src.detection_output import DetectionWriter, checkpoint_path
+
+SETTINGS = {"model": "yolov8n.pt", "imgsz": 640, "conf": 0.25}
+
+
+def test_writer_resumes_after_interruption(tmp_path) -> None:
+    """
+    Test that a resumed run skips checkpointed images and drops rows written after the last checkpoint.
+
+    Steps:
+    1. Writes two chunks to two outputs, then simulates a crash after a third chunk's rows
+       but before its checkpoint line.
+    2. Reopens the writer and verifies the processed paths and the truncated CSVs.
+    3. Finishes the run and verifies the checkpoint is removed.
+    """
+    images_csv = str(tmp_path / "yolo_detections.csv")
+    boxes_csv = str(tmp_path / "yolo_detection_boxes.csv")
+    outputs = {images_csv: ["message_id", "channel"], boxes_csv: ["message_id", "class_name"]}
+
+    writer = DetectionWriter(outputs, SETTINGS)
+    writer.write({images_csv: [{"message_id": 1, "channel": "a"}],
+                  boxes_csv: [{"message_id": 1, "class_name": "person"}]}, ["1.jpg"])
+    writer.write({images_csv: [], boxes_csv: []}, ["2.jpg"])
+    writer.close()
+    with open(images_csv, "a", encoding="utf-8") as f:
+        f.write("3,a\n")
+    with open(boxes_csv, "a", encoding="utf-8") as f:
+        f.write("3,bot")
+    with open(checkpoint_path(images_csv), "a", encoding="utf-8") as f:
+        f.write('{"paths": ["3.j')
+
+    writer = DetectionWriter(outputs, SETTINGS)
+    assert writer.done == {"1.jpg", "2.jpg"}
+    with open(images_csv, encoding="utf-8") as f:
+        assert f.read() == "message_id,channel\n1,a\n"
+    with open(boxes_csv, encoding="utf-8") as f:
+        assert f.read() == "message_id,class_name\n1,person\n"
+
+    writer.write({images_csv: [{"message_id": 3, "channel": "a"}],
+                  boxes_csv: [{"message_id": 3, "class_name": "bottle"}]}, ["3.jpg"])
+    writer.close(finished=True)
+    assert not os.path.exists(checkpoint_path(images_csv))
+    with open(images_csv, encoding="utf-8") as f:
+        assert f.read() == "message_id,channel\n1,a\n3,a\n"
+    with open(boxes_csv, encoding="utf-8") as f:
+        assert f.read() == "message_id,class_name\n1,person\n3,bottle\n"
+
+
+def test_writer_starts_over_on_changed_settings(tmp_path) -> None:
+    """
+    Test that a checkpoint from a run with other settings or outputs, or `resume=False`, starts a fresh output.
+    """
+    output_csv = str(tmp_path / "yolo_detections.csv")
+    outputs = {output_csv: ["message_id", "channel"]}
+    writer = DetectionWriter(outputs, SETTINGS)
+    writer.write({output_csv: [{"message_id": 1, "channel": "a"}]}, ["1.jpg"])
+    writer.close()
+
+    writer = DetectionWriter(outputs, {**SETTINGS, "conf": 0.5})
+    assert writer.done == set()
+    writer.write({output_csv: [{"message_id": 1, "channel": "a"}]}, ["1.jpg"])
+    writer.close()
+
+    writer = DetectionWriter({**outputs, str(tmp_path / "boxes.csv"): ["class_name"]}, {**SETTINGS, "conf": 0.5})
+    assert writer.done == set()
+    writer.close()
+
+    writer = DetectionWriter(outputs, {**SETTINGS, "conf": 0.5}, resume=False)
+    assert writer.done == set()
+    writer.close()
+    with open(output_csv, encoding="utf-8") as f:
+        assert f.read() == "message_id,channel\n"
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+from src.image_hash import BandIndex, dhash, hamming_distance, hash_bands, join_bands
+
+
+def _banner(path, seed: int, size=(640, 480), quality: int = 95) -> None:
+    rng = np.random.default_rng(seed)
+    image = np.full((480, 640, 3), 255, np.uint8)
+    for _ in range(6):
+        x1, y1, x2, y2 = (int(v) for v in rng.integers(0, 480, 4))
+        cv2.rectangle(image, (x1, y1), (x2 + 100, y2), tuple(int(c) for c in rng.integers(0, 255, 3)), -1)
+    cv2.imwrite(str(path), cv2.resize(image, size), [cv2.IMWRITE_JPEG_QUALITY, quality])
+
+
+def test_dhash_matches_reencoded_copies_and_separates_other_images(tmp_path) -> None:
+    """
+    Test that a resized, recompressed repost hashes close to the original and a different image doesn't.
+
+    Steps:
+    1. Writes a banner, a smaller low-quality copy of it and another banner.
+    2. Verifies the copy is within 3 bits of the original and the other banner is far away.
+    3. Verifies missing and undecodable files hash to None.
+    """
+    _banner(tmp_path / "original.jpg", seed=1)
+    _banner(tmp_path / "repost.jpg", seed=1, size=(512, 384), quality=50)
+    _banner(tmp_path / "other.jpg", seed=2)
+    (tmp_path / "corrupt.jpg").write_bytes(b"not an image")
+
+    original = dhash(str(tmp_path / "original.jpg"))
+    assert hamming_distance(original, dhash(str(tmp_path / "repost.jpg"))) <= 3
+    assert hamming_distance(original, dhash(str(tmp_path / "other.jpg"))) > 10
+    assert dhash(str(tmp_path / "corrupt.jpg")) is None
+    assert dhash(str(tmp_path / "missing.jpg")) is None
+
+
+def test_band_index_finds_closest_hash_within_distance() -> None:
+    """
+    Test that hashes round-trip through their bands and the index returns the closest match.
+
+    Steps:
+    1. Indexes a hash and variants differing in 1 and 3 bits, spread over different bands.
+    2. Verifies lookups return the closest key, respect max_distance and break ties by insertion order.
+    """
+    value = 0x0123456789ABCDEF
+    assert join_bands(hash_bands(value)) == value
+    assert len(hash_bands(value)) == 4
+
+    index = BandIndex()
+    index.add("three_bits", value ^ (1 << 63 | 1 << 40 | 1 << 20))
+    index.add("one_bit", value ^ 1)
+    index.add("one_bit_later", value ^ 1 << 62)
+
+    assert index.find(value) == ("one_bit", 1)
+    assert index.find(value, max_distance=0) is None
+    assert index.find(value ^ 1) == ("one_bit", 0)
+    assert index.find(value ^ 0xFFFF) is None
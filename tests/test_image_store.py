@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from src.image_store import ImageStore
+
+
+def test_add_file_deduplicates_identical_images(tmp_path: Path) -> None:
+    """
+    Test that the same image posted in two channels is stored once and indexed twice.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    store = ImageStore(str(tmp_path))
+
+    first = Path(store.staging_path("cheMed123", 1))
+    first.write_bytes(b"same banner")
+    second = Path(store.staging_path("tikvahpharma", 7))
+    second.write_bytes(b"same banner")
+
+    blob_a = store.add_file(str(first), "cheMed123", 1)
+    blob_b = store.add_file(str(second), "tikvahpharma", 7)
+
+    assert blob_a == blob_b
+    assert Path(blob_a).read_bytes() == b"same banner"
+    assert not first.exists() and not second.exists()
+    assert store.unique_images() == {blob_a: [("cheMed123", 1), ("tikvahpharma", 7)]}
+    store.close()
+
+
+def test_lookup_links_forwarded_photo(tmp_path: Path) -> None:
+    """
+    Test that a known Telegram photo_id resolves to the stored blob for a new message.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    store = ImageStore(str(tmp_path))
+
+    staged = Path(store.staging_path("cheMed123", 1))
+    staged.write_bytes(b"promo")
+    blob = store.add_file(str(staged), "cheMed123", 1, photo_id=555)
+
+    assert store.lookup("cheMed123", 1) == blob
+    assert store.lookup("lobelia4cosmetics", 42) is None
+    assert store.lookup("lobelia4cosmetics", 42, photo_id=555) == blob
+    # The forwarded copy is now indexed in its own right.
+    assert store.lookup("lobelia4cosmetics", 42) == blob
+    store.close()
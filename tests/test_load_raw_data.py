@@ -0,0 +1,281 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from scripts.load_raw_data import (
+    MESSAGE_COLUMNS,
+    _merge_sql,
+    group_by_channel,
+    load_partitions,
+    message_copy_rows,
+    message_insert_record,
+    plan_partition_files,
+    summarize_results,
+)
+from src.datalake import file_sha256, open_channel_messages_writer
+
+
+class _FakeDatabase:
+    """
+    In-memory stand-in for the tables the loader touches.
+
+    The staged merge is emulated from the clauses `_merge_sql` generates: rows
+    are deduplicated on the key (last copied wins), existing rows are only
+    updated with `DO UPDATE`, and only when views/forwards changed if the
+    statement has the `IS DISTINCT FROM` guard; the engagement history gets
+    one row per merged (inserted or updated) row.
+    """
+
+    def __init__(self) -> None:
+        self.messages: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.history: List[Tuple[str, int, int, int]] = []
+        self.ledger: Dict[str, str] = {}
+        self.staged: List[Dict[str, Any]] = []
+
+    def merge(self, sql: str) -> Tuple[int, int]:
+        latest = {(row["channel_name"], row["message_id"]): row for row in self.staged}
+        inserted = updated = 0
+        for key, row in sorted(latest.items()):
+            current = self.messages.get(key)
+            if current is None:
+                self.messages[key] = row
+                inserted += 1
+            elif "DO UPDATE" not in sql:
+                continue
+            elif "IS DISTINCT FROM" in sql and (current["views"], current["forwards"]) == (
+                row["views"], row["forwards"]
+            ):
+                continue
+            else:
+                current.update(views=row["views"], forwards=row["forwards"])
+                updated += 1
+            if "raw.telegram_message_engagement" in sql:
+                self.history.append((key[0], key[1], row["views"], row["forwards"]))
+        return inserted, updated
+
+
+class _FakeCursor:
+    def __init__(self, db: _FakeDatabase) -> None:
+        self.db = db
+        self._result: Optional[Tuple[int, int]] = None
+        self._rows: List[Tuple[str, str]] = []
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def execute(self, sql: str) -> None:
+        if "TRUNCATE _stg_telegram_messages" in sql:
+            self.db.staged = []
+        elif "INSERT INTO raw.telegram_messages AS t" in sql:
+            self._result = self.db.merge(sql)
+        elif "FROM raw._load_ledger" in sql:
+            self._rows = list(self.db.ledger.items())
+
+    def copy_expert(self, sql: str, file: Any) -> None:
+        for line in file.read().splitlines():
+            values = [None if value == "\\N" else value for value in line.split("\t")]
+            row = dict(zip(MESSAGE_COLUMNS, values))
+            row.update(message_id=int(row["message_id"]), views=int(row["views"]), forwards=int(row["forwards"]))
+            self.db.staged.append(row)
+
+    def fetchone(self) -> Optional[Tuple[int, int]]:
+        return self._result
+
+    def fetchall(self) -> List[Tuple[str, str]]:
+        return self._rows
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, db: _FakeDatabase) -> None:
+        self.db = db
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self.db)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _fake_database(monkeypatch: Any) -> _FakeDatabase:
+    """Route the loader's connections and ledger writes to a fake database."""
+    db = _FakeDatabase()
+
+    def record_ledger(cursor: _FakeCursor, sql: str, records: List[Tuple[str, str, int]], **kwargs: Any) -> None:
+        for path, checksum, _ in records:
+            cursor.db.ledger[path] = checksum
+
+    monkeypatch.setattr("scripts.load_raw_data.get_db_connection", lambda: (_FakeConnection(db), _FakeCursor(db)))
+    monkeypatch.setattr("scripts.load_raw_data.execute_values", record_ledger)
+    return db
+
+
+def _write_partition(base_path: Path, date_str: str, channel: str, views: Dict[int, int]) -> None:
+    with open_channel_messages_writer(base_path=str(base_path), date_str=date_str, channel_name=channel) as writer:
+        for message_id, view_count in views.items():
+            writer.append({"message_id": message_id, "channel_name": channel,
+                           "message_date": f"{date_str}T08:30:00+00:00", "views": view_count, "forwards": 0})
+
+
+def test_copy_and_insert_rows_store_message_dates_in_utc() -> None:
+    """
+    Test that COPY and INSERT rows carry the same offset-free UTC `message_date`.
+
+    Steps:
+    1. Builds COPY and INSERT rows for messages dated in UTC, with a `Z` suffix and with another offset.
+    2. Verifies both paths send the UTC wall-clock time the `TIMESTAMP` column should hold.
+    """
+    messages = [
+        {"message_id": 1, "channel_name": "lobelia", "message_date": "2026-01-18T08:30:00+00:00"},
+        {"message_id": 2, "channel_name": "lobelia", "message_date": "2026-01-18T08:30:00Z"},
+        {"message_id": 3, "channel_name": "lobelia", "message_date": "2026-01-18T11:30:00+03:00"},
+    ]
+
+    copy_dates = [row[3] for row in message_copy_rows(messages, "lobelia.jsonl")]
+    insert_dates = [message_insert_record(msg, "lobelia.jsonl")[3] for msg in messages]
+
+    assert copy_dates == insert_dates == ["2026-01-18T08:30:00"] * 3
+
+
+def test_message_copy_rows_fill_defaults_and_skip_non_dicts() -> None:
+    """
+    Test that COPY rows follow `MESSAGE_COLUMNS` with the loader's defaults.
+
+    Steps:
+    1. Converts a sparse message and a non-dict item.
+    2. Verifies missing flags and counters default to False/0 and the non-dict item is skipped.
+    """
+    rows = list(message_copy_rows([{"message_id": 7, "channel_name": "lobelia", "views": None}, ["x"]], "f"))
+
+    assert rows == [(7, "lobelia", None, None, None, False, None, 0, 0)]
+    assert len(rows[0]) == len(MESSAGE_COLUMNS)
+
+
+def test_plan_skips_ledger_files_using_catalog_checksums(tmp_path: Path, monkeypatch: Any) -> None:
+    """
+    Test that a re-run only plans files missing from the ledger, without re-hashing the lake.
+
+    Steps:
+    1. Writes two catalogued partitions and plans a first load of both.
+    2. Records one of them in the (fake) ledger and plans again with hashing disabled.
+    3. Verifies only the other file is planned, and `force` plans both.
+    """
+    db = _FakeDatabase()
+    _write_partition(tmp_path, "2026-01-18", "lobelia", {1: 0, 2: 0})
+    _write_partition(tmp_path, "2026-01-19", "lobelia", {3: 0})
+
+    first = plan_partition_files(_FakeCursor(db), tmp_path)
+    assert [key for _, key, _ in first] == [
+        "raw/telegram_messages/2026-01-18/lobelia.jsonl",
+        "raw/telegram_messages/2026-01-19/lobelia.jsonl",
+    ]
+    # Catalog checksums are the same SHA-256 earlier runs stored in the ledger
+    assert first[0][2] == file_sha256(str(first[0][0]))
+
+    def no_hashing(path: str) -> str:
+        raise AssertionError(f"{path} was hashed")
+
+    monkeypatch.setattr("scripts.load_raw_data.file_sha256", no_hashing)
+    db.ledger = {first[0][1]: first[0][2]}
+    assert [key for _, key, _ in plan_partition_files(_FakeCursor(db), tmp_path)] == [first[1][1]]
+    assert len(plan_partition_files(_FakeCursor(db), tmp_path, force=True)) == 2
+
+
+def test_merge_sql_only_updates_and_records_changed_engagement() -> None:
+    """
+    Test the clauses of the staged merge for each load method.
+
+    Steps:
+    1. Builds the upsert merge with history and checks it updates only changed rows and logs merged rows.
+    2. Builds the copy merge without history and checks it never updates or logs.
+    """
+    upsert = _merge_sql(upsert=True, history=True)
+    assert "DISTINCT ON (channel_name, message_id)" in upsert
+    assert "IS DISTINCT FROM (EXCLUDED.views, EXCLUDED.forwards)" in upsert
+    assert "INSERT INTO raw.telegram_message_engagement" in upsert
+    assert "FROM merged" in upsert
+
+    copy = _merge_sql(upsert=False, history=False)
+    assert "DO NOTHING" in copy
+    assert "DO UPDATE" not in copy
+    assert "telegram_message_engagement" not in copy
+
+
+def test_reloads_add_history_only_for_changed_engagement(tmp_path: Path, monkeypatch: Any) -> None:
+    """
+    Test ledger skips and engagement history across repeated loads.
+
+    Steps:
+    1. Loads a partition with history and checks one history row per new message.
+    2. Plans again and checks the ledger skips the unchanged file.
+    3. Rewrites the file with one message's views changed and checks only that message gets a history row.
+    4. Force-reloads it unchanged and checks no history row is added.
+    """
+    db = _fake_database(monkeypatch)
+    _write_partition(tmp_path, "2026-01-18", "lobelia", {1: 10, 2: 20})
+
+    def load(force: bool = False) -> Dict[str, Any]:
+        planned = plan_partition_files(_FakeCursor(db), tmp_path, force=force)
+        return load_partitions(planned, method="upsert", history=True)
+
+    first = load()
+    assert (first["files"], first["inserted"], first["updated"]) == (1, 2, 0)
+    assert db.history == [("lobelia", 1, 10, 0), ("lobelia", 2, 20, 0)]
+
+    assert load()["files"] == 0
+
+    _write_partition(tmp_path, "2026-01-18", "lobelia", {1: 15, 2: 20})
+    changed = load()
+    assert (changed["files"], changed["inserted"], changed["updated"]) == (1, 0, 1)
+    assert db.history[2:] == [("lobelia", 1, 15, 0)]
+
+    unchanged = load(force=True)
+    assert (unchanged["files"], unchanged["updated"]) == (1, 0)
+    assert len(db.history) == 3
+
+
+def test_group_by_channel_keeps_each_channel_on_one_worker_in_date_order() -> None:
+    """
+    Test that load tasks are grouped per channel, keeping the planned (date) order.
+
+    Steps:
+    1. Groups tasks of two channels interleaved over three days.
+    2. Verifies each channel lands in exactly one group, in date order.
+    """
+    paths = ["2026-01-18/lobelia.jsonl", "2026-01-18/tikvah.parquet", "2026-01-19/lobelia.jsonl",
+             "2026-01-20/tikvah.jsonl", "2026-01-20/lobelia.parquet"]
+    tasks = [(Path(path), path, "sha") for path in paths]
+
+    groups = group_by_channel(tasks)
+
+    assert [[task[1] for task in group] for group in groups] == [
+        ["2026-01-18/lobelia.jsonl", "2026-01-19/lobelia.jsonl", "2026-01-20/lobelia.parquet"],
+        ["2026-01-18/tikvah.parquet", "2026-01-20/tikvah.jsonl"],
+    ]
+
+
+def test_summarize_results_counts_only_successful_files() -> None:
+    """
+    Test that the load summary adds up successful files and lists failures.
+    """
+    results: Sequence[Dict[str, Any]] = [
+        {"file": "a", "ok": True, "rows": 30, "inserted": 20, "updated": 5, "error": None},
+        {"file": "b", "ok": False, "rows": 0, "inserted": 0, "updated": 0, "error": "bad json"},
+    ]
+
+    summary = summarize_results(results, elapsed=2.0)
+
+    assert (summary["files"], summary["succeeded"], summary["failed"]) == (2, 1, 1)
+    assert (summary["rows"], summary["inserted"], summary["updated"]) == (30, 20, 5)
+    assert summary["rows_per_sec"] == 15.0
+    assert summary["failures"] == [{"file": "b", "error": "bad json"}]
@@ -0,0 +1,70 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.media_downloads import MediaDownloadPool
+
+
+def test_pool_downloads_retries_and_skips(tmp_path: Path) -> None:
+    """
+    Test that the pool downloads new files, skips existing ones and clears failed paths.
+
+    Steps:
+    1. Pre-create one file so it is skipped.
+    2. Submit one good job and one that always fails.
+    3. Check the stats and that the failed record's image_path was reset.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    attempts: List[str] = []
+
+    async def fake_download(media: Any, path: str) -> None:
+        attempts.append(path)
+        if media == "bad":
+            raise RuntimeError("network error")
+        Path(path).write_bytes(b"jpeg")
+
+    existing = tmp_path / "1.jpg"
+    existing.write_bytes(b"jpeg")
+    records: Dict[str, Dict[str, Any]] = {
+        name: {"image_path": str(tmp_path / f"{name}.jpg")} for name in ("1", "2", "3")
+    }
+
+    async def run() -> Dict[str, int]:
+        async with MediaDownloadPool(fake_download, workers=2, max_retries=1, timeout=5) as pool:
+            await pool.submit("ok", records["1"]["image_path"], records["1"])
+            await pool.submit("ok", records["2"]["image_path"], records["2"])
+            await pool.submit("bad", records["3"]["image_path"], records["3"])
+            await pool.join()
+        return pool.stats
+
+    stats = asyncio.run(run())
+
+    assert stats == {"downloaded": 1, "failed": 1, "skipped": 1}
+    assert records["2"]["image_path"] is not None
+    assert records["3"]["image_path"] is None
+    # The failing job was attempted 1 + max_retries times.
+    assert attempts.count(str(tmp_path / "3.jpg")) == 2
+
+
+def test_pool_times_out_slow_downloads(tmp_path: Path) -> None:
+    """
+    Test that a download exceeding the per-file timeout is counted as failed.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    async def slow_download(media: Any, path: str) -> None:
+        await asyncio.sleep(1)
+
+    record: Dict[str, Any] = {"image_path": str(tmp_path / "slow.jpg")}
+
+    async def run() -> Dict[str, int]:
+        async with MediaDownloadPool(slow_download, workers=1, max_retries=0, timeout=0.05) as pool:
+            await pool.submit("media", record["image_path"], record)
+            await pool.join()
+        return pool.stats
+
+    assert asyncio.run(run())["failed"] == 1
+    assert record["image_path"] is None
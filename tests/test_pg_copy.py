@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import Any, List
+
+from src.pg_copy import IteratorFile, copy_rows, format_copy_value
+
+
+class _FakeCursor:
+    """Records the COPY statement and reads the stream in small chunks, like psycopg2."""
+
+    def __init__(self) -> None:
+        self.sql = ""
+        self.data = ""
+        self.reads = 0
+
+    def copy_expert(self, sql: str, file: Any, size: int = 16) -> None:
+        self.sql = sql
+        while True:
+            chunk = file.read(size)
+            if not chunk:
+                break
+            self.reads += 1
+            self.data += chunk
+
+
+def test_format_copy_value_escapes_text_format() -> None:
+    """
+    Test that values are rendered in COPY text format.
+
+    Steps:
+    1. Formats NULL, booleans, numbers, datetimes and text with special characters.
+    2. Verifies NULL markers, boolean literals and backslash escapes.
+    """
+    assert format_copy_value(None) == "\\N"
+    assert format_copy_value(True) == "t"
+    assert format_copy_value(0) == "0"
+    assert format_copy_value(datetime(2026, 1, 18, tzinfo=timezone.utc)) == "2026-01-18T00:00:00+00:00"
+    assert format_copy_value("a\tb\nc\\d\r") == "a\\tb\\nc\\\\d\\r"
+
+
+def test_copy_rows_streams_lines_lazily() -> None:
+    """
+    Test that `copy_rows` streams rows through a file object instead of building the payload up front.
+
+    Steps:
+    1. Copies rows from a generator through a fake cursor reading 16-character chunks.
+    2. Verifies the COPY statement, the row count and the reassembled data.
+    """
+    produced: List[int] = []
+
+    def rows():
+        for i in range(5):
+            produced.append(i)
+            yield (i, f"text {i}", None)
+
+    cursor = _FakeCursor()
+    count = copy_rows(cursor, "raw.t", ("a", "b", "c"), rows())
+
+    assert count == 5
+    assert cursor.sql == "COPY raw.t (a, b, c) FROM STDIN WITH (FORMAT text)"
+    assert cursor.data == "".join(f"{i}\ttext {i}\t\\N\n" for i in range(5))
+    assert cursor.reads > 1
+    assert produced == list(range(5))
+
+
+def test_iterator_file_read_all_and_readline() -> None:
+    """
+    Test the unbounded `read()` and `readline()` paths of `IteratorFile`.
+    """
+    f = IteratorFile(["one\n", "two\n", "three\n"])
+
+    assert f.read(2) == "on"
+    assert f.readline() == "e\n"
+    assert f.read() == "two\nthree\n"
+    assert f.read(10) == ""
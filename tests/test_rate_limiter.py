@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+
+from src.rate_limiter import AdaptiveTokenBucket
+
+
+def test_acquire_allows_burst_then_throttles() -> None:
+    """
+    Test that the bucket serves `capacity` tokens immediately and then waits for refills.
+    """
+    bucket = AdaptiveTokenBucket(rate=20.0, capacity=3.0, max_rate=20.0)
+
+    async def run() -> float:
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+
+    # 3 tokens are free, the remaining 2 need ~0.1s of refill at 20 tokens/s.
+    assert 0.05 <= elapsed < 1.0
+
+
+def test_flood_wait_backs_off_and_blocks() -> None:
+    """
+    Test that `on_flood_wait` halves the rate and blocks callers for the requested time.
+    """
+    bucket = AdaptiveTokenBucket(rate=4.0, capacity=10.0)
+    bucket.on_flood_wait(0.2)
+
+    assert bucket.rate == pytest.approx(2.0)
+
+    async def run() -> float:
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.2
+
+
+def test_on_success_increases_rate_up_to_max() -> None:
+    """
+    Test that successful calls raise the rate additively without exceeding `max_rate`.
+    """
+    bucket = AdaptiveTokenBucket(rate=1.0, max_rate=1.2, increase_step=0.1)
+
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(1.1)
+
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == pytest.approx(1.2)
@@ -33,7 +33,7 @@ def test_run_yolo_pipeline_creates_csv(tmp_image_dir, monkeypatch):
     mock_model.return_value = [mock_result]
     
     # Patch YOLO object and os.path.exists
-    monkeypatch.setattr("src.yolo_detect.YOLO", lambda *args, **kwargs: mock_model)
+    monkeypatch.setattr("src.yolo_detect.load_yolo_model", lambda *args, **kwargs: mock_model)
     monkeypatch.setattr("os.path.exists", lambda path: True)
     
     # Patch os.walk to use our fake image directory
@@ -64,3 +64,140 @@ def test_run_yolo_pipeline_creates_csv(tmp_image_dir, monkeypatch):
         ]
         for col in expected_cols:
             assert col in df.columns
+
+
+def test_decode_image_skips_empty_and_corrupt_files(tmp_path):
+    """Test that unreadable files decode to None instead of reaching the model."""
+    cv2 = pytest.importorskip("cv2")
+    import numpy as np
+    from src.yolo_detect import decode_image, prefetch_images
+
+    empty = tmp_path / "1.jpg"
+    empty.touch()
+    corrupt = tmp_path / "2.jpg"
+    corrupt.write_bytes(b"not a jpeg")
+    valid = tmp_path / "3.jpg"
+    cv2.imwrite(str(valid), np.zeros((8, 12, 3), dtype=np.uint8))
+
+    assert decode_image(str(empty)) is None
+    assert decode_image(str(corrupt)) is None
+    assert decode_image(str(tmp_path / "missing.jpg")) is None
+    assert decode_image(str(valid)).shape == (8, 12, 3)
+
+    # Prefetching keeps job order and reports undecodable images as None
+    jobs = [(str(p), [(p.stem, "test_channel", p.name)]) for p in (empty, valid, corrupt)]
+    decoded = list(prefetch_images(jobs, workers=2, prefetch=1))
+    assert [job for job, _ in decoded] == jobs
+    assert [image is None for _, image in decoded] == [True, False, True]
+
+
+def test_detector_loads_model_once_on_first_use(monkeypatch):
+    """Test that the model is only constructed when the first batch is detected."""
+    from src.yolo_detect import Detector, detect_batch
+
+    loaded = []
+    mock_model = MagicMock(return_value=[])
+    monkeypatch.setattr("src.yolo_detect.load_yolo_model", lambda weights: loaded.append(weights) or mock_model)
+
+    detector = Detector("custom.pt", device="cpu")
+    assert loaded == []
+
+    detect_batch(["a.jpg", "b.jpg"], imgsz=320, conf=0.5, detector=detector)
+    detect_batch(["c.jpg"], detector=detector)
+    assert loaded == ["custom.pt"]
+    assert mock_model.call_args_list[0].kwargs == {
+        "imgsz": 320, "conf": 0.5, "batch": 2, "verbose": False, "device": "cpu"
+    }
+
+
+def test_compare_backends_reports_agreement_with_reference(monkeypatch):
+    """Test that ONNX backends load the exported model and are compared against the first backend."""
+    from src.yolo_benchmark import compare_backends
+
+    def fake_result(label, conf):
+        box = MagicMock()
+        box.cls, box.conf, box.xyxyn = 0, conf, [[0.1, 0.2, 0.3, 0.4]]
+        result = MagicMock()
+        result.boxes, result.names = [box], {0: label}
+        return result
+
+    models = {
+        "yolov8n.pt": lambda images, **kwargs: [fake_result("person", 0.9) for _ in images],
+        "yolov8n.int8.onnx": lambda images, **kwargs: [fake_result("bottle", 0.7) for _ in images],
+    }
+    loaded = []
+    monkeypatch.setattr("src.yolo_detect.load_yolo_model", lambda weights, **kwargs: loaded.append((weights, kwargs)) or models[weights])
+    monkeypatch.setattr("src.yolo_detect.export_onnx", lambda weights, int8=False: "yolov8n.int8.onnx" if int8 else None)
+
+    rows = compare_backends(["a", "b", "c"], backends=["torch", "onnx-int8"], batch_size=2)
+
+    assert loaded == [("yolov8n.pt", {}), ("yolov8n.int8.onnx", {"task": "detect"})]
+    assert [(r["backend"], r["images"], r["label_agreement"]) for r in rows] == [("torch", 3, 1.0), ("onnx-int8", 3, 0.0)]
+    assert rows[1]["category_agreement"] == 0.0
+    assert abs(rows[1]["mean_conf_delta"] - 0.2) < 1e-9
+
+
+def test_shard_of_is_stable_and_covers_all_shards():
+    """Test that shard assignment depends only on the path and spreads images over the shards."""
+    from src.yolo_detect import shard_of
+
+    paths = [f"data/raw/images/_blobs/{i:02x}/{i:064x}.jpg" for i in range(200)]
+    assignment = [shard_of(path, 4) for path in paths]
+
+    assert assignment == [shard_of(path, 4) for path in paths]
+    assert set(assignment) == {0, 1, 2, 3}
+    assert min(assignment.count(shard) for shard in range(4)) > 20
+
+
+def test_summarize_result_keeps_boxes_and_builds_box_rows():
+    """Test that every detected object is kept with its class, confidence and normalized box."""
+    from src.yolo_detect import build_box_rows, summarize_result
+
+    person, bottle = MagicMock(), MagicMock()
+    person.cls, person.conf, person.xyxyn = 0, 0.91234, [[0.1, 0.2, 0.5, 0.9]]
+    bottle.cls, bottle.conf, bottle.xyxyn = 39, 0.75, [[0.6, 0.3, 0.7, 0.55556]]
+    result = MagicMock()
+    result.boxes, result.names = [person, bottle], {0: "person", 39: "bottle"}
+
+    labels, max_conf, boxes = summarize_result(result)
+    assert (labels, max_conf) == (["person", "bottle"], 0.91234)
+    assert boxes == [(0, "person", 0.91234, 0.1, 0.2, 0.5, 0.9), (39, "bottle", 0.75, 0.6, 0.3, 0.7, 0.55556)]
+
+    rows = build_box_rows("12", "chan", "12.jpg", boxes)
+    assert rows[1] == {
+        "message_id": "12", "channel": "chan", "image_name": "12.jpg", "class_id": 39, "class_name": "bottle",
+        "confidence": 0.75, "bbox_x1": 0.6, "bbox_y1": 0.3, "bbox_x2": 0.7, "bbox_y2": 0.5556,
+    }
+
+
+def test_plan_near_duplicates_reuses_cached_and_earlier_detections(tmp_path, monkeypatch):
+    """
+    Test that near-duplicate images are planned out of inference.
+
+    Steps:
+    1. Caches a detection and perceptual hash for an earlier image.
+    2. Plans a run with a repost of it, a new image and a repost of the new image.
+    3. Verifies only the new image is detected, the first repost reuses the cached
+       detection and the second follows the new image.
+    """
+    from src.detection_cache import DetectionCache
+    from src.yolo_detect import plan_near_duplicates
+
+    value = 0x0123456789ABCDEF
+    phashes = {"repost.jpg": value ^ 1, "new.jpg": ~value & (2 ** 64 - 1), "new_repost.jpg": ~value & (2 ** 64 - 1) ^ 6}
+    monkeypatch.setattr("src.yolo_detect.dhash", phashes.get)
+    cache = DetectionCache(str(tmp_path))
+    cache.put("old", "yolov8n.pt", 640, 0.25, ["bottle"], 0.8, [])
+    cache.put_perceptual_hash("old", value)
+
+    paths = ["repost.jpg", "new.jpg", "new_repost.jpg"]
+    hashes = {path: f"sha-{path}" for path in paths}
+    to_detect, reused, followers = plan_near_duplicates(paths, paths, hashes, cache, "yolov8n.pt", 640, 0.25)
+
+    assert to_detect == ["new.jpg"]
+    assert reused == {"repost.jpg": ("old", 1, (["bottle"], 0.8, []))}
+    assert followers == {"new_repost.jpg": ("new.jpg", 2)}
+    assert cache.get_perceptual_hash("sha-new.jpg") == phashes["new.jpg"]
+    with pytest.raises(ValueError):
+        plan_near_duplicates(paths, paths, hashes, cache, "yolov8n.pt", 640, 0.25, max_distance=4)
+    cache.close()